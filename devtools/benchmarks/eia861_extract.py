@@ -0,0 +1,226 @@
+#!/usr/bin/env python
+"""
+Benchmark extracting the EIA Form 861 spreadsheets.
+
+Compares :class:`pudl.extract.eia861.Extractor` against
+:class:`LegacyExtractor`, a copy of the extraction steps of the
+``ExtractorExcel`` class it replaced. Like that class, it re-reads the metadata
+CSVs several times for each year, keeps one open Excel file per year, and
+appends each year to the page's dataframe in turn with
+:meth:`pandas.DataFrame.append`, so it needs pandas < 2.0. It only extracts
+the sales page, which was the only page ``ExtractorExcel.create_dfs()`` could
+extract.
+
+The outputs are checked before they are timed, using the columns which the
+column maps place in every year. The old code renamed the last column of each
+sheet to the name of a missing (-1) column, while the new extractor leaves the
+missing columns empty and keeps any columns that aren't in the column maps
+under their own names, so the outputs differ in those columns. The extractors
+are run in turn for each repetition, so that neither of them always gets the
+benefit of a warm disk cache.
+
+Nearly all of the time is spent parsing the sheets, which both extractors do
+with the same :func:`pandas.read_excel` calls. So the serial extractions are
+also timed with the sheets already read, to measure everything else they do.
+By default all of the working EIA 861 years are extracted::
+
+    python eia861_extract.py --data_dir ~/pudl/data --workers 4
+
+"""
+
+import argparse
+import importlib.resources
+import itertools
+import pathlib
+import statistics
+import sys
+import time
+from unittest.mock import patch
+
+import pandas as pd
+
+import pudl
+import pudl.constants as pc
+import pudl.workspace.datastore as datastore
+
+XLSX_MAPS = "pudl.package_data.meta.xlsx_maps.eia861"
+
+
+class LegacyExtractor(object):
+    """The EIA 861 extraction steps of the old ExtractorExcel class."""
+
+    def __init__(self, data_dir):
+        """Set up the extractor with the PUDL datastore to read from."""
+        self.xlsx_dict = {}
+        self.dataset_name = "eia861"
+        self.data_dir = data_dir
+
+    def get_meta(self, meta_name, file_name):
+        """Read a metadata CSV. The tab maps are now all in tab_map.csv."""
+        if meta_name == "tab_maps":
+            # The old tab_maps/sales_eia861.csv had one "states" column, with
+            # the same values as the sales_eia861 column of tab_map.csv.
+            path = importlib.resources.open_text(XLSX_MAPS, "tab_map.csv")
+            return pd.read_csv(path, index_col=0, comment="#").rename(
+                columns={file_name: "states"})
+        if meta_name == "column_maps":
+            path = importlib.resources.open_text(
+                f"{XLSX_MAPS}.{meta_name}", f"{file_name}.csv")
+        else:
+            path = importlib.resources.open_text(XLSX_MAPS, f"{meta_name}.csv")
+        return pd.read_csv(path, index_col=0, comment="#")
+
+    def get_file(self, yr, file_name):
+        """Construct the path to the EIA 861 file for a given year."""
+        eia861_dir = datastore.path(self.dataset_name, year=yr, file=False,
+                                    data_dir=self.data_dir)
+        return pathlib.Path(
+            eia861_dir,
+            self.get_meta("file_name_map", None).loc[yr, file_name])
+
+    def get_xlsx_dict(self, years, file_name):
+        """Open each year's Excel file, unless it has been opened already."""
+        for yr in years:
+            if yr not in self.xlsx_dict:
+                self.xlsx_dict[yr] = pd.ExcelFile(self.get_file(yr, file_name))
+
+    def get_column_map(self, year, file_name, page_name):
+        """Look up the sheet, skipped rows and column positions of a page."""
+        skiprows = self.get_meta("skiprows", None).loc[year, file_name]
+        sheet_loc = self.get_meta("tab_maps", file_name).loc[year, page_name]
+        col_loc = self.get_meta("column_maps", file_name).loc[year].to_dict()
+        column_map = {v: k for k, v in col_loc.items()}
+        return sheet_loc, skiprows, column_map, list(col_loc.keys())
+
+    def get_page(self, years, page_name, file_name):
+        """Read a page from each year's Excel file, appending them in turn."""
+        if page_name not in self.get_meta("tab_maps", file_name).columns:
+            raise AssertionError(f"Unrecognized page: {page_name}")
+        df = pd.DataFrame()
+        for year in years:
+            sheet_loc, skiprows, column_map, all_columns = self.get_column_map(
+                year, file_name, page_name)
+            dtype = {}
+            if "zip_code" in all_columns:
+                dtype["zip_code"] = pc.column_dtypes["eia"]["zip_code"]
+            newdata = pd.read_excel(self.xlsx_dict[year],
+                                    sheet_name=sheet_loc,
+                                    skiprows=skiprows,
+                                    dtype=dtype)
+            newdata = pudl.helpers.simplify_columns(newdata)
+            newdata = newdata.rename(columns=dict(zip(
+                newdata.columns[list(column_map.keys())],
+                list(column_map.values()))))
+            if "report_year" not in newdata.columns:
+                newdata["report_year"] = year
+            df = df.append(newdata, sort=True)
+        missing_cols = [x for x in all_columns if x not in list(df.columns)]
+        return pd.concat([df, pd.DataFrame(columns=missing_cols)], sort=True)
+
+
+def legacy_extract(years, data_dir):
+    """Extract the EIA 861 sales page as ExtractorExcel.create_dfs() did."""
+    extractor = LegacyExtractor(data_dir)
+    extractor.get_xlsx_dict(years, "sales_eia861")
+    return {"sales_eia861": extractor.get_page(
+        years, "states", "sales_eia861")}
+
+
+def generic_extract(years, data_dir, workers=1):
+    """Extract the EIA 861 spreadsheets with the generic extractor."""
+    return pudl.extract.eia861.Extractor(
+        data_dir, workers=workers).extract(years)
+
+
+def compared_columns(years, page="sales_eia861"):
+    """The columns which the column maps place in all of the years."""
+    column_map = LegacyExtractor(None).get_meta("column_maps", page)
+    return sorted(column_map.columns[(column_map.loc[years] >= 0).all()])
+
+
+def timed(func):
+    """Run a function, returning how long it took in seconds."""
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def replay_sheets(func, repeat):
+    """
+    Time an extraction without opening or parsing the spreadsheets.
+
+    The sheets read by a first run of the extraction are recorded, and then
+    returned by :func:`pandas.read_excel` in the same order in the timed runs.
+    """
+    sheets = []
+    read_excel = pd.read_excel
+
+    def record(*args, **kwargs):
+        sheets.append(read_excel(*args, **kwargs))
+        return sheets[-1]
+
+    with patch.object(pd, "read_excel", record):
+        func()
+    replayed = itertools.cycle(sheets)
+    with patch.object(pd, "ExcelFile"), patch.object(
+            pd, "read_excel", lambda *args, **kwargs: next(replayed).copy()):
+        return [timed(func) for _ in range(repeat)]
+
+
+def print_times(title, times):
+    """Print the best and median times of each extraction."""
+    print(f"{title}, in seconds:")
+    print(f"{'':>20}  {'best':>6}  {'median':>6}")
+    for name, values in times.items():
+        print(f"{name:>20}  {min(values):6.3f}  "
+              f"{statistics.median(values):6.3f}")
+
+
+def parse_command_line(argv):
+    """Parse command line arguments. See the -h option."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--data_dir", type=str, required=True)
+    parser.add_argument("--years", nargs="*", type=int,
+                        default=list(pc.working_years["eia861"]))
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=5)
+    return parser.parse_args(argv[1:])
+
+
+def main():
+    """Check the extractors agree and time them."""
+    args = parse_command_line(sys.argv)
+    columns = compared_columns(args.years)
+    expected = legacy_extract(args.years, args.data_dir)
+    for workers in (1, args.workers):
+        result = generic_extract(args.years, args.data_dir, workers=workers)
+        for page, df in expected.items():
+            pd.testing.assert_frame_equal(
+                df.reset_index(drop=True)[columns], result[page][columns])
+    print(f"EIA 861 {min(args.years)}-{max(args.years)}: "
+          f"{sum(len(df) for df in expected.values())} records. The "
+          f"{len(columns)} columns found in every year are identical.")
+
+    funcs = {
+        "legacy, serial": lambda: legacy_extract(args.years, args.data_dir),
+        "generic, serial": lambda: generic_extract(args.years, args.data_dir),
+        f"generic, {args.workers} workers": lambda: generic_extract(
+            args.years, args.data_dir, workers=args.workers),
+    }
+    times = {name: [] for name in funcs}
+    for _ in range(args.repeat):
+        for name, func in funcs.items():
+            times[name].append(timed(func))
+    print_times(f"Wall clock time of {args.repeat} runs", times)
+
+    # Nearly all of the time is spent parsing the sheets, which both
+    # extractors do in the same way, so time everything else separately.
+    serial = {name: func for name, func in funcs.items() if "serial" in name}
+    print_times(
+        f"Wall clock time of {args.repeat} runs, with the sheets already read",
+        {name: replay_sheets(func, args.repeat)
+         for name, func in serial.items()})
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+"""
+Benchmark the construction of EPA CEMS UTC timestamps in fix_up_dates.
+
+Compares :func:`pudl.transform.epacems.fix_up_dates` against the previous
+implementation, which parsed the date string of every hourly record and then
+merged the plant UTC offsets onto the whole dataframe. The two are checked for
+identical output before they are timed.
+
+By default a synthetic state-year of data is generated. To use real data, pass
+the path to the PUDL datastore along with a year and state, and the path to a
+datapackage directory containing ``data/plants_entity_eia.csv``::
+
+    python epacems_fix_up_dates.py --year 2018 --state TX --data_dir ~/pudl/data --datapkg_dir ~/pudl/datapkg/pudl-example/epacems-eia-example
+
+"""
+
+import argparse
+import sys
+import timeit
+
+import numpy as np
+import pandas as pd
+
+import pudl
+
+
+def fix_up_dates_merge(df, plant_utc_offset):
+    """The previous implementation of fix_up_dates, for comparison."""
+    df = (
+        df.assign(
+            op_datetime_naive=lambda x:
+            pd.to_datetime(x.op_date, format=r"%m-%d-%Y",
+                           exact=True, cache=True, utc=True) +
+            pd.to_timedelta(x.op_hour, unit="h")
+        )
+        .merge(plant_utc_offset, how="left", on="plant_id_eia")
+    )
+    if not df["utc_offset"].notna().all():
+        raise ValueError("utc_offset missing")
+    df["operating_datetime_utc"] = df["op_datetime_naive"] - df["utc_offset"]
+    del df["op_date"], df["op_hour"], df["op_datetime_naive"], df["utc_offset"]
+    return df
+
+
+def synthetic_data(n_plants=100, n_units=4, year=2018):
+    """Make one year of hourly records for a collection of fake plants."""
+    hours = pd.date_range(f"{year}-01-01", f"{year}-12-31 23:00", freq="H")
+    plant_ids = np.arange(1, n_plants + 1) * 7
+    n = len(hours) * n_units
+    df = pd.DataFrame({
+        "plant_id_eia": pd.array(np.repeat(plant_ids, n), dtype="Int64"),
+        "op_date": pd.array(
+            np.tile(hours.strftime("%m-%d-%Y"), n_units * n_plants),
+            dtype=pd.StringDtype()),
+        "op_hour": pd.array(
+            np.tile(hours.hour, n_units * n_plants), dtype="Int64"),
+        "gross_load_mw": np.random.default_rng(0).uniform(0, 500, n * n_plants),
+    })
+    plant_utc_offset = pd.DataFrame({
+        "plant_id_eia": pd.array(plant_ids, dtype="Int64"),
+        "utc_offset": pd.to_timedelta(
+            np.random.default_rng(1).integers(-10, -4, n_plants), unit="h"),
+    })
+    return df, plant_utc_offset
+
+
+def real_data(data_dir, datapkg_dir, year, state):
+    """Read one state-year of raw CEMS data and the plant UTC offsets."""
+    raw_dfs = pudl.extract.epacems.extract([year], [state], data_dir)
+    df = list(next(raw_dfs).values())[0]
+    plant_utc_offset = pudl.transform.epacems.load_plant_utc_offset(
+        datapkg_dir)
+    return df, plant_utc_offset
+
+
+def parse_command_line(argv):
+    """Parse command line arguments. See the -h option."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--data_dir", type=str, default=None)
+    parser.add_argument("--datapkg_dir", type=str, default=None)
+    parser.add_argument("--year", type=int, default=2018)
+    parser.add_argument("--state", type=str, default="TX")
+    parser.add_argument("--repeat", type=int, default=3)
+    return parser.parse_args(argv[1:])
+
+
+def main():
+    """Check the implementations agree and time them."""
+    args = parse_command_line(sys.argv)
+    if args.data_dir:
+        df, plant_utc_offset = real_data(
+            args.data_dir, args.datapkg_dir, args.year, args.state)
+    else:
+        df, plant_utc_offset = synthetic_data(year=args.year)
+    print(f"{len(df)} records, {df['op_date'].nunique()} distinct dates")
+
+    expected = fix_up_dates_merge(df.copy(), plant_utc_offset)
+    result = pudl.transform.epacems.fix_up_dates(df.copy(), plant_utc_offset)
+    pd.testing.assert_frame_equal(expected, result)
+    print("Outputs are identical.")
+
+    for func in (fix_up_dates_merge, pudl.transform.epacems.fix_up_dates):
+        best = min(timeit.repeat(
+            lambda: func(df.copy(), plant_utc_offset),
+            number=1, repeat=args.repeat))
+        print(f"{func.__name__:>20}: {best:.3f} s")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
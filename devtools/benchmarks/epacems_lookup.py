@@ -0,0 +1,119 @@
+#!/usr/bin/env python
+"""
+Benchmark looking up plants in the EPA CEMS Parquet dataset.
+
+Converts the EPA CEMS CSVs in a datapackage into two Parquet datasets with
+:func:`pudl.convert.epacems_to_parquet.epacems_to_parquet`. One keeps the
+records in their source order, and the other sorts them by plant, unit and
+time. Then it times looking up all the records for one plant, and one day of
+records for one unit, in each of them using :func:`pudl.output.epacems.epacems`.
+The results are checked for equality.
+
+The datasets are written into a temporary directory, which is removed
+afterward::
+
+    python epacems_lookup.py ~/pudl/datapkg/pudl-example/epacems-eia-example/datapackage.json --years 2018 --states CO TX
+
+"""
+
+import argparse
+import sys
+import tempfile
+import timeit
+
+import numpy as np
+import pandas as pd
+
+import pudl
+
+
+def count_row_groups(epacems_path, **kwargs):
+    """Count the row groups which a query reads."""
+    expression = pudl.output.epacems.epacems_filter(**kwargs)
+    dataset = pudl.output.epacems._scan_dataset(
+        epacems_path, expression, **{
+            k: v for k, v in kwargs.items() if k != "unit_ids"})
+    return sum(
+        len(fragment.row_groups)
+        for fragment in dataset.get_fragments(filter=expression)
+    )
+
+
+def parse_command_line(argv):
+    """Parse command line arguments. See the -h option."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("datapkg", type=str)
+    parser.add_argument("--years", nargs="+", type=int, default=[2018])
+    parser.add_argument("--states", nargs="+", type=str, default=["CO"])
+    parser.add_argument("--row_group_size", type=int, default=100_000)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--lookups", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    return parser.parse_args(argv[1:])
+
+
+def main():
+    """Convert the data to both layouts and time lookups in each."""
+    args = parse_command_line(sys.argv)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        layouts = {}
+        for sort in (False, True):
+            out_dir = f"{tmp_dir}/{'sorted' if sort else 'unsorted'}"
+            pudl.convert.epacems_to_parquet.epacems_to_parquet(
+                datapkg_path=args.datapkg,
+                epacems_years=args.years,
+                epacems_states=args.states,
+                out_dir=out_dir,
+                workers=args.workers,
+                row_group_size=args.row_group_size,
+                sort=sort)
+            layouts["sorted" if sort else "unsorted"] = out_dir
+
+        units = pudl.output.epacems.epacems(
+            layouts["sorted"],
+            columns=["plant_id_eia", "unitid", "operating_datetime_utc"],
+        )
+        print(f"{len(units)} records")
+        units = units.drop_duplicates(["plant_id_eia", "unitid"])
+        rng = np.random.default_rng(args.seed)
+        sample = units.iloc[rng.integers(len(units), size=args.lookups)]
+        queries = {
+            "plant": [
+                {"plant_ids": [unit.plant_id_eia]}
+                for unit in sample.itertuples()
+            ],
+            "unit-day": [
+                {"plant_ids": [unit.plant_id_eia],
+                 "unit_ids": [unit.unitid],
+                 "start_date": unit.operating_datetime_utc,
+                 "end_date": (unit.operating_datetime_utc
+                              + pd.Timedelta(hours=23))}
+                for unit in sample.itertuples()
+            ],
+        }
+
+        key = ["plant_id_eia", "unitid", "operating_datetime_utc"]
+        for name, kwargs_list in queries.items():
+            for kwargs in kwargs_list:
+                unsorted, sorted_ = (
+                    pudl.output.epacems.epacems(path, **kwargs)
+                    .sort_values(key).reset_index(drop=True)
+                    for path in (layouts["unsorted"], layouts["sorted"])
+                )
+                pd.testing.assert_frame_equal(unsorted, sorted_)
+            for layout, path in layouts.items():
+                seconds = np.mean([
+                    min(timeit.repeat(
+                        lambda: pudl.output.epacems.epacems(path, **kwargs),
+                        number=1, repeat=3))
+                    for kwargs in kwargs_list
+                ])
+                row_groups = np.mean([
+                    count_row_groups(path, **kwargs) for kwargs in kwargs_list
+                ])
+                print(f"{name:>8} {layout:>8}: {1000 * seconds:8.1f} ms, "
+                      f"{row_groups:6.1f} row groups")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
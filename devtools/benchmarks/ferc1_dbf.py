@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+"""
+Benchmark reading FERC Form 1 DBF files with dbfread and pudl.extract.dbf.
+
+Compares :func:`pudl.extract.dbf.read_dbf` against building a dataframe from
+the records yielded by :class:`dbfread.DBF`, which is how the DBF files used to
+be read. The two are checked for identical output before they are timed.
+
+By default, the five largest tables in the given year are used::
+
+    python ferc1_dbf.py --data_dir ~/pudl/data --year 2018
+
+The 2018 FERC Form 1 test data distributed with PUDL contains all 8 of the
+tables that are used. To benchmark it, unzip
+``test/data/ferc/form1/f1_2018/f1_2018.zip`` into ``DATA_DIR/ferc/form1/f1_2018``
+and pass ``--n_largest 8``.
+
+"""
+
+import argparse
+import os
+import sys
+import timeit
+
+import dbfread
+import pandas as pd
+
+import pudl
+import pudl.constants as pc
+
+
+def read_dbfread(path):
+    """Read a FERC Form 1 DBF file the way it used to be read."""
+    return pd.DataFrame(iter(dbfread.DBF(
+        path, encoding="latin1",
+        parserclass=pudl.extract.ferc1.FERC1FieldParser)))
+
+
+def read_vectorized(path):
+    """Read a FERC Form 1 DBF file with the vectorized reader."""
+    return pudl.extract.dbf.read_dbf(
+        path, encoding="latin1",
+        parserclass=pudl.extract.ferc1.FERC1FieldParser,
+        clean_numeric=pudl.extract.ferc1.clean_ferc1_numeric)
+
+
+def parse_command_line(argv):
+    """Parse command line arguments. See the -h option."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--data_dir", type=str, required=True)
+    parser.add_argument("--year", type=int,
+                        default=max(pc.working_years["ferc1"]))
+    parser.add_argument("--tables", nargs="*", default=None)
+    parser.add_argument("--n_largest", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=3)
+    return parser.parse_args(argv[1:])
+
+
+def main():
+    """Check the readers agree and time them."""
+    args = parse_command_line(sys.argv)
+    paths = {
+        table: pudl.extract.ferc1.get_dbf_path(table, args.year, args.data_dir)
+        for table in (args.tables or pc.ferc1_tbl2dbf)
+    }
+    paths = {table: path for table, path in paths.items()
+             if os.path.exists(path)}
+    if not args.tables:
+        paths = dict(sorted(
+            paths.items(), key=lambda item: os.path.getsize(item[1]),
+            reverse=True)[:args.n_largest])
+
+    for table, path in paths.items():
+        expected = read_dbfread(path)
+        result = read_vectorized(path)
+        pd.testing.assert_frame_equal(expected, result)
+        print(f"{table}: {len(result)} records, "
+              f"{os.path.getsize(path) / 1e6:.1f} MB. Outputs are identical.")
+        for func in (read_dbfread, read_vectorized):
+            best = min(timeit.repeat(
+                lambda: func(path), number=1, repeat=args.repeat))
+            print(f"{func.__name__:>20}: {best:.3f} s")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+"""
+Benchmark the multiplicative error corrections applied to FERC Form 1 fuel data.
+
+Compares :func:`pudl.transform.ferc1._multiplicative_error_correction` against
+the row-by-row implementation it replaced, using the corrections applied in
+:func:`pudl.transform.ferc1.fuel` on synthetic fuel records, with values
+scattered across the valid ranges and the ranges of the unit errors which they
+correct. The two are checked for identical output before they are timed::
+
+    python ferc1_error_correction.py --n_records 1000000
+
+"""
+
+import argparse
+import sys
+import timeit
+
+import numpy as np
+import pandas as pd
+
+import pudl.transform.ferc1
+
+# The corrections applied to fuel_ferc1: column, fuel, minval, maxval, mults
+FUEL_CORRECTIONS = [
+    ("fuel_mmbtu_per_unit", "coal", 10.0, 29.0, (2e3, 1e6)),
+    ("fuel_cost_per_mmbtu", "coal", 0.5, 7.5, (1e-2, )),
+    ("fuel_mmbtu_per_unit", "gas", 0.8, 1.2, (1e3, 1e6)),
+    ("fuel_cost_per_mmbtu", "gas", 1, 35, (1e-2, )),
+    ("fuel_mmbtu_per_unit", "oil", 3, 6.9, (42, )),
+    ("fuel_cost_per_mmbtu", "oil", 5, 33, (1e-2, )),
+]
+
+
+def legacy_error_correction(tofix, mask, minval, maxval, mults):
+    """The row-by-row implementation of the multiplicative error correction."""
+    records_to_fix = tofix[mask]
+    fixed = tofix.drop(records_to_fix.index)
+    for mult in mults:
+        records_to_fix = records_to_fix.apply(lambda x: x * mult
+                                              if x > minval / mult
+                                              and x < maxval / mult
+                                              else x)
+    records_to_fix = records_to_fix.apply(lambda x: np.nan
+                                          if x < minval
+                                          or x > maxval
+                                          else x)
+    return pd.concat([fixed, records_to_fix])
+
+
+def make_fuel_df(n_records, seed=0):
+    """Make synthetic fuel records which need all of the corrections."""
+    rng = np.random.default_rng(seed)
+    fuel_df = pd.DataFrame({
+        "fuel_type_code_pudl": rng.choice(["coal", "gas", "oil", ""],
+                                          n_records),
+        "fuel_mmbtu_per_unit": np.nan,
+        "fuel_cost_per_mmbtu": np.nan,
+    })
+    for col, fuel, minval, maxval, mults in FUEL_CORRECTIONS:
+        mask = (fuel_df.fuel_type_code_pudl == fuel).to_numpy()
+        # Pick a valid value, then maybe apply one of the unit errors, or
+        # make it an outlier, or leave it missing.
+        values = rng.uniform(minval, maxval, mask.sum())
+        errors = rng.choice(len(mults) + 3, mask.sum())
+        for i, mult in enumerate(mults):
+            values[errors == i] /= mult
+        values[errors == len(mults)] *= 1e3
+        values[errors == len(mults) + 1] = np.nan
+        fuel_df.loc[mask, col] = values
+    return fuel_df
+
+
+def correct_fuel(fuel_df, masks, func):
+    """Apply all of the fuel_ferc1 corrections using the given function."""
+    fuel_df = fuel_df.copy()
+    for col, fuel, minval, maxval, mults in FUEL_CORRECTIONS:
+        fuel_df[col] = func(fuel_df[col], masks[fuel], minval, maxval, mults)
+    return fuel_df
+
+
+def parse_command_line(argv):
+    """Parse command line arguments. See the -h option."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--n_records", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    return parser.parse_args(argv[1:])
+
+
+def main():
+    """Check the implementations agree and time them."""
+    args = parse_command_line(sys.argv)
+    fuel_df = make_fuel_df(args.n_records)
+    masks = {fuel: fuel_df.fuel_type_code_pudl == fuel
+             for fuel in fuel_df.fuel_type_code_pudl.unique()}
+    vectorized = pudl.transform.ferc1._multiplicative_error_correction
+    pd.testing.assert_frame_equal(
+        correct_fuel(fuel_df, masks, legacy_error_correction),
+        correct_fuel(fuel_df, masks, vectorized))
+    print(f"{args.n_records} fuel records. Outputs are identical.")
+    for func in (legacy_error_correction, vectorized):
+        best = min(timeit.repeat(
+            lambda: correct_fuel(fuel_df, masks, func),
+            number=1, repeat=args.repeat))
+        print(f"{func.__name__:>32}: {best:.3f} s")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
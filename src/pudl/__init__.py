@@ -14,7 +14,9 @@ import pudl.convert.epacems_to_parquet
 import pudl.convert.ferc1_to_sqlite
 import pudl.convert.merge_datapkgs
 import pudl.etl
+import pudl.extract.dbf
 import pudl.extract.eia860
+import pudl.extract.eia861
 import pudl.extract.eia923
 import pudl.extract.epacems
 import pudl.extract.epaipm
@@ -24,10 +26,14 @@ import pudl.extract.ferc714
 import pudl.glue.ferc1_eia
 import pudl.helpers
 import pudl.load.csv
+import pudl.load.manifest
 import pudl.load.metadata
+import pudl.load.parquet
+import pudl.load.sqlite
 # Output modules by data source:
 import pudl.output.eia860
 import pudl.output.eia923
+import pudl.output.epacems
 import pudl.output.ferc1
 import pudl.output.glue
 import pudl.output.pudltabl
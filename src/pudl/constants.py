@@ -2026,18 +2026,51 @@ epacems_columns_to_ignore = {
 }
 """set: The set of EPA CEMS columns to ignore when reading data.
 """
-# Specify dtypes to for reading the CEMS CSVs
+# The measurement codes which are used by all four of the CEMS measurement
+# variables. NOx is sometimes calculated rather than measured.
+epacems_measurement_codes = (
+    "LME",
+    "Measured",
+    "Measured and Substitute",
+    "Other",
+    "Substitute",
+    "Undetermined",
+    "Unknown Code",
+    "",
+)
+"""tuple: The codes describing how EPA CEMS values were measured.
+"""
+
+epacems_state_dtype = pd.CategoricalDtype(
+    categories=cems_states.keys(), ordered=False)
+"""pandas.CategoricalDtype: The states in which EPA CEMS data is reported.
+"""
+epacems_co2_so2_code_dtype = pd.CategoricalDtype(
+    categories=epacems_measurement_codes, ordered=False)
+"""pandas.CategoricalDtype: The SO2 and CO2 measurement codes.
+"""
+epacems_nox_code_dtype = pd.CategoricalDtype(
+    categories=epacems_measurement_codes + ("Calculated",), ordered=False)
+"""pandas.CategoricalDtype: The NOx rate and mass measurement codes.
+"""
+
+# Specify dtypes to for reading the CEMS CSVs. The CEMS data is huge, so the
+# columns with only a few distinct values in each state-year (states, dates,
+# unit IDs and measurement codes) are read as categoricals. Their categories
+# are whatever is found in the file, so unexpected values are never lost. The
+# measurements stay float64, except for the operating time, which is a
+# fraction of an hour.
 epacems_csv_dtypes = {
-    "STATE": pd.StringDtype(),
+    "STATE": "category",
     # "FACILITY_NAME": str,  # Not reading from CSV
-    "ORISPL_CODE": pd.Int64Dtype(),
-    "UNITID": pd.StringDtype(),
+    "ORISPL_CODE": pd.Int32Dtype(),
+    "UNITID": "category",
     # These op_date, op_hour, and op_time variables get converted to
     # operating_date, operating_datetime and operating_time_interval in
     # transform/epacems.py
-    "OP_DATE": pd.StringDtype(),
-    "OP_HOUR": pd.Int64Dtype(),
-    "OP_TIME": float,
+    "OP_DATE": "category",
+    "OP_HOUR": pd.Int8Dtype(),
+    "OP_TIME": "float32",
     "GLOAD (MW)": float,
     "GLOAD": float,
     "SLOAD (1000 lbs)": float,
@@ -2045,26 +2078,26 @@ epacems_csv_dtypes = {
     "SLOAD": float,
     "SO2_MASS (lbs)": float,
     "SO2_MASS": float,
-    "SO2_MASS_MEASURE_FLG": pd.StringDtype(),
+    "SO2_MASS_MEASURE_FLG": "category",
     # "SO2_RATE (lbs/mmBtu)": float,  # Not reading from CSV
     # "SO2_RATE": float,  # Not reading from CSV
     # "SO2_RATE_MEASURE_FLG": str,  # Not reading from CSV
     "NOX_RATE (lbs/mmBtu)": float,
     "NOX_RATE": float,
-    "NOX_RATE_MEASURE_FLG": pd.StringDtype(),
+    "NOX_RATE_MEASURE_FLG": "category",
     "NOX_MASS (lbs)": float,
     "NOX_MASS": float,
-    "NOX_MASS_MEASURE_FLG": pd.StringDtype(),
+    "NOX_MASS_MEASURE_FLG": "category",
     "CO2_MASS (tons)": float,
     "CO2_MASS": float,
-    "CO2_MASS_MEASURE_FLG": pd.StringDtype(),
+    "CO2_MASS_MEASURE_FLG": "category",
     # "CO2_RATE (tons/mmBtu)": float,  # Not reading from CSV
     # "CO2_RATE": float,  # Not reading from CSV
     # "CO2_RATE_MEASURE_FLG": str,  # Not reading from CSV
     "HEAT_INPUT (mmBtu)": float,
     "HEAT_INPUT": float,
-    "FAC_ID": pd.Int64Dtype(),
-    "UNIT_ID": pd.Int64Dtype(),
+    "FAC_ID": pd.Int32Dtype(),
+    "UNIT_ID": pd.Int32Dtype(),
 }
 """dict: A dictionary containing column names (keys) and data types (values)
 for EPA CEMS.
@@ -2074,6 +2107,15 @@ epacems_tables = ("hourly_emissions_epacems")
 """tuple: A tuple containing tables of EPA CEMS data to pull into PUDL.
 """
 
+epacems_rollup_tables = {
+    "daily": "daily_emissions_epacems",
+    "monthly": "monthly_emissions_epacems",
+    "annual": "annual_emissions_epacems",
+}
+"""dict: Tables of EPA CEMS unit totals which can be output alongside the
+hourly data (values), keyed by the length of period they total (keys).
+"""
+
 epacems_additional_plant_info_file = importlib.resources.open_text(
     'pudl.package_data.epa.cems', 'plant_info_for_additional_cems_plants.csv')
 """typing.TextIO:
@@ -2519,24 +2561,26 @@ column_dtypes = {
         "peak_demand_winter_mw": float,
     },
     "epacems": {
-        'state': pd.StringDtype(),
-        'plant_id_eia': pd.Int64Dtype(),  # Nullable Integer
-        'unitid': pd.StringDtype(),
+        # These compact types are used throughout the CEMS transform, starting
+        # at read time. See epacems_csv_dtypes.
+        'state': "category",
+        'plant_id_eia': pd.Int32Dtype(),  # Nullable Integer
+        'unitid': "category",
         'operating_datetime_utc': "datetime64[ns]",
-        'operating_time_hours': float,
+        'operating_time_hours': "float32",
         'gross_load_mw': float,
         'steam_load_1000_lbs': float,
         'so2_mass_lbs': float,
-        'so2_mass_measurement_code': pd.StringDtype(),
+        'so2_mass_measurement_code': "category",
         'nox_rate_lbs_mmbtu': float,
-        'nox_rate_measurement_code': pd.StringDtype(),
+        'nox_rate_measurement_code': "category",
         'nox_mass_lbs': float,
-        'nox_mass_measurement_code': pd.StringDtype(),
+        'nox_mass_measurement_code': "category",
         'co2_mass_tons': float,
-        'co2_mass_measurement_code': pd.StringDtype(),
+        'co2_mass_measurement_code': "category",
         'heat_content_mmbtu': float,
-        'facility_id': pd.Int64Dtype(),  # Nullable Integer
-        'unit_id_epa': pd.Int64Dtype(),  # Nullable Integer
+        'facility_id': pd.Int32Dtype(),  # Nullable Integer
+        'unit_id_epa': pd.Int32Dtype(),  # Nullable Integer
     },
     "eia": {
         'ash_content_pct': float,
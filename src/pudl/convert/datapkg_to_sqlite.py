@@ -23,14 +23,17 @@ in conjunction with the other PUDL data that is stored in the SQLite DB.
 """
 
 import argparse
+import copy
 import logging
 import pathlib
+import re
 import shutil
 import sys
 
 import coloredlogs
 import datapackage
 import sqlalchemy as sa
+import tableschema
 from tableschema import exceptions
 
 import pudl
@@ -79,14 +82,72 @@ def datapkg_to_sqlite(sqlite_url, out_path, clobber=False):
     logger.info("This could take a while. It might be a good time")
     logger.info("to get a drink of water. Hydrate or die!")
     try:
-        # Save the data package in SQL
-        pkg.save(storage='sql', engine=pudl_engine, merge_groups=True,
-                 autoincrement=autoincrement)
+        # Create the tables, just like pkg.save(storage='sql') would
+        storage = tableschema.Storage.connect(
+            'sql', engine=pudl_engine, autoincrement=autoincrement)
+        buckets, descriptors, sources = _sql_buckets(pkg)
+        storage.create(buckets, descriptors, force=True)
+        # But bulk load the records into them, rather than inserting them
+        # through SQLAlchemy in small batches.
+        sqlite_meta = sa.MetaData()
+        sqlite_meta.reflect(pudl_engine)
+        with pudl.load.sqlite.bulk_load(pudl_engine) as conn:
+            for bucket, descriptor, source in zip(
+                    buckets, descriptors, sources):
+                logger.info(f"SQLite: loading {bucket}.")
+                pudl.load.sqlite.insert_rows(
+                    conn, sqlite_meta.tables[bucket], source(),
+                    columns=[field['name']
+                             for field in descriptor['fields']])
     except exceptions.TableSchemaException as exception:
         logger.error('SQLite conversion failed. See following errors:')
         logger.error(exception.errors)
 
 
+def _sql_buckets(pkg):
+    """
+    Find the tables to store a datapackage's tabular resources in.
+
+    As in :meth:`datapackage.Package.save` with ``merge_groups=True``, each
+    group of resources (e.g. the partitions of EPA CEMS) goes into one table.
+
+    Args:
+        pkg (datapackage.Package): The datapackage to be stored.
+
+    Returns:
+        tuple: The names of the tables (buckets), the table schema descriptors
+        of the tables, and functions which iterate over the records that go in
+        each of them, casting the values according to the schema.
+
+    """
+    buckets = []
+    descriptors = []
+    sources = []
+    group_names = []
+    for resource in pkg.resources:
+        if not resource.tabular:
+            continue
+        if resource.group:
+            if resource.group in group_names:
+                continue
+            group = pkg.get_group(resource.group)
+            name, schema, source = group.name, group.schema, group.iter
+            group_names.append(name)
+        else:
+            resource.infer()
+            name, schema, source = (
+                resource.name, resource.schema, resource.iter)
+        buckets.append(re.sub(r'[^a-zA-Z0-9_]', '_', name))
+        descriptor = copy.deepcopy(schema.descriptor)
+        for foreign_key in descriptor.get('foreignKeys', []):
+            foreign_key['reference']['resource'] = re.sub(
+                r'[^a-zA-Z0-9_]', '_',
+                foreign_key['reference'].get('resource', ''))
+        descriptors.append(descriptor)
+        sources.append(source)
+    return buckets, descriptors, sources
+
+
 def parse_command_line(argv):
     """
     Parse command line arguments. See the -h option.
@@ -20,14 +20,19 @@ interactive cloud computing environment like `Pangeo <https://pangeo.io>`__.
 """
 
 import argparse
+import concurrent.futures
 import logging
 import pathlib
+import shutil
 import sys
 from functools import partial
 
 import coloredlogs
+import numpy as np
 import pandas as pd
 import pyarrow as pa
+import pyarrow.compute as pa_compute
+import pyarrow.csv as pa_csv
 import pyarrow.parquet as pq
 
 import pudl
@@ -49,23 +54,9 @@ def create_in_dtypes():
         dict: mapping columns names to :mod:`pandas` data types.
 
     """
-    # These measurement codes are used by all four of our measurement variables
-    common_codes = (
-        "LME",
-        "Measured",
-        "Measured and Substitute",
-        "Other",
-        "Substitute",
-        "Undetermined",
-        "Unknown Code",
-        "",
-    )
-    co2_so2_cats = pd.CategoricalDtype(categories=common_codes, ordered=False)
-    nox_cats = pd.CategoricalDtype(
-        categories=common_codes + ("Calculated",), ordered=False
-    )
-    state_cats = pd.CategoricalDtype(
-        categories=pc.cems_states.keys(), ordered=False)
+    co2_so2_cats = pc.epacems_co2_so2_code_dtype
+    nox_cats = pc.epacems_nox_code_dtype
+    state_cats = pc.epacems_state_dtype
     in_dtypes = {
         "state": state_cats,
         "plant_id_eia": "int32",
@@ -141,13 +132,219 @@ def create_cems_schema():
     ])
 
 
+def _csv_column_types(schema):
+    """
+    Choose the types that the CEMS CSV columns are parsed into by PyArrow.
+
+    Dictionary columns are read as strings and encoded afterward, using the
+    same categories as :func:`create_in_dtypes`. Floats are parsed at double
+    precision and then rounded, as when they are read with pandas.
+
+    Args:
+        schema (pyarrow.Schema): The EPA CEMS Arrow schema.
+
+    Returns:
+        dict: The Arrow data type to parse each CSV column into.
+
+    """
+    column_types = {}
+    for field in schema:
+        if pa.types.is_dictionary(field.type):
+            column_types[field.name] = pa.string()
+        elif pa.types.is_float32(field.type):
+            column_types[field.name] = pa.float64()
+        else:
+            column_types[field.name] = field.type
+    return column_types
+
+
+def _batch_to_table(batch, year, schema):
+    """
+    Cast a batch of EPA CEMS records parsed by PyArrow to the CEMS schema.
+
+    Args:
+        batch (pyarrow.RecordBatch): Records as read from a CEMS CSV.
+        year (int): The year of the partition the records belong to.
+        schema (pyarrow.Schema): The schema of the output table. Fields which
+            are not in the CEMS CSV (i.e. the year) are filled in.
+
+    Returns:
+        pyarrow.Table: The same records, with the output schema.
+
+    """
+    in_dtypes = create_in_dtypes()
+    columns = []
+    for field in schema:
+        if field.name == "year":
+            columns.append(pa.array(
+                np.full(batch.num_rows, year), type=field.type))
+            continue
+        col = batch.column(batch.schema.get_field_index(field.name))
+        if pa.types.is_dictionary(field.type):
+            categories = pa.array(
+                in_dtypes[field.name].categories, type=pa.string())
+            indices = pa_compute.index_in(
+                col, value_set=categories, skip_nulls=True)
+            if indices.null_count > col.null_count:
+                unknown = col.filter(pa_compute.and_(
+                    pa_compute.is_valid(col), pa_compute.is_null(indices)))
+                logger.warning(
+                    f"Unknown {field.name} values will be null: "
+                    f"{sorted(pa_compute.unique(unknown).to_pylist())}")
+            col = pa.DictionaryArray.from_arrays(
+                indices.cast(field.type.index_type), categories)
+        elif col.type != field.type:
+            col = col.cast(field.type)
+        columns.append(col)
+    return pa.Table.from_arrays(columns, schema=schema)
+
+
+def sort_epacems(table):
+    """
+    Sort EPA CEMS records by plant, unit and time.
+
+    Args:
+        table (pyarrow.Table): EPA CEMS records.
+
+    Returns:
+        pyarrow.Table: The same records, sorted by plant_id_eia, unitid and
+        operating_datetime_utc.
+
+    """
+    unit_codes, _ = pd.factorize(
+        table.column("unitid").to_pandas(), sort=True)
+    order = np.lexsort((
+        table.column("operating_datetime_utc").to_numpy(),
+        unit_codes,
+        table.column("plant_id_eia").to_numpy(),
+    ))
+    return table.take(pa.array(order))
+
+
+def epacems_csv_to_parquet(csv_path, parquet_path, year, schema,
+                           row_group_size=1_000_000,
+                           compression="snappy",
+                           write_statistics=True,
+                           use_dictionary=True,
+                           sort=False):
+    """
+    Stream one EPA CEMS CSV into a Parquet file, a row group at a time.
+
+    The gzipped CSV is read incrementally by PyArrow rather than all at once
+    with pandas, so the memory used is bounded by the row group size, not the
+    amount of data in the partition.
+
+    The CSVs are ordered by source file, i.e. by month, so every plant shows
+    up in every row group, and the row group statistics can't be used to skip
+    reading any of them when looking up a plant. If sort is True, the whole
+    partition is read into memory and sorted by plant, unit and time before it
+    is written, so the row groups hold contiguous ranges of plants.
+
+    Args:
+        csv_path (path-like): The gzipped EPA CEMS CSV to convert.
+        parquet_path (path-like): The Parquet file to create.
+        year (int): The year of the data in the CSV.
+        schema (pyarrow.Schema): The schema of the Parquet file. Columns of
+            the CEMS schema which are used to partition the dataset are left
+            out of it, since they are encoded in the path.
+        row_group_size (int): Number of records in each row group, except the
+            last one.
+        compression (str): Compression algorithm to use for the Parquet file.
+        write_statistics (bool or list): Whether to store min/max statistics
+            for each row group, either for all columns or the listed ones.
+        use_dictionary (bool or list): Whether to dictionary encode values in
+            the Parquet file, either for all columns or the listed ones.
+        sort (bool): Whether to sort the records. See :func:`sort_epacems`.
+
+    Returns:
+        int: The number of records converted.
+
+    """
+    reader = pa_csv.open_csv(
+        str(csv_path),
+        read_options=pa_csv.ReadOptions(block_size=8 * 2**20),
+        convert_options=pa_csv.ConvertOptions(
+            column_types=_csv_column_types(schema),
+            include_columns=[f.name for f in schema if f.name != "year"],
+            strings_can_be_null=True,
+        ),
+    )
+    num_rows = 0
+    pending = None
+    with pq.ParquetWriter(
+        str(parquet_path), schema,
+        compression=compression,
+        write_statistics=write_statistics,
+        use_dictionary=use_dictionary,
+    ) as writer:
+        tables = (_batch_to_table(batch, year=year, schema=schema)
+                  for batch in reader)
+        if sort:
+            tables = [sort_epacems(pa.concat_tables(list(tables)))]
+        for table in tables:
+            pending = (table if pending is None
+                       else pa.concat_tables([pending, table]))
+            while pending.num_rows >= row_group_size:
+                writer.write_table(pending.slice(0, row_group_size),
+                                   row_group_size=row_group_size)
+                pending = pending.slice(row_group_size)
+            num_rows += table.num_rows
+        if pending is not None and pending.num_rows:
+            writer.write_table(pending, row_group_size=row_group_size)
+    return num_rows
+
+
+def _convert_partition(year, state, data_dir, out_dir, partition_cols,
+                       **kwargs):
+    """
+    Convert one EPA CEMS state-year to Parquet, replacing any earlier output.
+
+    Args:
+        year (int): The year of the partition.
+        state (str): The 2-letter US state code of the partition.
+        data_dir (path-like): The datapackage directory holding the CSVs.
+        out_dir (path-like): Top level directory of the Parquet dataset.
+        partition_cols (tuple): The columns the dataset is partitioned by.
+        kwargs: Passed on to :func:`epacems_csv_to_parquet`.
+
+    Returns:
+        tuple: The year, state and the number of records converted.
+
+    """
+    resource_name = f"hourly_emissions_epacems_{year}_{state.lower()}"
+    values = {"year": year, "state": state.upper()}
+    partition_dir = pathlib.Path(
+        out_dir, *[f"{col}={values[col]}" for col in partition_cols])
+    # When partitioned by both year and state, the directory holds only this
+    # partition, including any files written by earlier conversions.
+    if set(partition_cols) == {"year", "state"} and partition_dir.exists():
+        shutil.rmtree(partition_dir)
+    partition_dir.mkdir(parents=True, exist_ok=True)
+    schema = create_cems_schema()
+    for col in partition_cols:
+        schema = schema.remove(schema.get_field_index(col))
+    num_rows = epacems_csv_to_parquet(
+        csv_path=pathlib.Path(data_dir, f"{resource_name}.csv.gz"),
+        parquet_path=partition_dir / f"{resource_name}.parquet",
+        year=year,
+        schema=schema,
+        **kwargs,
+    )
+    return year, state, num_rows
+
+
 def epacems_to_parquet(datapkg_path,
                        epacems_years,
                        epacems_states,
                        out_dir,
                        compression='snappy',
                        partition_cols=('year', 'state'),
-                       clobber=False):
+                       clobber=False,
+                       workers=1,
+                       row_group_size=1_000_000,
+                       write_statistics=True,
+                       use_dictionary=True,
+                       sort=False):
     """Take transformed EPA CEMS dataframes and output them as Parquet files.
 
     We need to do a few additional manipulations of the dataframes after they
@@ -160,6 +357,18 @@ def epacems_to_parquet(datapkg_path,
     The operating_datetime_utc identifies time in UTC, so there's a mismatch
     of a few hours on December 31 / January 1.)
 
+    Each state-year is streamed from its CSV into a single Parquet file in
+    its partition of the dataset, and the partitions are converted in a pool
+    of worker processes. Only the requested partitions are written, so unless
+    clobber is True, any other partitions already in the dataset are kept.
+    This allows e.g. a single new year of data to be added to the dataset.
+
+    When the dataset is partitioned by year and state, an index of the plants
+    and times in each row group is written alongside it afterward (see
+    :func:`pudl.load.parquet.epacems_row_group_index`), which
+    :mod:`pudl.output.epacems` uses to look up records. It is most useful if
+    the records are sorted.
+
     Args:
         datapkg_path (path-like): Path to the datapackage.json file describing
             the datapackage contaning the EPA CEMS data to be converted.
@@ -168,22 +377,39 @@ def epacems_to_parquet(datapkg_path,
         epacems_states (list): list of years from which we are trying to read
             CEMS data
         out_dir (path-like): The directory in which to output the Parquet files
-        compression (string):
-        partition_cols (tuple):
+        compression (string): Compression algorithm to use for Parquet files.
+        partition_cols (tuple): Columns to partition the dataset by. May
+            include year and/or state.
         clobber (bool): If True and there is already a directory with out_dirs
             name, the existing parquet files will be deleted and new ones will
-            be generated in their place.
+            be generated in their place. Otherwise only the requested
+            partitions are replaced.
+        workers (int): The number of worker processes to use.
+        row_group_size (int): The number of records in each row group.
+        write_statistics (bool or list): Whether to store min/max statistics
+            for each row group, either for all columns or the listed ones.
+        use_dictionary (bool or list): Whether to dictionary encode values in
+            the Parquet files, either for all columns or the listed ones.
+        sort (bool): Whether to sort each partition by plant_id_eia, unitid
+            and operating_datetime_utc before writing it. This requires a whole
+            partition to fit in memory.
 
     Raises:
-        AssertionError: Raised if an output directory is not specified.
-
-    Todo:
-        Return to
+        AssertionError: Raised if an output directory is not specified, or
+            the dataset is partitioned by an unsupported column.
 
     """
     if not out_dir:
         raise AssertionError("Required output directory not specified.")
-    out_dir = pudl.helpers.prep_dir(out_dir, clobber=clobber)
+    if not set(partition_cols) <= {"year", "state"}:
+        raise AssertionError(
+            f"EPA CEMS can only be partitioned by year and state, not "
+            f"{partition_cols}")
+    if clobber:
+        out_dir = pudl.helpers.prep_dir(out_dir, clobber=clobber)
+    else:
+        out_dir = pathlib.Path(out_dir)
+        out_dir.mkdir(parents=True, exist_ok=True)
     data_dir = pathlib.Path(datapkg_path).parent / "data"
 
     # Verify that all the requested data files are present:
@@ -202,24 +428,26 @@ def epacems_to_parquet(datapkg_path,
     # TODO: Rather than going directly to the data directory, we should really
     # use the metadata inside the datapackage to find the appropriate file
     # paths pertaining to the CEMS years/states of interest.
-    in_types = create_in_dtypes()
-    schema = create_cems_schema()
-    for year in epacems_years:
-        for state in epacems_states:
-            newpath = pathlib.Path(
-                data_dir,
-                f"hourly_emissions_epacems_{year}_{state.lower()}.csv.gz")
-            df = (
-                pd.read_csv(newpath, dtype=in_types,
-                            parse_dates=["operating_datetime_utc"])
-                .assign(year=year)
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(
+                _convert_partition, year, state,
+                data_dir=data_dir,
+                out_dir=out_dir,
+                partition_cols=tuple(partition_cols),
+                row_group_size=row_group_size,
+                compression=compression,
+                write_statistics=write_statistics,
+                use_dictionary=use_dictionary,
+                sort=sort,
             )
-            logger.info(f"{year}-{state}: {len(df)} records")
-            pq.write_to_dataset(
-                pa.Table.from_pandas(
-                    df, preserve_index=False, schema=schema),
-                root_path=str(out_dir), partition_cols=list(partition_cols),
-                compression=compression)
+            for year in epacems_years for state in epacems_states
+        ]
+        for future in concurrent.futures.as_completed(futures):
+            year, state, num_rows = future.result()
+            logger.info(f"{year}-{state}: {num_rows} records")
+    if set(partition_cols) == {"year", "state"}:
+        pudl.load.parquet.write_epacems_index(out_dir)
 
 
 def parse_command_line(argv):
@@ -286,13 +514,52 @@ def parse_command_line(argv):
         is everything: all 48 continental US states plus Washington DC.""",
         default=pc.cems_states.keys()
     )
+    parser.add_argument(
+        '-w',
+        '--workers',
+        type=int,
+        help="""Number of worker processes used to convert the state-year
+        partitions. (default: %(default)s).""",
+        default=1
+    )
+    parser.add_argument(
+        '--row-group-size',
+        type=int,
+        help="""Number of records in each row group of the Parquet files.
+        (default: %(default)s).""",
+        default=1_000_000
+    )
+    parser.add_argument(
+        '--statistics',
+        nargs='+',
+        type=str,
+        help="""Only store min/max statistics for these columns in each row
+        group. By default statistics are stored for all columns.""",
+        default=None
+    )
+    parser.add_argument(
+        '--dictionary',
+        nargs='+',
+        type=str,
+        help="""Only dictionary encode these columns, e.g. unit_id_epa. By
+        default all columns are dictionary encoded.""",
+        default=None
+    )
+    parser.add_argument(
+        '--sort',
+        action='store_true',
+        help="""Sort each partition by plant, unit and time, so that the
+        records for a given plant can be found without reading all of the row
+        groups. Each partition is then read into memory all at once.""",
+        default=False
+    )
     parser.add_argument(
         '-c',
         '--clobber',
         action='store_true',
-        help="""Clobber existing parquet files if they exist. If clobber is not
-        included but the parquet directory already exists the _build will
-        fail.""",
+        help="""Delete the whole existing Parquet dataset before converting.
+        If clobber is not included, only the partitions for the requested years
+        and states are replaced, and any others are left as they are.""",
         default=False)
     arguments = parser.parse_args(argv[1:])
     return arguments
@@ -317,7 +584,12 @@ def main():
                            pudl_settings['parquet_dir'], "epacems"),
                        compression=args.compression,
                        partition_cols=('year', 'state'),
-                       clobber=args.clobber)
+                       clobber=args.clobber,
+                       workers=args.workers,
+                       row_group_size=args.row_group_size,
+                       write_statistics=args.statistics or True,
+                       use_dictionary=args.dictionary or True,
+                       sort=args.sort)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,122 @@
+"""Unit tests for pudl.convert.epacems_to_parquet module."""
+import gzip
+import pathlib
+import tempfile
+import unittest
+
+import pandas as pd
+import pyarrow.parquet as pq
+
+import pudl.convert.epacems_to_parquet as epacems_to_parquet
+import pudl.load.csv
+import pudl.load.parquet
+
+
+class TestEpacemsCsvToParquet(unittest.TestCase):
+    """Test streaming EPA CEMS CSVs into Parquet files."""
+
+    def setUp(self):
+        """Write a small EPA CEMS CSV, as the ETL does."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.csv_path = pathlib.Path(
+            self.tmpdir.name, "data", "hourly_emissions_epacems_2018_co.csv.gz")
+        self.csv_path.parent.mkdir()
+        self.parquet_path = pathlib.Path(self.tmpdir.name, "co.parquet")
+        self.df = pd.DataFrame({
+            "state": ["CO", "CO", "CO"],
+            "plant_id_eia": [470, 3, 3],
+            "unitid": ["CT2", "1", "1"],
+            "operating_datetime_utc": pd.to_datetime(
+                ["2018-01-01 07:00", "2018-01-01 06:00", "2018-01-01 05:00"],
+                utc=True),
+            "operating_time_hours": [1.0, 0.5, None],
+            "gross_load_mw": [100.0, 50.25, 0.0],
+            "steam_load_1000_lbs": None,
+            "so2_mass_lbs": [1.5, None, 2.5],
+            "so2_mass_measurement_code": ["Measured", None, "Substitute"],
+            "nox_rate_lbs_mmbtu": [0.1, 0.2, 0.3],
+            "nox_rate_measurement_code": ["Measured", "Calculated", None],
+            "nox_mass_lbs": [10.0, 20.0, 30.0],
+            "nox_mass_measurement_code": ["Measured", "Measured", "Measured"],
+            "co2_mass_tons": [5.0, 6.0, 7.0],
+            "co2_mass_measurement_code": ["Measured", None, "Measured"],
+            "heat_content_mmbtu": [1000.0, 500.0, 0.0],
+            "facility_id": pd.array([1, 2, None], dtype="Int32"),
+            "unit_id_epa": pd.array([10, 20, None], dtype="Int32"),
+        })
+        pudl.load.csv.csv_dump(
+            self.df, "hourly_emissions_epacems_2018_co", keep_index=False,
+            datapkg_dir=self.tmpdir.name)
+
+    def tearDown(self):
+        """Remove the temporary files."""
+        self.tmpdir.cleanup()
+
+    def test_csv_to_parquet(self):
+        """Records are converted to the CEMS schema, in row groups."""
+        schema = epacems_to_parquet.create_cems_schema()
+        num_rows = epacems_to_parquet.epacems_csv_to_parquet(
+            self.csv_path, self.parquet_path, year=2018, schema=schema,
+            row_group_size=2, sort=True)
+        self.assertEqual(3, num_rows)
+        parquet_file = pq.ParquetFile(str(self.parquet_path))
+        self.assertEqual(2, parquet_file.metadata.num_row_groups)
+        # Dictionary indices are widened when they're read back from Parquet.
+        self.assertListEqual(
+            [(f.name, getattr(f.type, "value_type", f.type)) for f in schema],
+            [(f.name, getattr(f.type, "value_type", f.type))
+             for f in parquet_file.schema_arrow])
+
+        df = parquet_file.read().to_pandas()
+        self.assertListEqual([2018] * 3, df.year.tolist())
+        self.assertListEqual([3, 3, 470], df.plant_id_eia.tolist())
+        self.assertListEqual(
+            ["Substitute", None, "Measured"],
+            df.so2_mass_measurement_code.astype(object)
+            .where(df.so2_mass_measurement_code.notna(), None).tolist())
+        self.assertListEqual(["CO"] * 3, df.state.astype(str).tolist())
+        pd.testing.assert_series_equal(
+            pd.Series(pd.to_datetime(
+                ["2018-01-01 05:00", "2018-01-01 06:00", "2018-01-01 07:00"],
+                utc=True), name="operating_datetime_utc"),
+            df.operating_datetime_utc.dt.tz_convert("UTC"),
+            check_dtype=False)
+
+    def test_large_row_groups(self):
+        """Row groups larger than PyArrow's default maximum aren't split."""
+        with gzip.open(self.csv_path, "rt") as f:
+            header, *records = f.readlines()
+        with gzip.open(self.csv_path, "wt") as f:
+            f.write(header)
+            f.writelines(records * 400_000)
+        num_rows = epacems_to_parquet.epacems_csv_to_parquet(
+            self.csv_path, self.parquet_path, year=2018,
+            schema=epacems_to_parquet.create_cems_schema(),
+            row_group_size=1_100_000)
+        self.assertEqual(1_200_000, num_rows)
+        metadata = pq.ParquetFile(str(self.parquet_path)).metadata
+        self.assertEqual(2, metadata.num_row_groups)
+        self.assertListEqual(
+            [1_100_000, 100_000],
+            [metadata.row_group(i).num_rows for i in range(2)])
+
+    def test_unknown_codes_logged(self):
+        """Codes that the Parquet schema doesn't know about are reported."""
+        df = self.df.assign(nox_mass_measurement_code=["LME2", "Measured", None])
+        pudl.load.csv.csv_dump(
+            df, "hourly_emissions_epacems_2018_co", keep_index=False,
+            datapkg_dir=self.tmpdir.name)
+        with self.assertLogs(epacems_to_parquet.logger, "WARNING") as logs:
+            epacems_to_parquet.epacems_csv_to_parquet(
+                self.csv_path, self.parquet_path, year=2018,
+                schema=epacems_to_parquet.create_cems_schema())
+        self.assertIn("nox_mass_measurement_code", logs.output[0])
+        self.assertIn("LME2", logs.output[0])
+
+        with self.assertLogs(pudl.load.parquet.logger, "WARNING") as logs:
+            table = pudl.load.parquet.epacems_df_to_table(
+                df.astype({"nox_mass_measurement_code": "category"}), 2018)
+        self.assertIn("['LME2']", logs.output[0])
+        self.assertEqual(
+            [None, "Measured", None],
+            table.column("nox_mass_measurement_code").to_pylist())
@@ -44,6 +44,22 @@ def parse_command_line(argv):
         not included but the sqlite databse already exists the _build will
         fail.""",
         default=False)
+    parser.add_argument(
+        '-i',
+        '--incremental',
+        action='store_true',
+        help="""Update an existing sqlite database, only loading the years of
+        each table whose DBF files are new or have changed since they were
+        loaded.""",
+        default=False)
+    parser.add_argument(
+        '-w',
+        '--workers',
+        type=int,
+        help="""Number of worker processes used to read the FERC Form 1 DBF
+        files. The database is always written by a single process.
+        (default: %(default)s).""",
+        default=1)
     arguments = parser.parse_args(argv[1:])
     return arguments
 
@@ -81,6 +97,11 @@ def main():  # noqa: C901
     )
 
     # Check args for basic validity:
+    if args.clobber and args.incremental:
+        raise ValueError("The --clobber and --incremental options conflict.")
+    if args.workers < 1:
+        raise ValueError(
+            f"The number of workers must be at least 1, but got {args.workers}.")
     for table in script_settings['ferc1_to_sqlite_tables']:
         if table not in pc.ferc1_tbl2dbf:
             raise ValueError(
@@ -116,7 +137,9 @@ def main():  # noqa: C901
         refyear=script_settings['ferc1_to_sqlite_refyear'],
         pudl_settings=pudl_settings,
         bad_cols=bad_cols,
-        clobber=args.clobber)
+        clobber=args.clobber,
+        workers=args.workers,
+        incremental=args.incremental)
 
 
 if __name__ == '__main__':
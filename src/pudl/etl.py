@@ -17,8 +17,10 @@ data from:
 
 """
 
+import concurrent.futures
 import logging
 import pathlib
+import shutil
 import time
 import uuid
 
@@ -93,7 +95,35 @@ def _validate_params_eia(etl_params):  # noqa: C901
     if not eia_input_dict['eia860_years'] and eia_input_dict['eia923_years']:
         eia_input_dict['eia860_years'] = eia_input_dict['eia923_years']
 
+    # the number of worker processes used to read the EIA spreadsheets
+    # defaults to 1, meaning they are all read serially.
+    try:
+        eia_input_dict['eia_workers'] = etl_params['eia_workers']
+    except KeyError:
+        eia_input_dict['eia_workers'] = 1
+
+    # parsed EIA spreadsheets are only cached on disk if a maximum size for
+    # the cache is given, in MB.
+    try:
+        eia_input_dict['eia_sheet_cache_mb'] = etl_params['eia_sheet_cache_mb']
+    except KeyError:
+        eia_input_dict['eia_sheet_cache_mb'] = None
+
     # Validate the etl_params
+    if (not isinstance(eia_input_dict['eia_workers'], int)
+            or eia_input_dict['eia_workers'] < 1):
+        raise AssertionError(
+            f"eia_workers must be a positive integer, but got "
+            f"{eia_input_dict['eia_workers']}"
+        )
+    if (eia_input_dict['eia_sheet_cache_mb'] is not None
+            and (not isinstance(eia_input_dict['eia_sheet_cache_mb'], int)
+                 or eia_input_dict['eia_sheet_cache_mb'] < 1)):
+        raise AssertionError(
+            f"eia_sheet_cache_mb must be a positive integer, but got "
+            f"{eia_input_dict['eia_sheet_cache_mb']}"
+        )
+
     if eia_input_dict['eia860_tables']:
         for table in eia_input_dict['eia860_tables']:
             if table not in pc.pudl_tables["eia860"]:
@@ -191,6 +221,7 @@ def _etl_eia(etl_params, datapkg_dir, pudl_settings):
     eia923_years = eia_inputs['eia923_years']
     eia860_tables = eia_inputs['eia860_tables']
     eia860_years = eia_inputs['eia860_years']
+    eia_workers = eia_inputs['eia_workers']
 
     if (not eia923_tables or not eia923_years) and \
             (not eia860_tables or not eia860_years):
@@ -202,10 +233,17 @@ def _etl_eia(etl_params, datapkg_dir, pudl_settings):
 
     # Extract EIA forms 923, 860
     data_dir = pudl_settings["data_dir"]
+    sheet_cache = None
+    if eia_inputs['eia_sheet_cache_mb'] is not None:
+        sheet_cache = pudl.extract.excel.SheetCache(
+            pathlib.Path(data_dir, pudl.extract.excel.SHEET_CACHE_DIR),
+            max_size_mb=eia_inputs['eia_sheet_cache_mb'])
     eia923_raw_dfs = pudl.extract.eia923.Extractor(
-        data_dir).extract(eia923_years)
+        data_dir, workers=eia_workers,
+        sheet_cache=sheet_cache).extract(eia923_years)
     eia860_raw_dfs = pudl.extract.eia860.Extractor(
-        data_dir).extract(eia860_years)
+        data_dir, workers=eia_workers,
+        sheet_cache=sheet_cache).extract(eia860_years)
     # Transform EIA forms 923, 860
     eia923_transformed_dfs = pudl.transform.eia923.transform(
         eia923_raw_dfs, eia923_tables=eia923_tables)
@@ -353,7 +391,7 @@ def _etl_ferc1(etl_params, datapkg_dir, pudl_settings):
 ###############################################################################
 # EPA CEMS EXPORT FUNCTIONS
 ###############################################################################
-def _validate_params_epacems(etl_params):
+def _validate_params_epacems(etl_params):  # noqa: C901
     epacems_dict = {}
     # pull out the etl_params from the dictionary passed into this function
     try:
@@ -369,6 +407,66 @@ def _validate_params_epacems(etl_params):
     if epacems_dict['epacems_states']:
         if epacems_dict['epacems_states'][0].lower() == 'all':
             epacems_dict['epacems_states'] = list(pc.cems_states.keys())
+    # the number of worker processes used to process the state-year partitions
+    # defaults to 1, meaning they are all processed serially.
+    try:
+        epacems_dict['epacems_workers'] = etl_params['epacems_workers']
+    except KeyError:
+        epacems_dict['epacems_workers'] = 1
+    if (not isinstance(epacems_dict['epacems_workers'], int)
+            or epacems_dict['epacems_workers'] < 1):
+        raise AssertionError(
+            f"epacems_workers must be a positive integer, but got "
+            f"{epacems_dict['epacems_workers']}"
+        )
+    # If a memory limit is given, CEMS is streamed in chunks of records small
+    # enough to fit within it. Otherwise each state-year is read all at once.
+    try:
+        epacems_dict['epacems_chunk_memory_mb'] = (
+            etl_params['epacems_chunk_memory_mb'])
+    except KeyError:
+        epacems_dict['epacems_chunk_memory_mb'] = None
+    if (epacems_dict['epacems_chunk_memory_mb'] is not None
+            and not epacems_dict['epacems_chunk_memory_mb'] > 0):
+        raise AssertionError(
+            f"epacems_chunk_memory_mb must be positive, but got "
+            f"{epacems_dict['epacems_chunk_memory_mb']}"
+        )
+    # Incremental runs only process the partitions whose inputs have changed
+    # since they were last output into the datapackage.
+    try:
+        epacems_dict['epacems_incremental'] = etl_params['epacems_incremental']
+    except KeyError:
+        epacems_dict['epacems_incremental'] = False
+    if not isinstance(epacems_dict['epacems_incremental'], bool):
+        raise AssertionError(
+            f"epacems_incremental must be true or false, but got "
+            f"{epacems_dict['epacems_incremental']}"
+        )
+    # CEMS is written out to gzipped CSVs unless Parquet is requested.
+    try:
+        epacems_dict['epacems_output_format'] = (
+            etl_params['epacems_output_format'])
+    except KeyError:
+        epacems_dict['epacems_output_format'] = 'csv'
+    if epacems_dict['epacems_output_format'] not in ('csv', 'parquet'):
+        raise AssertionError(
+            f"Unrecognized EPA CEMS output format: "
+            f"{epacems_dict['epacems_output_format']}"
+        )
+    # Daily, monthly and/or annual totals can be output alongside the hourly
+    # data, while it's streaming through the ETL anyway.
+    try:
+        epacems_dict['epacems_rollups'] = list(etl_params['epacems_rollups'])
+    except KeyError:
+        epacems_dict['epacems_rollups'] = []
+    bad_rollups = [freq for freq in epacems_dict['epacems_rollups']
+                   if freq not in pc.epacems_rollup_tables]
+    if bad_rollups:
+        raise AssertionError(
+            f"Unrecognized EPA CEMS rollups: {bad_rollups}. Expected any of "
+            f"{list(pc.epacems_rollup_tables)}"
+        )
 
     # CEMS is ALWAYS going to be partitioned by year and state. This means we
     # are functinoally removing the option to not partition or partition another
@@ -377,6 +475,9 @@ def _validate_params_epacems(etl_params):
     # partitioned tables differently).
     epacems_dict['partition'] = {'hourly_emissions_epacems':
                                  ['epacems_years', 'epacems_states']}
+    for freq in epacems_dict['epacems_rollups']:
+        epacems_dict['partition'][pc.epacems_rollup_tables[freq]] = [
+            'epacems_years', 'epacems_states']
     # this is maybe unnecessary because we are hardcoding the partitions, but
     # we are still going to validate that the partitioning is
     epacems_dict['partition'] = _validate_params_partition(
@@ -392,10 +493,279 @@ def _validate_params_epacems(etl_params):
         return epacems_dict
 
 
+# Plant UTC offsets used by each EPA CEMS worker process. They are loaded once
+# when the worker starts up, rather than once for every partition.
+_EPACEMS_PLANT_UTC_OFFSET = None
+
+
+def _init_epacems_worker(datapkg_dir):
+    """Load the plant UTC offsets used by an EPA CEMS worker process."""
+    global _EPACEMS_PLANT_UTC_OFFSET
+    _EPACEMS_PLANT_UTC_OFFSET = pudl.transform.epacems.load_plant_utc_offset(
+        datapkg_dir)
+
+
+def _load_epacems(epacems_transformed_dfs, datapkg_dir, output_format='csv'):
+    """Load transformed EPA CEMS dataframes, returning the resource names."""
+    if output_format == 'parquet':
+        return pudl.load.parquet.dump_epacems(
+            epacems_transformed_dfs, "EPA CEMS", datapkg_dir=datapkg_dir)
+    epacems_tables = []
+    # run the cems generator dfs through the load step
+    for transformed_df_dict in epacems_transformed_dfs:
+        pudl.load.csv.dict_dump(transformed_df_dict,
+                                "EPA CEMS",
+                                datapkg_dir=datapkg_dir)
+        # When CEMS is streamed in chunks, each resource shows up many times.
+        for resource_name in transformed_df_dict:
+            if resource_name not in epacems_tables:
+                epacems_tables.append(resource_name)
+    return epacems_tables
+
+
+def _etl_epacems_partition(year, state, data_dir, datapkg_dir,
+                           output_format='csv', chunksize=None,
+                           rollups=(), plant_utc_offset=None):
+    """
+    Extract, transform and load a single EPA CEMS state-year partition.
+
+    When this function is run inside the worker processes of the parallel EPA
+    CEMS ETL, they must have been initialized with
+    :func:`_init_epacems_worker`.
+
+    Args:
+        year (int): The year of CEMS data to process.
+        state (str): The 2-letter code of the state whose data is processed.
+        data_dir (path-like): Path to the top directory of the PUDL datastore.
+        datapkg_dir (path-like): The location of the directory for this
+            package, which will contain a datapackage.json file and a data
+            directory in which the CSV file are stored.
+        output_format (str): Either 'csv' or 'parquet'.
+        chunksize (int): If not None, the number of records to stream through
+            the ETL at a time.
+        rollups (iterable): The periods to total the hourly data over and
+            output as well, i.e. keys of :data:`pudl.constants.epacems_rollup_tables`.
+        plant_utc_offset (pandas.DataFrame): The UTC offset of each EIA plant.
+            If None, the offsets loaded by the worker process are used.
+
+    Returns:
+        list: Names of the EPA CEMS resources output for this partition.
+
+    """
+    if plant_utc_offset is None:
+        plant_utc_offset = _EPACEMS_PLANT_UTC_OFFSET
+    epacems_raw_dfs = pudl.extract.epacems.extract(
+        epacems_years=[year],
+        states=[state],
+        data_dir=data_dir,
+        chunksize=chunksize)
+    epacems_transformed_dfs = pudl.transform.epacems.transform(
+        epacems_raw_dfs=epacems_raw_dfs,
+        datapkg_dir=datapkg_dir,
+        plant_utc_offset=plant_utc_offset)
+    if rollups:
+        epacems_transformed_dfs = pudl.transform.epacems.rollup(
+            epacems_transformed_dfs,
+            freqs=rollups,
+            plant_utc_offset=plant_utc_offset)
+    return _load_epacems(epacems_transformed_dfs, datapkg_dir, output_format)
+
+
+def _etl_epacems_partitions(partitions, epacems_workers, output_format,
+                            chunksize, rollups, datapkg_dir, pudl_settings):
+    """
+    Process EPA CEMS state-year partitions, serially or in parallel.
+
+    The state-year partitions are independent of each other, and each of them
+    is written out to its own file, so if more than one worker is requested
+    they are extracted, transformed and loaded concurrently in a pool of
+    worker processes.
+
+    Args:
+        partitions (list): The (year, state) tuples to process.
+        epacems_workers (int): The number of worker processes to use. If 1,
+            the partitions are processed serially in this process.
+        output_format (str): Either 'csv' or 'parquet'.
+        chunksize (int): If not None, the number of records each worker
+            streams through the ETL at a time.
+        rollups (iterable): The periods to total the hourly data over, i.e.
+            keys of :data:`pudl.constants.epacems_rollup_tables`.
+        datapkg_dir (path-like): The location of the directory for this
+            package, which will contain a datapackage.json file and a data
+            directory in which the CSV file are stored.
+        pudl_settings (dict) : a dictionary filled with settings that mostly
+            describe paths to various resources and outputs.
+
+    Yields:
+        tuple: The year and state of each partition once it has been output,
+        and the list of names of the resources that were output for it. The
+        partitions are yielded in the order they were given.
+
+    """
+    if epacems_workers == 1:
+        plant_utc_offset = pudl.transform.epacems.load_plant_utc_offset(
+            datapkg_dir)
+        for year, state in partitions:
+            yield year, state, _etl_epacems_partition(
+                year, state, pudl_settings["data_dir"], datapkg_dir,
+                output_format, chunksize, rollups, plant_utc_offset)
+        return
+
+    logger.info(
+        f"Processing {len(partitions)} EPA CEMS partitions using "
+        f"{epacems_workers} worker processes.")
+    with concurrent.futures.ProcessPoolExecutor(
+        max_workers=epacems_workers,
+        initializer=_init_epacems_worker,
+        initargs=(datapkg_dir,),
+    ) as executor:
+        futures = [
+            executor.submit(_etl_epacems_partition, year, state,
+                            pudl_settings["data_dir"], datapkg_dir,
+                            output_format, chunksize, rollups)
+            for year, state in partitions
+        ]
+        # Collect the results in submission order, so the list of resources
+        # is the same as it would be if the partitions were run serially.
+        for (year, state), future in zip(partitions, futures):
+            yield year, state, future.result()
+
+
+def _prune_epacems_outputs(partition_paths, manifest, datapkg_dir):
+    """
+    Remove EPA CEMS outputs which are no longer requested from a datapackage.
+
+    Outputs of partitions, or tables of totals, which have been dropped from
+    the ETL settings since they were output, and outputs in a format other
+    than the one requested, are deleted. Partitions which are no longer
+    requested are removed from the manifest too.
+
+    Args:
+        partition_paths (dict): The paths of the requested outputs (values)
+            of each requested (year, state) partition (keys).
+        manifest (dict): The EPA CEMS manifest of the datapackage, which is
+            updated in place.
+        datapkg_dir (path-like): The location of the directory for this
+            package.
+
+    Returns:
+        None
+
+    """
+    requested_paths = {
+        path for output_paths in partition_paths.values()
+        for path in output_paths
+    }
+    for path in pudl.load.manifest.epacems_outputs(datapkg_dir):
+        if path not in requested_paths:
+            logger.info(f"Removing unrequested EPA CEMS output {path}")
+            path.unlink()
+    requested_resources = {
+        f"hourly_emissions_epacems_{year}_{state.lower()}"
+        for year, state in partition_paths
+    }
+    for resource_name in sorted(set(manifest) - requested_resources):
+        del manifest[resource_name]
+
+
+def _epacems_stale_partitions(partitions, epacems_dict, datapkg_dir,
+                              pudl_settings):
+    """
+    Find the EPA CEMS partitions whose inputs changed since they were output.
+
+    Args:
+        partitions (list): The (year, state) tuples requested.
+        epacems_dict (dict): The validated EPA CEMS ETL parameters.
+        datapkg_dir (path-like): The location of the directory for this
+            package.
+        pudl_settings (dict) : a dictionary filled with settings that mostly
+            describe paths to various resources and outputs.
+
+    Returns:
+        tuple: The list of (year, state) tuples which need to be processed,
+        the EPA CEMS manifest of the datapackage, and a dictionary of the
+        current fingerprints of the stale partitions' inputs, keyed by
+        resource name.
+
+    """
+    output_format = epacems_dict['epacems_output_format']
+    manifest = pudl.load.manifest.load_manifest(datapkg_dir)
+    code = pudl.load.manifest.code_fingerprint()
+    settings = {
+        'epacems_output_format': output_format,
+        'epacems_rollups': sorted(epacems_dict['epacems_rollups']),
+    }
+    tables = ['hourly_emissions_epacems'] + [
+        pc.epacems_rollup_tables[freq]
+        for freq in epacems_dict['epacems_rollups']]
+    partition_paths = {
+        (year, state): [
+            pudl.load.manifest.epacems_output_path(
+                datapkg_dir, f"{table}_{year}_{state.lower()}", output_format)
+            for table in tables
+        ]
+        for year, state in partitions
+    }
+    _prune_epacems_outputs(partition_paths, manifest, datapkg_dir)
+    stale = []
+    fingerprints = {}
+    for (year, state), output_paths in partition_paths.items():
+        resource_name = f"hourly_emissions_epacems_{year}_{state.lower()}"
+        fingerprint = pudl.load.manifest.epacems_fingerprint(
+            year, state,
+            data_dir=pudl_settings["data_dir"],
+            datapkg_dir=datapkg_dir,
+            code=code,
+            settings=settings,
+            previous=manifest.get(resource_name))
+        if (all(path.exists() for path in output_paths)
+                and pudl.load.manifest.is_unchanged(
+                    manifest.get(resource_name), fingerprint)):
+            # Keep track of files which were touched, but not changed, so
+            # that they don't have to be hashed again next time.
+            manifest[resource_name] = fingerprint
+            continue
+        # Anything left over from an earlier run would be appended to.
+        for path in output_paths:
+            if path.exists():
+                path.unlink()
+        manifest.pop(resource_name, None)
+        stale.append((year, state))
+        fingerprints[resource_name] = fingerprint
+    pudl.load.manifest.save_manifest(manifest, datapkg_dir)
+    logger.info(
+        f"Reusing {len(partitions) - len(stale)} unchanged EPA CEMS "
+        f"partitions, processing {len(stale)}.")
+    return stale, manifest, fingerprints
+
+
 def _etl_epacems(etl_params, datapkg_dir, pudl_settings):
     """
     Extracts, transforms and loads CSVs for EPA CEMS.
 
+    If the ``epacems_workers`` ETL parameter is greater than 1, the
+    state-year partitions are processed in a pool of that many worker
+    processes. Otherwise they are processed serially. If the
+    ``epacems_output_format`` ETL parameter is 'parquet', the transformed data
+    is written directly into a Parquet dataset within the datapackage (see
+    :mod:`pudl.load.parquet`) rather than into gzipped CSVs.
+
+    If the ``epacems_incremental`` ETL parameter is true, only the partitions
+    whose source files, settings or code have changed since they were output
+    into this datapackage are processed, and the other existing outputs are
+    reused. See :mod:`pudl.load.manifest`.
+
+    If the ``epacems_rollups`` ETL parameter lists any of "daily", "monthly"
+    or "annual", the hourly data are also totaled up for each unit over those
+    periods, and the totals are output as their own partitioned tables (see
+    :func:`pudl.transform.epacems.rollup`).
+
+    If the ``epacems_chunk_memory_mb`` ETL parameter is set, each state-year is
+    streamed through the ETL in chunks of records that should fit within that
+    much memory (see :func:`pudl.extract.epacems.chunksize_from_memory`),
+    rather than being read into memory all at once. When running in parallel,
+    each of the worker processes uses up to that much memory.
+
     Args:
         etl_params (dict): ETL parameters required by this data source.
         datapkg_dir (path-like): The location of the directory for this
@@ -411,31 +781,55 @@ def _etl_epacems(etl_params, datapkg_dir, pudl_settings):
     epacems_dict = pudl.etl._validate_params_epacems(etl_params)
     epacems_years = epacems_dict['epacems_years']
     epacems_states = epacems_dict['epacems_states']
+    epacems_workers = epacems_dict['epacems_workers']
+    epacems_output_format = epacems_dict['epacems_output_format']
+    if epacems_dict['epacems_chunk_memory_mb'] is None:
+        chunksize = None
+    else:
+        chunksize = pudl.extract.epacems.chunksize_from_memory(
+            epacems_dict['epacems_chunk_memory_mb'])
     # If we're not doing CEMS, just stop here to avoid printing messages like
     # "Reading EPA CEMS data...", which could be confusing.
     if not epacems_states or not epacems_years:
         logger.info('Not ingesting EPA CEMS.')
 
-    # NOTE: This a generator for raw dataframes
-    epacems_raw_dfs = pudl.extract.epacems.extract(
-        epacems_years=epacems_years,
-        states=epacems_states,
-        data_dir=pudl_settings["data_dir"])
-    # NOTE: This is a generator for transformed dataframes
-    epacems_transformed_dfs = pudl.transform.epacems.transform(
-        epacems_raw_dfs=epacems_raw_dfs,
-        datapkg_dir=datapkg_dir)
-
     logger.info("Loading tables from EPA CEMS into PUDL:")
     if logger.isEnabledFor(logging.INFO):
         start_time = time.monotonic()
-    epacems_tables = []
-    # run the cems generator dfs through the load step
-    for transformed_df_dict in epacems_transformed_dfs:
-        pudl.load.csv.dict_dump(transformed_df_dict,
-                                "EPA CEMS",
-                                datapkg_dir=datapkg_dir)
-        epacems_tables.append(list(transformed_df_dict.keys())[0])
+
+    partitions = [(year, state)
+                  for year in epacems_years for state in epacems_states]
+    if epacems_dict['epacems_incremental']:
+        stale_partitions, manifest, fingerprints = _epacems_stale_partitions(
+            partitions, epacems_dict, datapkg_dir, pudl_settings)
+    else:
+        stale_partitions = partitions
+
+    for year, state, _ in _etl_epacems_partitions(
+        stale_partitions,
+        epacems_workers=epacems_workers,
+        output_format=epacems_output_format,
+        chunksize=chunksize,
+        rollups=epacems_dict['epacems_rollups'],
+        datapkg_dir=datapkg_dir,
+        pudl_settings=pudl_settings,
+    ):
+        if epacems_dict['epacems_incremental']:
+            # Record each partition as soon as it's done, so an interrupted
+            # run can pick up where it left off.
+            resource_name = f"hourly_emissions_epacems_{year}_{state.lower()}"
+            manifest[resource_name] = fingerprints[resource_name]
+            pudl.load.manifest.save_manifest(manifest, datapkg_dir)
+
+    # Every requested partition now has an up to date output.
+    epacems_tables = [
+        f"{table}_{year}_{state.lower()}"
+        for year, state in partitions
+        for table in ['hourly_emissions_epacems'] + [
+            pc.epacems_rollup_tables[freq]
+            for freq in epacems_dict['epacems_rollups']]
+    ]
+
     if logger.isEnabledFor(logging.INFO):
         time_message = "    Loading    EPA CEMS took {}".format(
             time.strftime("%H:%M:%S",
@@ -802,6 +1196,62 @@ def etl(datapkg_settings, output_dir, pudl_settings):
     return processed_tables
 
 
+def _epacems_incremental(datapkg_settings):
+    """Check whether a datapackage updates EPA CEMS incrementally."""
+    return any(
+        dataset_dict["epacems"]["epacems_incremental"]
+        for dataset_dict in datapkg_settings["datasets"]
+        if "epacems" in dataset_dict
+    )
+
+
+def _prep_epacems_incremental_dir(data_dir, clobber=False):
+    """
+    Prepare the data directory of a datapackage which updates CEMS in place.
+
+    Like :func:`pudl.helpers.prep_dir`, except that any EPA CEMS outputs in
+    the directory are kept, so that they can be reused. Whether they are
+    still up to date, or even still requested, is checked when EPA CEMS is
+    processed. See :func:`_epacems_stale_partitions`.
+
+    Args:
+        data_dir (path-like): path to the datapackage's data directory.
+        clobber (bool): If True, all of the other outputs in the directory
+            are removed.
+
+    Raises:
+        FileExistsError: if there are outputs other than EPA CEMS in the
+            directory, and clobber is False.
+
+    Returns:
+        pathlib.Path: Path to the data directory.
+
+    """
+    data_dir = pathlib.Path(data_dir)
+    if not data_dir.exists():
+        return pudl.helpers.prep_dir(data_dir)
+    epacems_outputs = pudl.load.manifest.epacems_outputs(data_dir.parent)
+    others = [
+        path for path in sorted(data_dir.iterdir())
+        if path not in epacems_outputs
+        and not (path.is_dir()
+                 and path.name in pudl.load.manifest.EPACEMS_TABLES)
+    ]
+    if others and not clobber:
+        raise FileExistsError(
+            f'{data_dir} already contains outputs other than EPA CEMS and '
+            f'clobber is set to {clobber}')
+    logger.info(
+        f"Incrementally updating EPA CEMS in {data_dir}, keeping "
+        f"{len(epacems_outputs)} existing outputs.")
+    for path in others:
+        if path.is_dir():
+            shutil.rmtree(path)
+        else:
+            path.unlink()
+    return data_dir
+
+
 def generate_datapkg_bundle(datapkg_bundle_settings,
                             pudl_settings,
                             datapkg_bundle_name,
@@ -829,7 +1279,9 @@ def generate_datapkg_bundle(datapkg_bundle_settings,
         clobber (bool): If True and there is already a directory with data
             packages with the datapkg_bundle_name, the existing data packages
             will be deleted and new data packages will be generated in their
-            place.
+            place. In datapackages which update EPA CEMS incrementally, the
+            existing EPA CEMS outputs are kept, and everything else is
+            replaced.
 
     Returns:
         dict: A dictionary with datapackage names as the keys, and Python
@@ -855,7 +1307,13 @@ def generate_datapkg_bundle(datapkg_bundle_settings,
         # necessary parent directories. Don't save the Path though, because
         # we need to use the output_dir path for both the data generation and
         # the metadata generation.
-        _ = pudl.helpers.prep_dir(output_dir / "data", clobber=clobber)
+        # Incremental EPA CEMS runs reuse the CEMS outputs already in the data
+        # directory, so they must not be wiped out.
+        if _epacems_incremental(datapkg_settings):
+            _ = _prep_epacems_incremental_dir(
+                output_dir / "data", clobber=clobber)
+        else:
+            _ = pudl.helpers.prep_dir(output_dir / "data", clobber=clobber)
         # run the ETL functions for this pkg and return the list of tables
         # output to CSVs:
         datapkg_resources = etl(datapkg_settings, output_dir, pudl_settings)
@@ -0,0 +1,341 @@
+"""Unit tests for pudl.etl module."""
+import gzip
+import os
+import pathlib
+import tempfile
+import time
+import unittest
+import zipfile
+from unittest.mock import patch
+
+import pandas as pd
+import pyarrow.parquet as pq
+
+import pudl.constants as pc
+import pudl.etl
+import pudl.extract.epacems
+import pudl.load.manifest
+import pudl.workspace.datastore as datastore
+
+CEMS_CSV_COLUMNS = [
+    "STATE", "FACILITY_NAME", "ORISPL_CODE", "UNITID", "OP_DATE", "OP_HOUR",
+    "OP_TIME", "GLOAD (MW)", "SLOAD (1000lb/hr)", "SO2_MASS (lbs)",
+    "SO2_MASS_MEASURE_FLG", "SO2_RATE (lbs/mmBtu)", "SO2_RATE_MEASURE_FLG",
+    "NOX_RATE (lbs/mmBtu)", "NOX_RATE_MEASURE_FLG", "NOX_MASS (lbs)",
+    "NOX_MASS_MEASURE_FLG", "CO2_MASS (tons)", "CO2_MASS_MEASURE_FLG",
+    "CO2_RATE (tons/mmBtu)", "CO2_RATE_MEASURE_FLG", "HEAT_INPUT (mmBtu)",
+    "FAC_ID", "UNIT_ID",
+]
+
+
+def _fake_epacems_partition(year, state, data_dir, datapkg_dir,
+                            output_format, chunksize, rollups,
+                            plant_utc_offset=None):
+    """Stand in for pudl.etl._etl_epacems_partition in a worker process."""
+    if state == "XX":
+        raise ValueError(f"Bad EPA CEMS partition: {year} {state}")
+    # The first partition finishes last.
+    time.sleep(0.5 if state == "CO" else 0)
+    if plant_utc_offset is None:
+        plant_utc_offset = pudl.etl._EPACEMS_PLANT_UTC_OFFSET
+    return [f"hourly_emissions_epacems_{year}_{state.lower()}"] + [
+        f"{plant_id}:{offset}" for plant_id, offset in zip(
+            plant_utc_offset.plant_id_eia, plant_utc_offset.utc_offset)]
+
+
+class TestEpacemsIncremental(unittest.TestCase):
+    """Test finding the EPA CEMS partitions which need to be processed."""
+
+    def setUp(self):
+        """Create CEMS source files and an empty datapackage."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.data_dir = pathlib.Path(self.tmpdir.name, "data")
+        self.datapkg_dir = pathlib.Path(self.tmpdir.name, "datapkg")
+        self.partitions = [(2018, "CO"), (2018, "ID")]
+        for year, state in self.partitions:
+            for month in range(1, 13):
+                path = pathlib.Path(datastore.path(
+                    "epacems", year=year, month=month, state=state,
+                    data_dir=self.data_dir))
+                path.parent.mkdir(parents=True, exist_ok=True)
+                path.write_bytes(f"{year}{state}{month}".encode())
+        pathlib.Path(self.datapkg_dir, "data").mkdir(parents=True)
+        pathlib.Path(
+            self.datapkg_dir, "data", "plants_entity_eia.csv").touch()
+
+    def tearDown(self):
+        """Remove the temporary files."""
+        self.tmpdir.cleanup()
+
+    def _run(self, partitions=None, rollups=(), output_format="csv"):
+        """Process the stale partitions, as pudl.etl._etl_epacems does."""
+        if partitions is None:
+            partitions = self.partitions
+        epacems_dict = {
+            "epacems_output_format": output_format,
+            "epacems_rollups": list(rollups),
+        }
+        stale, manifest, fingerprints = pudl.etl._epacems_stale_partitions(
+            partitions, epacems_dict, self.datapkg_dir,
+            {"data_dir": self.data_dir})
+        for year, state in stale:
+            for table in ["hourly_emissions_epacems"] + [
+                    pc.epacems_rollup_tables[freq]
+                    for freq in rollups]:
+                path = pudl.load.manifest.epacems_output_path(
+                    self.datapkg_dir, f"{table}_{year}_{state.lower()}",
+                    output_format)
+                path.parent.mkdir(parents=True, exist_ok=True)
+                path.touch()
+            resource_name = f"hourly_emissions_epacems_{year}_{state.lower()}"
+            manifest[resource_name] = fingerprints[resource_name]
+            pudl.load.manifest.save_manifest(manifest, self.datapkg_dir)
+        return stale
+
+    def _source(self, year, state, month=1):
+        """Path to one of the CEMS source files."""
+        return pathlib.Path(datastore.path(
+            "epacems", year=year, month=month, state=state,
+            data_dir=self.data_dir))
+
+    def _outputs(self):
+        """The names of the CEMS resources output to the datapackage."""
+        return sorted(
+            pudl.load.manifest.epacems_outputs(self.datapkg_dir).values())
+
+    def test_unchanged(self):
+        """Unchanged partitions are reused, even if their inputs were touched."""
+        self.assertListEqual(self.partitions, self._run())
+        self.assertListEqual([], self._run())
+
+        source = self._source(2018, "CO")
+        stat = source.stat()
+        os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        self.assertListEqual([], self._run())
+        # The new modification time is recorded, so the file isn't hashed
+        # again next time.
+        manifest = pudl.load.manifest.load_manifest(self.datapkg_dir)
+        self.assertEqual(
+            source.stat().st_mtime_ns,
+            manifest["hourly_emissions_epacems_2018_co"]
+            ["sources"][source.name]["mtime_ns"])
+
+    def test_changed_inputs(self):
+        """Partitions are processed if their source files change."""
+        self._run()
+        self._source(2018, "ID", month=7).write_bytes(b"revised")
+        self.assertListEqual([(2018, "ID")], self._run())
+        pathlib.Path(
+            self.datapkg_dir, "data", "plants_entity_eia.csv").write_text("x")
+        self.assertListEqual(self.partitions, self._run())
+
+    def test_changed_settings_or_code(self):
+        """All of the partitions are processed if the settings or code change."""
+        self._run()
+        self.assertListEqual(self.partitions, self._run(rollups=["daily"]))
+        self.assertListEqual([], self._run(rollups=["daily"]))
+        with patch.object(pudl.load.manifest, "code_fingerprint",
+                          return_value="0.0+changed"):
+            self.assertListEqual(
+                self.partitions, self._run(rollups=["daily"]))
+
+    def test_missing_output(self):
+        """Partitions are processed if any of their outputs are missing."""
+        self._run(rollups=["annual"])
+        pudl.load.manifest.epacems_output_path(
+            self.datapkg_dir, "annual_emissions_epacems_2018_co").unlink()
+        self.assertListEqual([(2018, "CO")], self._run(rollups=["annual"]))
+
+    def test_unrequested_outputs(self):
+        """Outputs and manifest entries which aren't requested are removed."""
+        self._run(rollups=["daily", "annual"])
+        self.assertListEqual([], self._run(
+            partitions=[(2018, "CO")], rollups=["daily", "annual"]))
+        self.assertListEqual(
+            ["annual_emissions_epacems_2018_co",
+             "daily_emissions_epacems_2018_co",
+             "hourly_emissions_epacems_2018_co"],
+            self._outputs())
+        self.assertListEqual(
+            ["hourly_emissions_epacems_2018_co"],
+            list(pudl.load.manifest.load_manifest(self.datapkg_dir)))
+
+        self._run(partitions=[(2018, "CO")], rollups=["daily"])
+        self.assertListEqual(
+            ["daily_emissions_epacems_2018_co",
+             "hourly_emissions_epacems_2018_co"],
+            self._outputs())
+
+        # Switching formats removes the outputs in the old format.
+        self._run(partitions=[(2018, "CO")], output_format="parquet")
+        self.assertListEqual(
+            [pudl.load.manifest.epacems_output_path(
+                self.datapkg_dir, "hourly_emissions_epacems_2018_co",
+                "parquet")],
+            list(pudl.load.manifest.epacems_outputs(self.datapkg_dir)))
+
+    def test_prep_incremental_dir(self):
+        """Only the CEMS outputs are kept, and only if clobber is True."""
+        self._run(output_format="parquet")
+        data_dir = pathlib.Path(self.datapkg_dir, "data")
+        pathlib.Path(data_dir, "hourly_emissions_epacems_2017_co.csv.gz").touch()
+        pathlib.Path(data_dir, "plants_eia").mkdir()
+        with self.assertRaises(FileExistsError):
+            pudl.etl._prep_epacems_incremental_dir(data_dir)
+        pudl.etl._prep_epacems_incremental_dir(data_dir, clobber=True)
+        self.assertListEqual(
+            ["hourly_emissions_epacems", "hourly_emissions_epacems_2017_co.csv.gz"],
+            sorted(path.name for path in data_dir.iterdir()))
+        self.assertEqual(3, len(self._outputs()))
+        # If there are only CEMS outputs, nothing is clobbered.
+        pudl.etl._prep_epacems_incremental_dir(data_dir)
+        self.assertEqual(3, len(self._outputs()))
+
+
+class TestEpacemsPartitions(unittest.TestCase):
+    """Test processing EPA CEMS partitions in a pool of worker processes."""
+
+    def setUp(self):
+        """Create a datapackage with the timezones of some plants."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.datapkg_dir = pathlib.Path(self.tmpdir.name, "datapkg")
+        pathlib.Path(self.datapkg_dir, "data").mkdir(parents=True)
+        pathlib.Path(self.datapkg_dir, "data", "plants_entity_eia.csv") \
+            .write_text("plant_id_eia,timezone\n3,America/Chicago\n")
+
+    def tearDown(self):
+        """Remove the temporary files."""
+        self.tmpdir.cleanup()
+
+    def _run(self, partitions, epacems_workers=2):
+        """Process partitions with the fake partition ETL."""
+        with patch.object(pudl.etl, "_etl_epacems_partition",
+                          _fake_epacems_partition):
+            return list(pudl.etl._etl_epacems_partitions(
+                partitions, epacems_workers=epacems_workers,
+                output_format="csv", chunksize=None, rollups=(),
+                datapkg_dir=self.datapkg_dir,
+                pudl_settings={"data_dir": self.tmpdir.name}))
+
+    def test_submission_order(self):
+        """Results come back in order, using the workers' UTC offsets."""
+        partitions = [(2018, "CO"), (2018, "ID"), (2019, "ID")]
+        expected = [
+            (year, state, [f"hourly_emissions_epacems_{year}_{state.lower()}",
+                           "3:-1 days +18:00:00"])
+            for year, state in partitions]
+        self.assertListEqual(expected, self._run(partitions))
+        self.assertListEqual(
+            expected, self._run(partitions, epacems_workers=1))
+
+    def test_worker_error(self):
+        """Exceptions raised in the worker processes aren't swallowed."""
+        with self.assertRaisesRegex(ValueError, "2018 XX"):
+            self._run([(2018, "CO"), (2018, "XX"), (2018, "ID")])
+
+
+class TestEpacemsChunks(unittest.TestCase):
+    """Test streaming EPA CEMS partitions through the ETL in chunks."""
+
+    def setUp(self):
+        """Create a year of CEMS source files for two plants."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.data_dir = pathlib.Path(self.tmpdir.name, "data")
+        for month in range(1, 13):
+            path = pathlib.Path(datastore.path(
+                "epacems", year=2018, month=month, state="CO",
+                data_dir=self.data_dir))
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Three hours of a gas turbine, and an hour of a plant which
+            # reported nothing but its operating time.
+            df = pd.DataFrame({
+                "STATE": "CO",
+                "FACILITY_NAME": ["Comanche"] * 3 + ["Arapahoe"],
+                "ORISPL_CODE": [470, 470, 470, 3],
+                "UNITID": ["CT2", "CT2", "CT2", "1"],
+                "OP_DATE": [f"{month:02}-01-2018"] * 3 + [
+                    f"{month:02}-15-2018"],
+                "OP_HOUR": [0, 1, 2, 12],
+                "OP_TIME": [1.0, 1.0, 0.25, 0.5],
+                "GLOAD (MW)": [100.0, 101.0, 102.0, None],
+                "SO2_MASS (lbs)": [0.0, 1.5, 3.0, None],
+                "SO2_MASS_MEASURE_FLG": ["Measured"] * 3 + [None],
+                "NOX_RATE (lbs/mmBtu)": [0.1, 0.2, 0.3, None],
+                "NOX_RATE_MEASURE_FLG": ["Calculated"] * 3 + [None],
+                "NOX_MASS (lbs)": [2.5 * month] * 3 + [None],
+                "NOX_MASS_MEASURE_FLG": ["LME"] * 3 + [None],
+                "CO2_MASS (tons)": [3.5, 4.5, 5.5, None],
+                "CO2_MASS_MEASURE_FLG": ["Measured"] * 3 + [None],
+                "HEAT_INPUT (mmBtu)": [500.0 + month] * 3 + [None],
+                "FAC_ID": [10, 10, 10, None],
+                "UNIT_ID": [20, 20, 20, None],
+            }).reindex(columns=CEMS_CSV_COLUMNS)
+            with zipfile.ZipFile(path, "w") as archive:
+                archive.writestr(
+                    f"2018co{month:02}.csv", df.to_csv(index=False))
+
+    def tearDown(self):
+        """Remove the temporary files."""
+        self.tmpdir.cleanup()
+
+    def _run(self, name, output_format, chunk_memory_mb=None):
+        """Run the EPA CEMS ETL into a new datapackage directory."""
+        datapkg_dir = pathlib.Path(self.tmpdir.name, name)
+        pathlib.Path(datapkg_dir, "data").mkdir(parents=True)
+        pathlib.Path(datapkg_dir, "data", "plants_entity_eia.csv").write_text(
+            "plant_id_eia,timezone\n3,America/Denver\n470,America/Denver\n")
+        etl_params = {
+            "epacems_years": [2018],
+            "epacems_states": ["CO"],
+            "epacems_output_format": output_format,
+            "epacems_rollups": ["monthly"],
+        }
+        if chunk_memory_mb is not None:
+            etl_params["epacems_chunk_memory_mb"] = chunk_memory_mb
+        self.assertListEqual(
+            ["hourly_emissions_epacems_2018_co",
+             "monthly_emissions_epacems_2018_co"],
+            pudl.etl._etl_epacems(
+                etl_params, datapkg_dir, {"data_dir": self.data_dir}))
+        return datapkg_dir
+
+    def test_csv(self):
+        """Chunks are appended to the CSVs, with a single header."""
+        # Two records fit in each chunk.
+        self.assertEqual(
+            2, pudl.extract.epacems.chunksize_from_memory(0.002))
+        expected_dir = self._run("whole", "csv")
+        chunked_dir = self._run("chunked", "csv", chunk_memory_mb=0.002)
+        for table in ["hourly_emissions_epacems", "monthly_emissions_epacems"]:
+            path = pudl.load.manifest.epacems_output_path(
+                chunked_dir, f"{table}_2018_co", "csv")
+            with gzip.open(path, "rt") as f:
+                lines = f.readlines()
+            self.assertEqual(1, sum(line == lines[0] for line in lines))
+            pd.testing.assert_frame_equal(
+                pd.read_csv(pudl.load.manifest.epacems_output_path(
+                    expected_dir, f"{table}_2018_co", "csv")),
+                pd.read_csv(path))
+        self.assertEqual(48, len(pd.read_csv(
+            pudl.load.manifest.epacems_output_path(
+                chunked_dir, "hourly_emissions_epacems_2018_co", "csv"))))
+
+    def test_parquet(self):
+        """Chunks are written to the Parquet files as row groups."""
+        expected_dir = self._run("whole", "parquet")
+        chunked_dir = self._run("chunked", "parquet", chunk_memory_mb=0.002)
+        for table, row_groups in [("hourly_emissions_epacems", 24),
+                                  ("monthly_emissions_epacems", 1)]:
+            expected_path, path = [
+                pudl.load.manifest.epacems_output_path(
+                    datapkg_dir, f"{table}_2018_co", "parquet")
+                for datapkg_dir in [expected_dir, chunked_dir]]
+            self.assertEqual(
+                1, pq.ParquetFile(str(expected_path)).metadata.num_row_groups)
+            self.assertEqual(
+                row_groups, pq.ParquetFile(str(path)).metadata.num_row_groups)
+            self.assertTrue(pq.read_schema(str(expected_path)).equals(
+                pq.read_schema(str(path))))
+            pd.testing.assert_frame_equal(
+                pq.read_table(str(expected_path)).to_pandas(),
+                pq.read_table(str(path)).to_pandas())
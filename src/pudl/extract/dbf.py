@@ -0,0 +1,174 @@
+"""
+A vectorized reader for the DBF files which the FERC Form 1 is published in.
+
+A DBF file consists of a header describing its fields, followed by a block of
+fixed-width records. `dbfread <https://dbfread.readthedocs.io/en/latest/>`__
+parses the records one at a time in Python, creating a dictionary for each
+record and calling a parsing method for each of its values, which makes
+reading the larger FERC Form 1 tables very slow.
+
+Here the DBF headers are still read with :mod:`dbfread`, but the records are
+memory-mapped and viewed as a 2D array of bytes, so that each field can be
+sliced out of every record at once and decoded as a whole column. The result
+is the same dataframe as one built from the records yielded by
+:class:`dbfread.DBF`. Character, numeric, float and integer fields are decoded
+with :mod:`numpy`. The less common field types are parsed with the
+:class:`dbfread.FieldParser`, once for each distinct value, and tables with
+memo fields, whose values are stored in a separate file, are read with
+:mod:`dbfread` entirely.
+
+"""
+import logging
+
+import dbfread
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+MEMO_FIELD_TYPES = frozenset("BGMP")
+"""frozenset: DBF field types whose values may be stored in a memo file."""
+
+_INT_CHARS = b"+-0123456789"
+
+
+def _record_block(table):
+    """
+    Memory-map the records of a DBF file which haven't been deleted.
+
+    Args:
+        table (dbfread.DBF): The DBF table whose headers have been read.
+
+    Returns:
+        numpy.ndarray: A 2D array of bytes, with one row per record. Like the
+        records yielded by :class:`dbfread.DBF` it stops at the end of file
+        marker, if there is one, and excludes the deleted records.
+
+    """
+    header = table.header
+    data = np.memmap(table.filename, dtype=np.uint8, mode="r")
+    n_available = max(len(data) - header.headerlen, 0) // header.recordlen
+    n_records = min(header.numrecords, n_available)
+    records = data[
+        header.headerlen:header.headerlen + n_records * header.recordlen
+    ].reshape(n_records, header.recordlen)
+    flags = records[:, 0]
+    eof = np.flatnonzero(flags == 0x1A)
+    if eof.size:
+        records, flags = records[:eof[0]], flags[:eof[0]]
+    return records[flags == ord(" ")]
+
+
+def _decode_numeric(data, clean_numeric=None):
+    """
+    Decode the values of a numeric (N) DBF field, as dbfread does.
+
+    Each value becomes an integer if it can be parsed as one, a float if not,
+    and None if it is blank. The column gets the type pandas would infer from
+    those values.
+
+    Args:
+        data (numpy.ndarray): The raw bytes of the field, as a fixed-width
+            bytestring array.
+        clean_numeric (callable): Cleans up the raw values, before they are
+            stripped and decoded. See :func:`read_dbf`.
+
+    Returns:
+        numpy.ndarray: The decoded values.
+
+    """
+    if clean_numeric is not None:
+        data = clean_numeric(data)
+    data = np.char.strip(np.char.strip(data), b"*")
+    blank = data == b""
+    if blank.all():
+        return np.full(len(data), None, dtype=object)
+    is_int = np.char.strip(data, _INT_CHARS) == b""
+    values = np.full(len(data), np.nan)
+    ints = is_int & ~blank
+    values[ints] = data[ints].astype(np.float64)
+    floats = ~is_int & ~blank
+    if floats.any():
+        # Account for , in numeric fields
+        values[floats] = (
+            np.char.replace(data[floats], b",", b".").astype(np.float64))
+    elif not blank.any():
+        values = values.astype(np.int64)
+    return values
+
+
+def _decode_float(data):
+    """Decode the values of a float (F) DBF field, as dbfread does."""
+    data = np.char.strip(np.char.strip(data), b"*")
+    blank = data == b""
+    if blank.all():
+        return np.full(len(data), None, dtype=object)
+    values = np.full(len(data), np.nan)
+    values[~blank] = data[~blank].astype(np.float64)
+    return values
+
+
+def _parse_distinct(parser, field, block):
+    """Parse a field with dbfread, once for each of its distinct values."""
+    raw = block.tobytes()
+    width = field.length
+    parsed = {}
+    values = []
+    for start in range(0, len(raw), width):
+        value = raw[start:start + width]
+        if value not in parsed:
+            parsed[value] = parser.parse(field, value)
+        values.append(parsed[value])
+    return values
+
+
+def read_dbf(path, encoding="latin1", parserclass=dbfread.FieldParser,
+             clean_numeric=None):
+    """
+    Read a DBF file into a dataframe, decoding whole columns at once.
+
+    Args:
+        path (path-like): The DBF file to read.
+        encoding (str): The encoding of the character fields.
+        parserclass (type): The :class:`dbfread.FieldParser` subclass used to
+            parse the fields which aren't decoded with :mod:`numpy`.
+        clean_numeric (callable): A function which takes the raw values of a
+            numeric field, as a fixed-width bytestring :class:`numpy.ndarray`,
+            and returns them cleaned up. It should do the same thing to the
+            whole column as the parserclass does to each value before parsing
+            it, if the parserclass overrides ``parseN``.
+
+    Returns:
+        pandas.DataFrame: The same dataframe as would be built from the
+        records yielded by :class:`dbfread.DBF`, with the given encoding and
+        parserclass.
+
+    """
+    table = dbfread.DBF(str(path), encoding=encoding, parserclass=parserclass)
+    if any(field.type in MEMO_FIELD_TYPES for field in table.fields):
+        logger.debug(f"{path} has memo fields, so reading it with dbfread.")
+        return pd.DataFrame(iter(table))
+
+    records = _record_block(table)
+    if not len(records):
+        return pd.DataFrame()
+    parser = parserclass(table)
+    columns = {}
+    start = 1  # Skip the deletion flag.
+    for field in table.fields:
+        block = np.ascontiguousarray(records[:, start:start + field.length])
+        start += field.length
+        data = block.view(f"S{field.length}").ravel()
+        if field.type == "C":
+            columns[field.name] = np.char.decode(
+                np.char.rstrip(data, b"\0 "), encoding).astype(object)
+        elif field.type == "N":
+            columns[field.name] = _decode_numeric(data, clean_numeric)
+        elif field.type == "F":
+            columns[field.name] = _decode_float(data)
+        elif field.type == "I" and field.length == 4:
+            columns[field.name] = (
+                block.view("<i4").ravel().astype(np.int64))
+        else:
+            columns[field.name] = _parse_distinct(parser, field, block)
+    return pd.DataFrame(columns)
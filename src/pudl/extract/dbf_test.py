@@ -0,0 +1,83 @@
+"""Unit tests for pudl.extract.dbf module."""
+import pathlib
+import struct
+import tempfile
+import unittest
+
+import dbfread
+import pandas as pd
+
+import pudl.extract.dbf as dbf
+import pudl.extract.ferc1 as ferc1
+
+FIELDS = [
+    ("NAME", "C", 8),
+    ("AMOUNT", "N", 10),
+    ("RATE", "F", 8),
+    ("COUNT", "I", 4),
+    ("FLAG", "L", 1),
+    ("ZEROS", "N", 5),
+    ("EMPTY", "N", 4),
+]
+
+RECORDS = [
+    (b" ", b"Alpha   ", b"   1234.50", b"  1.5   ", 1, b"T", b"  007", b"    "),
+    (b"*", b"Deleted ", b"         1", b"  1.0   ", 2, b"F", b"    1", b"    "),
+    (b" ", "Béta".encode("latin1") + b"\0\0\0\0", b"       .  ", b"        ",
+     -5, b"F", b"    .", b"    "),
+    (b" ", b"Gamma   ", b"*00012,5  ", b" -2.25  ", 0, b"?", b"00000", b"    "),
+]
+
+
+def _write_dbf(path):
+    """Write a small DBF file with a variety of fields and values."""
+    header_len = 32 + 32 * len(FIELDS) + 1
+    record_len = 1 + sum(length for _, _, length in FIELDS)
+    with open(path, "wb") as f:
+        f.write(struct.pack("<BBBBIHH20x", 0x03, 120, 1, 1,
+                            len(RECORDS), header_len, record_len))
+        for name, field_type, length in FIELDS:
+            f.write(struct.pack("<11scIBB14x", name.encode(),
+                                field_type.encode(), 0, length, 0))
+        f.write(b"\r")
+        for flag, *values in RECORDS:
+            f.write(flag)
+            for (_, field_type, _), value in zip(FIELDS, values):
+                if field_type == "I":
+                    value = struct.pack("<i", value)
+                f.write(value)
+        f.write(b"\x1a")
+
+
+class TestReadDbf(unittest.TestCase):
+    """Test that the vectorized DBF reader matches dbfread."""
+
+    def setUp(self):
+        """Write the test DBF file."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = pathlib.Path(self.tmpdir.name, "TEST.DBF")
+        _write_dbf(self.path)
+
+    def tearDown(self):
+        """Remove the test DBF file."""
+        self.tmpdir.cleanup()
+
+    def test_default_parser(self):
+        """Like dbfread's default parser, a bare period is an error."""
+        with self.assertRaises(ValueError):
+            pd.DataFrame(iter(dbfread.DBF(str(self.path), encoding="latin1")))
+        with self.assertRaises(ValueError):
+            dbf.read_dbf(self.path, encoding="latin1")
+
+    def test_ferc1_parser(self):
+        """The FERC Form 1 cleanup of numeric fields is applied."""
+        expected = pd.DataFrame(iter(dbfread.DBF(
+            str(self.path), encoding="latin1",
+            parserclass=ferc1.FERC1FieldParser)))
+        result = dbf.read_dbf(
+            self.path, encoding="latin1",
+            parserclass=ferc1.FERC1FieldParser,
+            clean_numeric=ferc1.clean_ferc1_numeric)
+        pd.testing.assert_frame_equal(expected, result)
+        self.assertListEqual([1234.5, 0.0, 12.5], list(result["AMOUNT"]))
+        self.assertListEqual(["Alpha", "Béta", "Gamma"], list(result["NAME"]))
@@ -0,0 +1,46 @@
+"""Unit tests for pudl.extract.eia861 module."""
+import unittest
+from unittest.mock import patch
+
+import pandas as pd
+
+import pudl.extract.eia861 as eia861
+
+SALES_COLUMNS = [
+    "Utility Number", "Utility Name", "State", "Residential Revenues",
+    "Residential Sales", "Residential Consumers", "Commercial Revenues",
+    "Commercial Sales", "Commercial Consumers", "Industrial Revenues",
+    "Industrial Sales", "Industrial Consumers", "Transportation Revenues",
+    "Transportation Sales", "Transportation Consumers", "Other Revenues",
+    "Other Sales", "Other Consumers", "Total Revenues", "Total Sales",
+    "Total Consumers",
+]
+
+
+class TestExtractor(unittest.TestCase):
+    """Test extracting the EIA 861 spreadsheets."""
+
+    def test_file_names(self):
+        """Each year's file is looked up in the file name map."""
+        extractor = eia861.Extractor('/blah')
+        self.assertEqual(
+            'FILE2.xls', extractor.file_basename_glob(1999, 'sales_eia861'))
+        self.assertEqual(
+            'Sales_Ult_Cust_2018.xlsx',
+            extractor.file_basename_glob(2018, 'sales_eia861'))
+
+    @patch('pudl.extract.excel.pd.read_excel')
+    @patch.object(eia861.Extractor, '_load_excel_file')
+    def test_rename_by_position(self, _, mock_read_excel):
+        """Columns are renamed by position, and report_year is added."""
+        mock_read_excel.return_value = pd.DataFrame(
+            [range(len(SALES_COLUMNS))], columns=SALES_COLUMNS)
+        df = eia861.Extractor('/blah').extract([1999])['sales_eia861']
+        self.assertEqual(1999, df.loc[0, 'report_year'])
+        self.assertEqual(0, df.loc[0, 'utility_id_eia'])
+        self.assertEqual(2, df.loc[0, 'state'])
+        self.assertEqual(20, df.loc[0, 'total_customers'])
+        self.assertTrue(df['ba_code'].isna().all())
+        self.assertSetEqual(
+            set(eia861.Extractor.METADATA.get_all_columns('sales_eia861')),
+            set(df.columns))
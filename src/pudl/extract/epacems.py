@@ -13,7 +13,35 @@ import pudl.workspace.datastore as datastore
 logger = logging.getLogger(__name__)
 
 
-def read_cems_csv(filename):
+EPACEMS_BYTES_PER_ROW = 1000
+"""int: Approximate peak memory used per record of CEMS data in the ETL.
+
+A raw record takes up less than 100 bytes once it has been read into the
+compact data types given by :data:`pudl.constants.epacems_csv_dtypes`, but the
+CSV parser holds the text of each chunk while it is being read, and
+intermediate copies are made while it is transformed and loaded. It is used to
+translate a memory limit into a number of records. The memory used by each
+stage of the transform is logged at the DEBUG level.
+"""
+
+
+def chunksize_from_memory(memory_mb):
+    """
+    Estimate how many CEMS records can be processed within a memory limit.
+
+    Args:
+        memory_mb (int or float): The approximate amount of memory, in
+            megabytes, that each chunk of records should use while it is being
+            extracted, transformed and loaded.
+
+    Returns:
+        int: The number of records to read in each chunk.
+
+    """
+    return max(1, int(memory_mb * 1_000_000 // EPACEMS_BYTES_PER_ROW))
+
+
+def read_cems_csv(filename, chunksize=None):
     """
     Read a CEMS CSV file, compressed or not, into a :class:`pandas.DataFrame`.
 
@@ -24,22 +52,55 @@ def read_cems_csv(filename):
 
     Args:
         filename (str): The name of the file to be read
+        chunksize (int): If not None, the file is read in chunks containing
+            this many records, rather than all at once.
 
     Returns:
         pandas.DataFrame: A DataFrame containing the contents of the
-        CSV file.
+        CSV file. If chunksize is not None, a generator of DataFrames, each of
+        which contains up to chunksize records, is returned instead.
 
     """
-    df = pd.read_csv(
+    reader = pd.read_csv(
         filename,
         index_col=False,
         usecols=lambda col: col not in pc.epacems_columns_to_ignore,
         dtype=pc.epacems_csv_dtypes,
-    ).rename(columns=pc.epacems_rename_dict)
+        chunksize=chunksize,
+    )
+    if chunksize is None:
+        return reader.rename(columns=pc.epacems_rename_dict)
+    return (chunk.rename(columns=pc.epacems_rename_dict) for chunk in reader)
+
+
+def _concat_cems(dfs):
+    """
+    Concatenate CEMS dataframes, keeping their categorical columns compact.
+
+    The unit IDs and dates found in each CEMS CSV are read in as categoricals,
+    but each file ends up with its own categories. Concatenating them would
+    turn those columns back into objects, so their categories are combined.
+
+    Args:
+        dfs (list): The :class:`pandas.DataFrame` objects to concatenate, as
+            returned by :func:`read_cems_csv`.
+
+    Returns:
+        pandas.DataFrame: All of the records, with the categorical columns of
+        the inputs preserved.
+
+    """
+    df = pd.concat(dfs, sort=True, copy=False, ignore_index=True)
+    for col in df.columns:
+        col_dfs = [d[col] for d in dfs if col in d.columns]
+        if (len(col_dfs) == len(dfs)
+                and all(pd.api.types.is_categorical_dtype(c) for c in col_dfs)
+                and not pd.api.types.is_categorical_dtype(df[col])):
+            df[col] = pd.api.types.union_categoricals(col_dfs)
     return df
 
 
-def extract(epacems_years, states, data_dir):
+def extract(epacems_years, states, data_dir, chunksize=None):
     """
     Coordinate the extraction of EPA CEMS hourly DataFrames.
 
@@ -49,6 +110,11 @@ def extract(epacems_years, states, data_dir):
         states (list): The states whose CEMS data we want to extract, indicated
             by 2-letter US state codes.
         data_dir (path-like): Path to the top directory of the PUDL datastore.
+        chunksize (int): If None (the default) all of the data for a given
+            state and year is read into a single dataframe. Otherwise, the
+            data is streamed in dataframes containing up to this many records,
+            so that the memory required doesn't depend on the amount of data
+            in each state and year.
 
     Yields:
         dict: a dictionary with a single EPA CEMS tabular data resource name as
@@ -56,6 +122,9 @@ def extract(epacems_years, states, data_dir):
         YEAR is a 4 digit number and STATE is a lower case 2-letter code for a
         US state. The value is a :class:`pandas.DataFrame` containing all the
         raw EPA CEMS hourly emissions data for the indicated state and year.
+        If chunksize is not None, many consecutive dictionaries with the same
+        key are yielded for each state and year, each of them containing one
+        chunk of the data.
 
     """
     for year in epacems_years:
@@ -63,16 +132,20 @@ def extract(epacems_years, states, data_dir):
         for state in states:
             dfs = []
             logger.info(f"Performing ETL for EPA CEMS hourly {state}-{year}")
+            resource_name = (
+                "hourly_emissions_epacems_" + str(year) + "_" + state.lower())
             for month in range(1, 13):
                 filename = datastore.path('epacems',
                                           year=year, month=month, state=state,
                                           data_dir=data_dir)
-                dfs.append(read_cems_csv(filename))
-            # Return a dictionary where the key identifies this dataset
-            # (just like the other extract functions), but unlike the
-            # others, this is yielded as a generator (and it's a one-item
-            # dictionary).
-            yield {
-                ("hourly_emissions_epacems_" + str(year) + "_" + state.lower()):
-                    pd.concat(dfs, sort=True, copy=False, ignore_index=True)
-            }
+                if chunksize is None:
+                    dfs.append(read_cems_csv(filename))
+                    continue
+                for chunk in read_cems_csv(filename, chunksize=chunksize):
+                    yield {resource_name: chunk}
+            if chunksize is None:
+                # Return a dictionary where the key identifies this dataset
+                # (just like the other extract functions), but unlike the
+                # others, this is yielded as a generator (and it's a one-item
+                # dictionary).
+                yield {resource_name: _concat_cems(dfs)}
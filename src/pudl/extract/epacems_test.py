@@ -0,0 +1,70 @@
+"""Unit tests for pudl.extract.epacems module."""
+import pathlib
+import tempfile
+import unittest
+
+import pandas as pd
+
+import pudl.extract.epacems as epacems
+
+CEMS_CSV = """\
+"STATE","FACILITY_NAME","ORISPL_CODE","UNITID","OP_DATE","OP_HOUR","OP_TIME",\
+"GLOAD (MW)","SO2_MASS (lbs)","SO2_MASS_MEASURE_FLG","NOX_MASS (lbs)",\
+"NOX_MASS_MEASURE_FLG","CO2_MASS (tons)","CO2_MASS_MEASURE_FLG",\
+"HEAT_INPUT (mmBtu)","FAC_ID","UNIT_ID"
+"CO","Comanche","470","1","01-01-2018","0","1.00","350","123.456789",\
+"Measured","1234.5678","LME2","357.123456","Measured","3851.123456","10","20"
+"XX","Comanche","470","1","01-01-2018","1","0.50","","","","","","","","",\
+"10","20"
+"CO","Comanche","470","2","01-02-2018","0","1.00","400","1.5","Substitute",\
+"2.5","Measured","16777217.0","Measured","3.5","10","21"
+"""
+
+
+class TestReadCemsCsv(unittest.TestCase):
+    """Test reading EPA CEMS CSVs into compact data types."""
+
+    def setUp(self):
+        """Write a small EPA CEMS CSV."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = pathlib.Path(self.tmpdir.name, "2018co01.csv")
+        self.path.write_text(CEMS_CSV)
+
+    def tearDown(self):
+        """Remove the temporary files."""
+        self.tmpdir.cleanup()
+
+    def test_unknown_values_kept(self):
+        """States and measurement codes that aren't known aren't lost."""
+        df = epacems.read_cems_csv(self.path)
+        self.assertNotIn("FACILITY_NAME", df.columns)
+        self.assertListEqual(
+            ["CO", "XX", "CO"], df.state.astype(str).tolist())
+        self.assertListEqual(
+            ["LME2", "Measured"],
+            df.nox_mass_measurement_code.dropna().astype(str).tolist())
+        self.assertTrue(pd.api.types.is_categorical_dtype(df.state))
+        self.assertTrue(pd.api.types.is_categorical_dtype(
+            df.nox_mass_measurement_code))
+
+    def test_measurements_read_back(self):
+        """The measurements are read with all of their reported digits."""
+        df = epacems.read_cems_csv(self.path)
+        for col in ["so2_mass_lbs", "nox_mass_lbs", "co2_mass_tons",
+                    "heat_content_mmbtu", "gross_load_mw"]:
+            self.assertEqual("float64", df[col].dtype)
+        self.assertEqual(123.456789, df.so2_mass_lbs[0])
+        self.assertEqual(357.123456, df.co2_mass_tons[0])
+        self.assertEqual(16777217.0, df.co2_mass_tons[2])
+        self.assertEqual(3851.123456, df.heat_content_mmbtu[0])
+
+    def test_concat_chunks(self):
+        """Chunks with different categories are combined into categoricals."""
+        dfs = list(epacems.read_cems_csv(self.path, chunksize=2))
+        self.assertEqual(2, len(dfs))
+        df = epacems._concat_cems(dfs)
+        for col in ["state", "unitid", "op_date", "nox_mass_measurement_code"]:
+            self.assertTrue(pd.api.types.is_categorical_dtype(df[col]), col)
+        pd.testing.assert_frame_equal(
+            epacems.read_cems_csv(self.path), df,
+            check_categorical=False, check_like=True)
@@ -1,10 +1,15 @@
 """Load excel metadata CSV files form a python data package."""
 
+import concurrent.futures
+import functools
 import glob
+import hashlib
 import importlib.resources
 import logging
-import os.path
+import os
+import pathlib
 
+import numpy as np
 import pandas as pd
 
 import pudl
@@ -13,6 +18,9 @@ import pudl.workspace.datastore as datastore
 
 logger = logging.getLogger(__name__)
 
+SHEET_CACHE_DIR = "sheet_cache"
+"""str: Name of the directory in the datastore holding parsed spreadsheets."""
+
 
 class Metadata(object):
     """Loads excel metadata from python package.
@@ -93,6 +101,117 @@ class Metadata(object):
                            index_col=0, comment='#')
 
 
+@functools.lru_cache(maxsize=None)
+def _file_sha256(path, size, mtime_ns):
+    """Hash a file, only once per process unless its size or mtime change."""
+    return pudl.load.manifest.file_fingerprint(path)["sha256"]
+
+
+def _read_parquet(path):
+    """Read a cached sheet, with missing strings as NaN like read_excel."""
+    df = pd.read_parquet(path, engine="pyarrow")
+    obj_cols = df.columns[df.dtypes == object]
+    df[obj_cols] = df[obj_cols].where(df[obj_cols].notna(), np.nan)
+    return df
+
+
+def _identical(df, other):
+    """Whether two dataframes have the same labels, dtypes and values."""
+    return (df.columns.equals(other.columns)
+            and df.index.equals(other.index)
+            and df.dtypes.equals(other.dtypes)
+            and df.equals(other))
+
+
+class SheetCache(object):
+    """Stores spreadsheets that have already been parsed on disk.
+
+    Parsing the EIA spreadsheets with pd.read_excel() takes much longer than
+    reading the same data from a columnar file, and the spreadsheets never
+    change once they are in the datastore. So each parsed sheet is stored as
+    a Parquet file, keyed by the SHA-256 hash of the spreadsheet, the sheet
+    name, skiprows, dtypes and the version of pandas that parsed it. Sheets
+    which Parquet can't store exactly, e.g. because a column mixes numbers and
+    strings, are pickled instead.
+
+    Once the cache grows beyond its maximum size, the least recently used
+    sheets are deleted. Files are written atomically, so the cache can be
+    shared by several worker processes.
+    """
+
+    def __init__(self, cache_dir, max_size_mb=2000):
+        """Create a cache of parsed sheets in the given directory.
+
+        Args:
+            cache_dir (path-like): Directory to store the parsed sheets in.
+              It is created when the first sheet is stored.
+            max_size_mb (int): The size in MB above which the least recently
+              used sheets are deleted.
+        """
+        self._cache_dir = pathlib.Path(cache_dir)
+        self._max_size = max_size_mb * 2**20
+
+    def key(self, path, sheet_name, skiprows, dtype):
+        """Returns the key of a sheet, read with the given arguments."""
+        stat = os.stat(path)
+        sha256 = _file_sha256(os.fspath(path), stat.st_size, stat.st_mtime_ns)
+        dtype_spec = sorted((str(col), str(typ)) for col, typ in dtype.items())
+        spec = (f"{sha256}|{sheet_name!r}|{skiprows!r}|{dtype_spec!r}"
+                f"|{pd.__version__}")
+        return hashlib.sha256(spec.encode()).hexdigest()
+
+    def get(self, key):
+        """Returns the sheet stored under key, or None if it isn't cached."""
+        for suffix, reader in ((".parquet", _read_parquet),
+                               (".pkl", pd.read_pickle)):
+            path = self._cache_dir / f"{key}{suffix}"
+            try:
+                df = reader(path)
+                # The modification time orders the sheets for eviction.
+                os.utime(path)
+            except FileNotFoundError:
+                continue
+            return df
+        return None
+
+    def put(self, key, df):
+        """Stores a sheet under key, and evicts sheets if the cache is full."""
+        self._cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = self._cache_dir / f"{key}.{os.getpid()}.tmp"
+        try:
+            df.to_parquet(tmp_path, engine="pyarrow")
+            suffix = ".parquet" if _identical(
+                df, _read_parquet(tmp_path)) else ".pkl"
+        except (ValueError, TypeError, NotImplementedError):
+            suffix = ".pkl"
+        if suffix == ".pkl":
+            df.to_pickle(tmp_path)
+        tmp_path.replace(self._cache_dir / f"{key}{suffix}")
+        self._evict()
+
+    def _evict(self):
+        """Deletes the least recently used sheets beyond the maximum size."""
+        sheets = []
+        for path in self._cache_dir.iterdir():
+            if path.suffix not in (".parquet", ".pkl"):
+                continue
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            sheets.append((stat.st_mtime_ns, stat.st_size, path))
+        total_size = sum(size for _, size, _ in sheets)
+        for _, size, path in sorted(sheets):
+            if total_size <= self._max_size:
+                break
+            logger.debug(f"Evicting {path.name} from the sheet cache.")
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+            total_size -= size
+
+
 class GenericExtractor(object):
     """Contains logic for extracting panda.DataFrames from excel spreadsheets.
 
@@ -121,10 +240,21 @@ class GenericExtractor(object):
     one of the following functions (they all return the modified dataframe):
     - process_raw() is applied right after loading the excel DataFrame
     from the disk.
+    - rename_columns() renames the input columns to standardized pudl
+    columns, using the column maps in the metadata.
     - process_renamed() is applied after input columns were renamed to
     standardized pudl columns.
     - process_final_page() is applied when data from all available years
     is merged into single DataFrame for a given page.
+
+    Reading the spreadsheets is CPU bound, so the (year, page) sheets can be
+    read and processed in parallel by a pool of worker processes. Each worker
+    gets a copy of the extractor, so the methods above (and _load_excel_file)
+    are used the same way whether or not the sheets are read in parallel, and
+    only process_final_page() is always applied in this process.
+
+    Given a SheetCache, parsed sheets are stored in it, and read from it
+    instead of the spreadsheets the next time they are extracted.
     """
 
     METADATA = None
@@ -133,12 +263,15 @@ class GenericExtractor(object):
     BLACKLISTED_PAGES = []
     """List of supported pages that should not be extracted."""
 
-    def __init__(self, data_dir, metadata=None):
+    def __init__(self, data_dir, metadata=None, workers=1, sheet_cache=None):
         """Create new extractor object and load metadata.
 
         Args:
             data_dir: Path to the data_dir to use when loading excel
               files from disk (passed to datastore).
+            workers (int): The number of worker processes used to read the
+              spreadsheets. If 1, they are all read serially in this process.
+            sheet_cache (SheetCache): Cache of parsed sheets to use, if any.
         """
         self._data_dir = data_dir
         if not self.METADATA:
@@ -146,12 +279,24 @@ class GenericExtractor(object):
         self._metadata = self.METADATA
         self._dataset_name = self._metadata.get_dataset_name()
         self._file_cache = {}
+        self._workers = workers
+        self._sheet_cache = sheet_cache
+
+    def __getstate__(self):
+        """Leave open excel files behind when copied to a worker process."""
+        state = self.__dict__.copy()
+        state['_file_cache'] = {}
+        return state
 
     @staticmethod
     def process_raw(df, year, page):
         """Transforms raw dataframe before columns are renamed."""
         return df
 
+    def rename_columns(self, df, year, page):
+        """Renames input columns to standardized pudl columns."""
+        return df.rename(columns=self._metadata.get_column_map(year, page))
+
     @staticmethod
     def process_renamed(df, year, page):
         """Transforms dataframe after columns are renamed."""
@@ -176,39 +321,84 @@ class GenericExtractor(object):
         # TODO: should we run verify_years(?) here?
         if not years:
             logger.info(
-                f'No years given. Not extracting {self.DATSET} spreadsheet data.')
+                f'No years given. Not extracting {self._dataset_name} '
+                f'spreadsheet data.')
             return {}
 
-        raw_dfs = {}
+        pages = []
         for page in self._metadata.get_all_pages():
             if page in self.BLACKLISTED_PAGES:
                 logger.info(f'Skipping blacklisted page {page}.')
                 continue
-            df = pd.DataFrame()
-            for yr in years:
-                logger.info(
-                    f'Loading dataframe for {self._dataset_name} {page} {yr}')
-                newdata = pd.read_excel(
-                    self._load_excel_file(yr, page),
-                    sheet_name=self._metadata.get_sheet_name(yr, page),
-                    skiprows=self._metadata.get_skiprows(yr, page),
-                    dtype=self.get_dtypes(yr, page))
-
-                newdata = pudl.helpers.simplify_columns(newdata)
-                newdata = self.process_raw(newdata, yr, page)
-                newdata = newdata.rename(
-                    columns=self._metadata.get_column_map(yr, page))
-                newdata = self.process_renamed(newdata, yr, page)
-                df = df.append(newdata, sort=True, ignore_index=True)
+            pages.append(page)
+        sheets = [(yr, page) for page in pages for yr in years]
+        if self._workers > 1:
+            newdata = self._extract_sheets_parallel(sheets)
+        else:
+            newdata = (self._extract_sheet(yr, page) for yr, page in sheets)
+        page_dfs = {page: [] for page in pages}
+        for (yr, page), df in zip(sheets, newdata):
+            page_dfs[page].append(df)
 
+        raw_dfs = {}
+        for page, dfs in page_dfs.items():
+            # Concatenate all of the years at once, rather than appending them
+            # one by one, which copies everything loaded so far each time.
+            df = pd.concat(dfs, sort=True, ignore_index=True)
             # After all years are loaded, consolidate missing columns
             missing_cols = set(self._metadata.get_all_columns(
                 page)).difference(df.columns)
-            empty_cols = pd.DataFrame(columns=missing_cols)
+            empty_cols = pd.DataFrame(columns=sorted(missing_cols))
             df = pd.concat([df, empty_cols], sort=True)
             raw_dfs[page] = self.process_final_page(df, page)
         return raw_dfs
 
+    def _extract_sheet(self, year, page):
+        """Returns processed DataFrame for given (year, page)."""
+        newdata = self._read_sheet(year, page)
+        newdata = pudl.helpers.simplify_columns(newdata)
+        newdata = self.process_raw(newdata, year, page)
+        newdata = self.rename_columns(newdata, year, page)
+        return self.process_renamed(newdata, year, page)
+
+    def _read_sheet(self, year, page):
+        """Returns raw DataFrame for given (year, page), cached if possible."""
+        sheet_name = self._metadata.get_sheet_name(year, page)
+        skiprows = self._metadata.get_skiprows(year, page)
+        dtype = self.get_dtypes(year, page)
+        if self._sheet_cache is not None:
+            key = self._sheet_cache.key(
+                self._get_file_path(year, page), sheet_name, skiprows, dtype)
+            newdata = self._sheet_cache.get(key)
+            if newdata is not None:
+                logger.info(
+                    f'Loading cached dataframe for {self._dataset_name} '
+                    f'{page} {year}')
+                return newdata
+
+        logger.info(
+            f'Loading dataframe for {self._dataset_name} {page} {year}')
+        newdata = pd.read_excel(
+            self._load_excel_file(year, page),
+            sheet_name=sheet_name, skiprows=skiprows, dtype=dtype)
+        if self._sheet_cache is not None:
+            self._sheet_cache.put(key, newdata)
+        return newdata
+
+    def _extract_sheets_parallel(self, sheets):
+        """Returns processed DataFrames for (year, page) pairs, in parallel.
+
+        The DataFrames are returned in the same order as the sheets were given.
+        """
+        logger.info(
+            f'Loading {len(sheets)} {self._dataset_name} spreadsheet pages '
+            f'using {self._workers} worker processes.')
+        with concurrent.futures.ProcessPoolExecutor(
+                max_workers=self._workers) as executor:
+            futures = [executor.submit(self._extract_sheet, yr, page)
+                       for yr, page in sheets]
+            return [future.result() for future in futures]
+
     def _load_excel_file(self, year, page):
         """Returns ExcelFile object corresponding to given (year, page).
 
@@ -1,8 +1,13 @@
 """Unit tests for pudl.extract.excel module."""
+import multiprocessing
+import os
+import pathlib
+import tempfile
 import unittest
 import unittest.mock as mock
 from unittest.mock import patch
 
+import numpy as np
 import pandas as pd
 
 import pudl.extract.excel as excel
@@ -96,5 +101,94 @@ class TestGenericExtractor(unittest.TestCase):
             }),
             dfs['boxes'])
 
+    @unittest.skipUnless(multiprocessing.get_start_method() == 'fork',
+                         'Worker processes must inherit the mocked read_excel.')
+    @patch('pudl.extract.excel.pd.read_excel', _fake_data_frames)
+    def test_parallel_extract(self):
+        """Reading the pages with worker processes gives the same results."""
+        expected = FakeExtractor('/blah').extract([2010, 2011])
+        dfs = FakeExtractor('/blah', workers=2).extract([2010, 2011])
+        self.assertEqual(set(expected.keys()), set(dfs.keys()))
+        for page, df in expected.items():
+            pd.testing.assert_frame_equal(df, dfs[page])
+
     # TODO(rousik@gmail.com): need to figure out how to test process_$x methods.
     # TODO(rousik@gmail.com): we should test that empty columns are properly added.
+
+
+class TestSheetCache(unittest.TestCase):
+    """Test storing parsed sheets in the excel.SheetCache."""
+
+    def setUp(self):
+        """Create a fake spreadsheet and an empty cache directory."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.cache_dir = pathlib.Path(self.tmpdir.name, 'cache')
+        self.xlsx = pathlib.Path(self.tmpdir.name, 'fake.xlsx')
+        self.xlsx.write_bytes(b'not really a spreadsheet')
+
+    def tearDown(self):
+        """Remove the temporary files."""
+        self.tmpdir.cleanup()
+
+    def test_roundtrip(self):
+        """Sheets come back as they were stored, pickled if need be."""
+        cache = excel.SheetCache(self.cache_dir)
+        df = pd.DataFrame({
+            'plant_id': pd.array([1, None, 3], dtype='Int64'),
+            'capacity': [1.5, np.nan, 3.0],
+            'name': ['Alpha', np.nan, 'Gamma'],
+        })
+        mixed = pd.DataFrame({'code': [1, 'A', np.nan]})
+        for sheet_name, sheet, suffix in [(0, df, '.parquet'),
+                                          (1, mixed, '.pkl')]:
+            key = cache.key(self.xlsx, sheet_name, 0, {})
+            self.assertIsNone(cache.get(key))
+            cache.put(key, sheet)
+            self.assertTrue(self.cache_dir.joinpath(key + suffix).exists())
+            pd.testing.assert_frame_equal(sheet, cache.get(key))
+
+    def test_key(self):
+        """Sheets are keyed by file contents and how they are read."""
+        cache = excel.SheetCache(self.cache_dir)
+        key = cache.key(self.xlsx, 'Page 1', 5, {'Plant Id': pd.Int64Dtype()})
+        self.assertEqual(key, cache.key(
+            str(self.xlsx), 'Page 1', 5, {'Plant Id': pd.Int64Dtype()}))
+        self.assertNotEqual(key, cache.key(
+            self.xlsx, 'Page 1', 4, {'Plant Id': pd.Int64Dtype()}))
+        self.assertNotEqual(key, cache.key(self.xlsx, 'Page 1', 5, {}))
+        self.xlsx.write_bytes(b'a different spreadsheet')
+        self.assertNotEqual(key, cache.key(
+            self.xlsx, 'Page 1', 5, {'Plant Id': pd.Int64Dtype()}))
+
+    def test_eviction(self):
+        """The least recently used sheets are evicted when the cache is full."""
+        df = pd.DataFrame({'x': np.arange(10_000)})
+        cache = excel.SheetCache(self.cache_dir)
+        old_key = cache.key(self.xlsx, 0, 0, {})
+        cache.put(old_key, df)
+        old_path = self.cache_dir / f'{old_key}.parquet'
+        os.utime(old_path, (0, 0))
+
+        cache = excel.SheetCache(
+            self.cache_dir, max_size_mb=1.5 * old_path.stat().st_size / 2**20)
+        new_key = cache.key(self.xlsx, 1, 0, {})
+        cache.put(new_key, df)
+        self.assertIsNone(cache.get(old_key))
+        pd.testing.assert_frame_equal(df, cache.get(new_key))
+
+    @patch('pudl.extract.excel.pd.read_excel')
+    def test_cached_extract(self, mock_read_excel):
+        """Cached sheets are extracted without reading the spreadsheets."""
+        mock_read_excel.side_effect = _fake_data_frames
+
+        cache = excel.SheetCache(self.cache_dir)
+        with patch.object(FakeExtractor, '_get_file_path',
+                          return_value=self.xlsx):
+            expected = FakeExtractor(
+                '/blah', sheet_cache=cache).extract([2010, 2011])
+            self.assertEqual(4, mock_read_excel.call_count)
+            dfs = FakeExtractor(
+                '/blah', sheet_cache=cache).extract([2010, 2011])
+        self.assertEqual(4, mock_read_excel.call_count)
+        for page, df in expected.items():
+            pd.testing.assert_frame_equal(df, dfs[page])
@@ -23,8 +23,10 @@ structure of the database as it existed in 2015 (add link/embed image).
 
 Using this inferred structure PUDL creates an SQLite database mirroring the
 FERC database using :mod:`sqlalchemy`. Then we use a python package called
-`dbfread <https://dbfread.readthedocs.io/en/latest/>`__ to extract the data from
-the DBF tables, and insert it virtually unchanged into the SQLite database.
+`dbfread <https://dbfread.readthedocs.io/en/latest/>`__ to read the structure of
+the DBF tables, extract their data column by column with
+:mod:`pudl.extract.dbf`, and insert it virtually unchanged into the SQLite
+database.
 However, we do compile a master table of the all the respondent IDs and
 respondent names, which all the other tables refer to. Unlike the other tables,
 this table has no ``report_year`` and so it represents a merge of all the years
@@ -49,21 +51,61 @@ for further processing and integration with other data sources like the EIA 860
 and EIA 923.
 
 """
+import collections
+import concurrent.futures
+import functools
+import hashlib
+import json
 import logging
 import os.path
+import pathlib
 import re
 import string
 
 import dbfread
+import numpy as np
 import pandas as pd
 import sqlalchemy as sa
 
 import pudl
 import pudl.constants as pc
+import pudl.extract.dbf
+import pudl.load.manifest
+import pudl.load.sqlite
 import pudl.workspace.datastore as datastore
 
 logger = logging.getLogger(__name__)
 
+DBC_MAP_CACHE = "dbc_maps.json"
+"""str: Name of the file storing extracted DBC maps in the FERC 1 datastore."""
+
+LOADED_DBFS_TABLE = "pudl_ferc1_loaded_dbfs"
+"""str: Name of the table recording which DBF files were cloned into SQLite."""
+
+UNUSED_COLUMNS = ("row_prvlg", "row_seq", "item")
+"""tuple: Columns found in most FERC Form 1 tables which PUDL doesn't use."""
+
+EXTRACT_COLUMNS = {
+    "fuel_ferc1": None,
+    "plants_steam_ferc1": None,
+    "plants_small_ferc1": None,
+    "plants_hydro_ferc1": None,
+    "plants_pumped_storage_ferc1": None,
+    "plant_in_service_ferc1": (
+        "respondent_id", "report_year", "report_prd", "spplmnt_num",
+        "row_number", "begin_yr_bal", "addition", "retirements",
+        "adjustments", "transfers", "yr_end_bal",
+    ),
+    "purchased_power_ferc1": None,
+    "accumulated_depreciation_ferc1": None,
+}
+"""dict: The columns of the FERC Form 1 DB read into each PUDL table.
+
+None means all of the columns, except for the footnote columns (ending in
+``_f``) and the :data:`UNUSED_COLUMNS`, which are dropped in the transform
+step anyway.
+"""
+
 
 def drop_tables(engine):
     """Drop all FERC Form 1 tables from the SQLite database.
@@ -146,6 +188,10 @@ def add_sqlite_table(table_name, sqlite_meta, dbc_map, data_dir,
             )
         )
 
+    if 'report_year' in col_names:
+        # Data is extracted from the clone into PUDL by report year.
+        sa.Index(f"ix_{table_name}_report_year", new_table.c.report_year)
+
     if (('respondent_id' in col_names) and (table_name != 'f1_respondent_id')):
         new_table.append_constraint(
             sa.ForeignKeyConstraint(
@@ -191,19 +237,95 @@ def get_strings(filename, min_length=4):
 
     """
     with open(filename, errors="ignore") as f:
-        result = ""
-        for c in f.read():
-            if c in string.printable:
-                result += c
-                continue
-            if len(result) >= min_length:
-                yield result
-            result = ""
-        if len(result) >= min_length:  # catch result at EOF
-            yield result
+        contents = f.read()
+    for match in re.finditer(_printable_pattern(min_length), contents):
+        yield match.group()
+
+
+@functools.lru_cache(maxsize=None)
+def _printable_pattern(min_length):
+    """Compile a regex matching runs of at least min_length printable chars."""
+    return re.compile(f"[{re.escape(string.printable)}]{{{min_length},}}")
+
+
+def _dbc_map_cache_path(data_dir):
+    """Path to the file which stores the DBC maps that have been extracted."""
+    return pathlib.Path(
+        datastore.path('ferc1', data_dir=data_dir, file=False),
+        DBC_MAP_CACHE)
 
 
 def get_dbc_map(year, data_dir, min_length=4):
+    """
+    Get the names of all tables and fields from a FERC Form 1 DBC file.
+
+    Extracting them is slow, so once they have been extracted they are stored
+    in a JSON file at the top of the FERC Form 1 datastore (see
+    :data:`DBC_MAP_CACHE`). The DBC map also depends on which of the year's
+    DBF files are present, and on their fields, so it is keyed by the SHA-256
+    hashes of the DBC file and of each DBF file. After that, it is only
+    extracted again if any of those files are added, removed or changed. A
+    file is only hashed again if its size or modification time has changed.
+
+    Args:
+        year (int): The year of data from which the database table and column
+            names are to be extracted. Typically this is expected to be the
+            most recently available year of FERC Form 1 data.
+        data_dir (str): A string representing the full path to the top level of
+            the PUDL datastore containing the FERC Form 1 data to be used.
+        min_length (int): The minimum number of consecutive printable
+            characters that should be considered a meaningful string and
+            extracted.
+
+    Returns:
+        dict: a dictionary whose keys are the long table names extracted
+        from the DBC file, and whose values are lists of pairs of values,
+        the first of which is the full name of each field in the table with
+        the same name as the key, and the second of which is the truncated
+        (<=10 character) long name of that field as found in the DBF file.
+
+    """
+    paths = [dbc_filename(year, data_dir)] + [
+        path for path in (get_dbf_path(table, year, data_dir=data_dir)
+                          for table in pc.ferc1_tbl2dbf)
+        if os.path.isfile(path)
+    ]
+    cache_path = _dbc_map_cache_path(data_dir)
+    try:
+        with cache_path.open() as f:
+            cache = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        cache = {"files": {}, "dbc_maps": {}}
+    fingerprints = {
+        str(path): pudl.load.manifest.file_fingerprint(
+            path, previous=cache["files"].get(str(path)))
+        for path in paths
+    }
+    key = hashlib.sha256(json.dumps({
+        "min_length": min_length,
+        "files": {os.path.basename(path): fingerprint["sha256"]
+                  for path, fingerprint in fingerprints.items()},
+    }, sort_keys=True).encode()).hexdigest()
+    if key in cache["dbc_maps"] and all(
+            cache["files"].get(path) == fingerprint
+            for path, fingerprint in fingerprints.items()):
+        return cache["dbc_maps"][key]
+
+    if key not in cache["dbc_maps"]:
+        cache["dbc_maps"][key] = extract_dbc_map(
+            year, data_dir, min_length=min_length)
+    # Record the new fingerprints, even if the DBC map was found, so that the
+    # files don't need to be hashed again next time.
+    cache["files"].update(fingerprints)
+    # Write the cache atomically, so it can't be left half written.
+    tmp_path = cache_path.with_suffix(".tmp")
+    with tmp_path.open("w") as f:
+        json.dump(cache, f)
+    tmp_path.replace(cache_path)
+    return cache["dbc_maps"][key]
+
+
+def extract_dbc_map(year, data_dir, min_length=4):
     """
     Extract names of all tables and fields from a FERC Form 1 DBC file.
 
@@ -232,29 +354,17 @@ def get_dbc_map(year, data_dir, min_length=4):
         (<=10 character) long name of that field as found in the DBF file.
 
     """
-    # Extract all the strings longer than "min" from the DBC file
-    dbc_strings = list(
-        get_strings(dbc_filename(year, data_dir), min_length=min_length)
-    )
-
-    # Get rid of leading & trailing whitespace in the strings:
-    dbc_strings = [s.strip() for s in dbc_strings]
-
-    # Get rid of all the empty strings:
-    dbc_strings = [s for s in dbc_strings if s != '']
-
-    # Collapse all whitespace to a single space:
-    dbc_strings = [re.sub(r'\s+', ' ', s) for s in dbc_strings]
-
-    # Pull out only strings that begin with Table or Field
-    dbc_strings = [s for s in dbc_strings if re.match('(^Table|^Field)', s)]
-
-    # Split strings by whitespace, and retain only the first two elements.
-    # This eliminates some weird dangling junk characters
-    dbc_strings = [' '.join(s.split()[:2]) for s in dbc_strings]
-
-    # Remove all of the leading Field keywords
-    dbc_strings = [re.sub('Field ', '', s) for s in dbc_strings]
+    # Extract all the strings longer than "min" from the DBC file, and pull
+    # out only those that begin with Table or Field (ignoring whitespace).
+    dbc_strings = []
+    for dbc_string in get_strings(dbc_filename(year, data_dir),
+                                  min_length=min_length):
+        words = dbc_string.split()
+        if not words or not words[0].startswith(('Table', 'Field')):
+            continue
+        # Retain only the first two words. This eliminates some weird dangling
+        # junk characters. Then remove the leading Field keywords.
+        dbc_strings.append(' '.join(words[:2]).replace('Field ', ''))
 
     # Join all the strings together (separated by spaces) and then split the
     # big string on Table, so each string is now a table name followed by the
@@ -393,6 +503,68 @@ class FERC1FieldParser(dbfread.FieldParser):
         return super(FERC1FieldParser, self).parseN(field, data)
 
 
+def clean_ferc1_numeric(data):
+    """
+    Clean up the raw values of a numeric FERC Form 1 DBF field.
+
+    This does the same thing to a whole column of values that
+    :meth:`FERC1FieldParser.parseN` does to each one of them, for use with
+    :func:`pudl.extract.dbf.read_dbf`.
+
+    Args:
+        data (numpy.ndarray): The raw values of a numeric field, as an array of
+            fixed-width bytestrings.
+
+    Returns:
+        numpy.ndarray: The cleaned up values.
+
+    """
+    # Strip whitespace, null characters, and zeroes
+    data = np.char.lstrip(np.char.strip(np.char.strip(data), b'*\x00'), b'0')
+    # Replace bare periods (which are non-numeric) with zero.
+    return np.where(data == b'.', b'0', data)
+
+
+def read_dbf_year(table, year, data_dir):
+    """Read one year of a FERC Form 1 DBF table into a dataframe.
+
+    This is a module level function so that it can be run in the worker
+    processes used by :func:`dbf2sqlite` to read many DBF files in parallel.
+
+    Args:
+        table (string): The name of the FERC Form 1 table from which data is
+            read.
+        year (int): The year of data to read.
+        data_dir (str): A string representing the full path to the top level of
+            the PUDL datastore containing the FERC Form 1 data to be used.
+
+    Returns:
+        :class:`pandas.DataFrame`: The records in the DBF file, with their
+        original (truncated) DBF column names, or None if there is no DBF file
+        for the table in that year.
+
+    """
+    dbf_path = get_dbf_path(table, year, data_dir=data_dir)
+    if not os.path.exists(dbf_path):
+        return None
+    return pudl.extract.dbf.read_dbf(
+        dbf_path,
+        encoding='latin1',
+        parserclass=FERC1FieldParser,
+        clean_numeric=clean_ferc1_numeric)
+
+
+def _combine_raw_dfs(table, raw_dfs, dbc_map):
+    """Concatenate the years of a FERC Form 1 table and rename its columns."""
+    raw_dfs = [df for df in raw_dfs if df is not None]
+    if raw_dfs:
+        return (
+            pd.concat(raw_dfs, sort=True).
+            drop('_NullFlags', axis=1, errors='ignore').
+            rename(dbc_map[table], axis=1)
+        )
+
+
 def get_raw_df(table, dbc_map, data_dir, years=pc.data_years['ferc1']):
     """Combine several years of a given FERC Form 1 DBF table into a dataframe.
 
@@ -412,33 +584,255 @@ def get_raw_df(table, dbc_map, data_dir, years=pc.data_years['ferc1']):
         Form 1 data for the given table.
 
     """
-    dbf_name = pc.ferc1_tbl2dbf[table]
+    return _combine_raw_dfs(
+        table,
+        [read_dbf_year(table, yr, data_dir=data_dir) for yr in years],
+        dbc_map)
 
-    raw_dfs = []
-    for yr in years:
-        ferc1_dir = datastore.path(
-            'ferc1', year=yr, file=False, data_dir=data_dir)
-        dbf_path = os.path.join(ferc1_dir, f"{dbf_name}.DBF")
 
-        if os.path.exists(dbf_path):
-            new_df = pd.DataFrame(
-                iter(dbfread.DBF(dbf_path,
-                                 encoding='latin1',
-                                 parserclass=FERC1FieldParser)))
-            raw_dfs = raw_dfs + [new_df, ]
+def _iter_raw_dfs_parallel(table_years, dbc_map, data_dir, workers):
+    """
+    Read FERC Form 1 DBF tables in a pool of worker processes.
 
-    if raw_dfs:
-        return (
-            pd.concat(raw_dfs, sort=True).
-            drop('_NullFlags', axis=1, errors='ignore').
-            rename(dbc_map[table], axis=1)
-        )
+    Each year of each table is read by a separate task. The tables are yielded
+    in order, each one as soon as all of its years have been read, while the
+    workers go on to read the following tables. Only a limited number of tasks
+    are queued up at a time, so that the parsed dataframes can't pile up in
+    memory if they are read faster than they can be written to SQLite.
+
+    Args:
+        table_years (list): Pairs of the name of a table to read, and a list
+            of the years of data to read for it.
+        dbc_map (dict of dicts): A dictionary of dictionaries, of the kind
+            returned by get_dbc_map().
+        data_dir (str): Path to the top level of the PUDL datastore.
+        workers (int): The number of worker processes to use.
+
+    Yields:
+        tuple: The name of each table, and a dataframe containing all of the
+        requested years of data for it (or None if there weren't any).
+
+    """
+    tasks = collections.deque(
+        (table, year) for table, years in table_years for year in years)
+    pending = collections.deque()
+    max_pending = 2 * workers
+    with concurrent.futures.ProcessPoolExecutor(
+            max_workers=workers) as executor:
+        for table, years in table_years:
+            raw_dfs = []
+            for _ in years:
+                while tasks and len(pending) < max_pending:
+                    task = tasks.popleft()
+                    pending.append(
+                        executor.submit(read_dbf_year, *task, data_dir))
+                raw_dfs.append(pending.popleft().result())
+            yield table, _combine_raw_dfs(table, raw_dfs, dbc_map)
+
+
+def _load_ferc1_table(table, new_df, conn, sqlite_meta):
+    """Write all the years of a FERC Form 1 table into the SQLite DB."""
+    if new_df is None:
+        return
+    # Because this table has no year in it, there would be multiple
+    # definitions of respondents if we didn't drop duplicates.
+    if table == 'f1_respondent_id':
+        new_df = new_df.drop_duplicates(
+            subset='respondent_id', keep='last')
+    n_recs = len(new_df)
+    logger.debug(f"    {table}: N = {n_recs}")
+    # Only try and load the table if there are some actual records:
+    if n_recs <= 0:
+        return
+
+    # Write the records out to the SQLite database, converting them for the
+    # inferred data types of the table's columns. Any records previously
+    # loaded from the same DBF files have already been deleted, so this
+    # shouldn't ever result in duplicate records.
+    logger.info(f"SQLite: loading {n_recs} rows into {table}.")
+    pudl.load.sqlite.insert_df(conn, sqlite_meta.tables[table], new_df)
+    # add the missing respondents into the respondent_id table.
+    if table == 'f1_respondent_id':
+        logger.debug(f'inserting missing respondents into {table}')
+        pudl.load.sqlite.insert_rows(
+            conn, sqlite_meta.tables['f1_respondent_id'],
+            columns=['respondent_id', 'respondent_name'],
+            rows=[
+                (514, 'AEP, Texas (PUDL determined)'),
+                (515, 'respondent_515'),
+                (516, 'respondent_516'),
+                (517, 'respondent_517'),
+                (518, 'respondent_518'),
+                (519, 'respondent_519'),
+                (522, 'Luning Energy Holdings LLC, Invenergy Investments '
+                      '(PUDL determined)'),
+            ])
+
+
+def _define_loaded_dbfs_table(sqlite_meta):
+    """Add the table recording which DBF files were cloned to the schema."""
+    return sa.Table(
+        LOADED_DBFS_TABLE, sqlite_meta,
+        sa.Column("table_name", sa.String),
+        sa.Column("report_year", sa.Integer),
+        sa.Column("refyear", sa.Integer, nullable=False),
+        sa.Column("size", sa.Integer, nullable=False),
+        sa.Column("mtime_ns", sa.Integer, nullable=False),
+        sa.Column("sha256", sa.String, nullable=False),
+        sa.PrimaryKeyConstraint(
+            "table_name", "report_year", sqlite_on_conflict="REPLACE"),
+    )
+
+
+def get_loaded_dbfs(sqlite_engine):
+    """Read which DBF files have been cloned into the FERC Form 1 SQLite DB.
+
+    Args:
+        sqlite_engine (:class:`sqlalchemy.engine.Engine`): An engine connected
+            to the FERC Form 1 SQLite database.
+
+    Returns:
+        dict: Maps each (table, year) pair which has been loaded into the
+        database to a dictionary describing the DBF file it was loaded from,
+        with the keys refyear, size, mtime_ns and sha256. If the database
+        has no record of the DBF files loaded into it, the dictionary is
+        empty.
+
+    """
+    if not sqlite_engine.has_table(LOADED_DBFS_TABLE):
+        return {}
+    loaded_dbfs = _define_loaded_dbfs_table(sa.MetaData())
+    with sqlite_engine.connect() as conn:
+        return {
+            (row.table_name, row.report_year): {
+                "refyear": row.refyear,
+                "size": row.size,
+                "mtime_ns": row.mtime_ns,
+                "sha256": row.sha256,
+            }
+            for row in conn.execute(loaded_dbfs.select())
+        }
+
+
+def _plan_ferc1_load(tables, years, sqlite_meta, loaded, data_dir):
+    """
+    Work out which years of each FERC Form 1 table need to be loaded.
+
+    A year of a table needs to be loaded if its DBF file hasn't been loaded
+    into the database yet, or if it has changed since it was. Each year's DBF
+    file is assumed to contain the records for that report year, so those
+    records can be replaced without touching the rest of the table. Tables
+    without a report_year column, like f1_respondent_id, can't be split up by
+    year, so if any of their years need to be loaded, all of them are loaded
+    again: the ones requested, and any that were loaded before.
+
+    Args:
+        tables (iterable): The names of the tables to load.
+        years (iterable): The years of data to load.
+        sqlite_meta (:class:`sqlalchemy.schema.MetaData`): The schema of the
+            FERC Form 1 database.
+        loaded (dict): The DBF files already loaded into the database, as
+            returned by :func:`get_loaded_dbfs`.
+        data_dir (str): Path to the top level of the PUDL datastore.
+
+    Returns:
+        list: A tuple for each table with years to be loaded, containing the
+        name of the table, whether all its records need to be replaced, and
+        a dictionary mapping each year to be loaded to a fingerprint of its
+        DBF file, as returned by
+        :func:`pudl.load.manifest.file_fingerprint`.
+
+    """
+    plan = []
+    for table in tables:
+        table_years = set(years)
+        by_year = "report_year" in sqlite_meta.tables[table].columns
+        if not by_year:
+            table_years.update(yr for tbl, yr in loaded if tbl == table)
+        fingerprints = {}
+        for year in sorted(table_years):
+            dbf_path = get_dbf_path(table, year, data_dir=data_dir)
+            if os.path.exists(dbf_path):
+                fingerprints[year] = pudl.load.manifest.file_fingerprint(
+                    dbf_path, previous=loaded.get((table, year)))
+        stale = {
+            year: fingerprint for year, fingerprint in fingerprints.items()
+            if loaded.get((table, year), {}).get("sha256")
+            != fingerprint["sha256"]
+        }
+        if not stale:
+            logger.info(f"SQLite: {table} is up to date.")
+        elif by_year:
+            plan.append((table, False, stale))
+        else:
+            plan.append((table, True, fingerprints))
+    return plan
+
+
+def _load_ferc1_plan(plan, raw_dfs, conn, sqlite_meta, refyear):
+    """
+    Replace the outdated records of FERC Form 1 tables with newly read ones.
+
+    For each table in the load plan, the records which are being replaced are
+    deleted, the new records are inserted, and the DBF files they were read
+    from are recorded in the table of loaded DBF files.
+
+    Args:
+        plan (list): The tables to load, as returned by
+            :func:`_plan_ferc1_load`.
+        raw_dfs (iterable): Pairs of table names and the dataframes read from
+            their DBF files, in the same order as the plan.
+        conn (:class:`sqlalchemy.engine.Connection`): A connection to the
+            FERC Form 1 database, within :func:`pudl.load.sqlite.bulk_load`.
+        sqlite_meta (:class:`sqlalchemy.schema.MetaData`): The schema of the
+            FERC Form 1 database, including the table of loaded DBF files.
+        refyear (int): The year of the FERC Form 1 DB used as a template for
+            the database schema.
+
+    Returns:
+        None
+
+    """
+    loaded_dbfs = sqlite_meta.tables[LOADED_DBFS_TABLE]
+    for (table, replace_all, dbfs), (_, new_df) in zip(plan, raw_dfs):
+        logger.info(f"Pandas: read {table} into a DataFrame.")
+        if replace_all:
+            # Forget about any years whose DBF files have gone missing.
+            pudl.load.sqlite.delete_rows(
+                conn, loaded_dbfs, "table_name", [table])
+            n_deleted = pudl.load.sqlite.delete_rows(
+                conn, sqlite_meta.tables[table])
+        else:
+            n_deleted = pudl.load.sqlite.delete_rows(
+                conn, sqlite_meta.tables[table], "report_year", dbfs)
+        if n_deleted:
+            logger.info(
+                f"SQLite: deleted {n_deleted} outdated rows from {table}.")
+        _load_ferc1_table(table, new_df, conn, sqlite_meta)
+        pudl.load.sqlite.insert_rows(
+            conn, loaded_dbfs,
+            [(table, year, refyear, dbf["size"], dbf["mtime_ns"],
+              dbf["sha256"]) for year, dbf in dbfs.items()],
+            columns=["table_name", "report_year", "refyear",
+                     "size", "mtime_ns", "sha256"])
 
 
 def dbf2sqlite(tables, years, refyear, pudl_settings,
-               bad_cols=(), clobber=False):
+               bad_cols=(), clobber=False, workers=1, incremental=False):
     """Clone the FERC Form 1 Databsae to SQLite.
 
+    SQLite only allows one process to write to a database at a time, so if
+    more than one worker is requested, the DBF files are read in a pool of
+    worker processes, one table-year at a time, while this process writes each
+    table into the database as soon as all of its years have been read.
+
+    The size, modification time and hash of every DBF file that is loaded are
+    recorded in the database. When the database is updated incrementally,
+    e.g. to add a newly published year of data, only the years of each table
+    whose DBF files haven't been loaded already, or have changed since, are
+    read and written into the database, replacing any records previously
+    loaded from them.
+
     Args:
         tables (iterable): What tables should be cloned?
         years (iterable): Which years of data should be cloned?
@@ -449,23 +843,58 @@ def dbf2sqlite(tables, years, refyear, pudl_settings,
             indicating columns that should be skipped during the cloning
             process. Both table and column are strings in this case, the
             names of their respective entities within the database metadata.
+        clobber (bool): Whether to drop an existing database.
+        workers (int): The number of worker processes used to read the DBF
+            files. If 1, they are read serially in this process.
+        incremental (bool): Whether to update an existing database, rather
+            than creating a new one. Any requested tables which aren't in the
+            database yet are created.
 
     Returns:
         None
 
+    Raises:
+        ValueError: If both clobber and incremental are set, or if the
+            existing database can't be updated incrementally because there
+            is no record of how it was cloned, or because it was cloned using
+            a different reference year.
+
     """
-    # Read in the structure of the DB, if it exists
-    logger.info("Dropping the old FERC Form 1 SQLite DB if it exists.")
+    if clobber and incremental:
+        raise ValueError(
+            "An incremental update of the FERC Form 1 DB can't clobber it.")
     sqlite_engine = sa.create_engine(pudl_settings["ferc1_db"])
-    try:
-        # So that we can wipe it out
-        pudl.helpers.drop_tables(sqlite_engine, clobber=clobber)
-    except sa.exc.OperationalError:
-        pass
+    if incremental:
+        loaded = get_loaded_dbfs(sqlite_engine)
+        if not loaded and sqlite_engine.table_names():
+            raise ValueError(
+                "The existing FERC Form 1 DB has no record of the DBF files "
+                "which were cloned into it, so it can't be updated "
+                "incrementally. Clobber it and clone it again.")
+        refyears = {dbf["refyear"] for dbf in loaded.values()}
+        if refyears - {refyear}:
+            raise ValueError(
+                f"The existing FERC Form 1 DB was cloned using "
+                f"{', '.join(str(yr) for yr in sorted(refyears))} as the "
+                f"reference year, not {refyear}. Clobber it to clone it "
+                f"again with a different reference year.")
+        logger.info(
+            f"Updating the FERC Form 1 SQLite DB, which contains "
+            f"{len(loaded)} table-years.")
+    else:
+        # Read in the structure of the DB, if it exists
+        logger.info("Dropping the old FERC Form 1 SQLite DB if it exists.")
+        try:
+            # So that we can wipe it out
+            pudl.helpers.drop_tables(sqlite_engine, clobber=clobber)
+        except sa.exc.OperationalError:
+            pass
+        loaded = {}
 
     # And start anew
     sqlite_engine = sa.create_engine(pudl_settings["ferc1_db"])
     sqlite_meta = sa.MetaData(bind=sqlite_engine)
+    _define_loaded_dbfs_table(sqlite_meta)
 
     # Get the mapping of filenames to table names and fields
     logger.info(f"Creating a new database schema based on {refyear}.")
@@ -474,56 +903,24 @@ def dbf2sqlite(tables, years, refyear, pudl_settings,
                      refyear=refyear, bad_cols=bad_cols,
                      data_dir=pudl_settings['data_dir'])
 
-    for table in tables:
-        logger.info(f"Pandas: reading {table} into a DataFrame.")
-        new_df = get_raw_df(table, dbc_map, years=years,
+    plan = _plan_ferc1_load(tables, years, sqlite_meta, loaded,
                             data_dir=pudl_settings['data_dir'])
-        # Because this table has no year in it, there would be multiple
-        # definitions of respondents if we didn't drop duplicates.
-        if table == 'f1_respondent_id':
-            new_df = new_df.drop_duplicates(
-                subset='respondent_id', keep='last')
-        n_recs = len(new_df)
-        logger.debug(f"    {table}: N = {n_recs}")
-        # Only try and load the table if there are some actual records:
-        if n_recs <= 0:
-            continue
-
-        # Write the records out to the SQLite database, and make sure that
-        # the inferred data types are being enforced during loading.
-        # if_exists='append' is being used because we defined the tables
-        # above, but left them empty. Becaue the DB is reset at the beginning
-        # of the function, this shouldn't ever result in duplicate records.
-        coltypes = {col.name: col.type for col in sqlite_meta.tables[table].c}
-        logger.info(f"SQLite: loading {n_recs} rows into {table}.")
-        new_df.to_sql(table, sqlite_engine,
-                      if_exists='append', chunksize=100000,
-                      dtype=coltypes, index=False)
-        # add the missing respondents into the respondent_id table.
-        if table == 'f1_respondent_id':
-            logger.debug(f'inserting missing respondents into {table}')
-            sa.insert(sqlite_meta.tables['f1_respondent_id'],
-                      # we can insert info info into any of the columns for this
-                      # table through the following dictionary, but each of the
-                      # records need to have all of the same columns (you can't
-                      # add a column for one respondent without adding it to all).
-                      values=[
-                      {'respondent_id': 514,
-                       'respondent_name': 'AEP, Texas (PUDL determined)'},
-                      {'respondent_id': 515,
-                       'respondent_name': 'respondent_515'},
-                      {'respondent_id': 516,
-                       'respondent_name': 'respondent_516'},
-                      {'respondent_id': 517,
-                       'respondent_name': 'respondent_517'},
-                      {'respondent_id': 518,
-                       'respondent_name': 'respondent_518'},
-                      {'respondent_id': 519,
-                       'respondent_name': 'respondent_519'},
-                      {'respondent_id': 522,
-                       'respondent_name':
-                       'Luning Energy Holdings LLC, Invenergy Investments (PUDL determined)'},
-            ]).execute()
+    table_years = [(table, list(dbfs)) for table, _, dbfs in plan]
+    if workers == 1:
+        raw_dfs = (
+            (table, get_raw_df(table, dbc_map, years=years,
+                               data_dir=pudl_settings['data_dir']))
+            for table, years in table_years
+        )
+    else:
+        logger.info(
+            f"Reading FERC Form 1 DBF files using {workers} worker processes.")
+        raw_dfs = _iter_raw_dfs_parallel(
+            table_years, dbc_map,
+            data_dir=pudl_settings['data_dir'], workers=workers)
+    with pudl.load.sqlite.bulk_load(
+            sqlite_engine, incremental=incremental) as conn:
+        _load_ferc1_plan(plan, raw_dfs, conn, sqlite_meta, refyear)
 
 
 ###########################################################################
@@ -647,6 +1044,27 @@ def extract(ferc1_tables=pc.pudl_tables['ferc1'],
     return ferc1_raw_dfs
 
 
+def extract_columns(table, pudl_table):
+    """Select the columns of a FERC Form 1 DB table used by a PUDL table.
+
+    Args:
+        table (:class:`sqlalchemy.Table`): The FERC Form 1 DB table.
+        pudl_table (str): The name of the PUDL table it is extracted into.
+
+    Returns:
+        list: The :class:`sqlalchemy.Column` objects to select, as declared
+        in :data:`EXTRACT_COLUMNS`.
+
+    """
+    columns = EXTRACT_COLUMNS[pudl_table]
+    if columns is None:
+        return [
+            col for col in table.columns
+            if not col.name.endswith("_f") and col.name not in UNUSED_COLUMNS
+        ]
+    return [table.c[col] for col in columns]
+
+
 def fuel(ferc1_meta, ferc1_table, ferc1_years):
     """Creates a DataFrame of f1_fuel table records with plant names, >0 fuel.
 
@@ -664,10 +1082,11 @@ def fuel(ferc1_meta, ferc1_table, ferc1_years):
     """
     # Grab the f1_fuel SQLAlchemy Table object from the metadata object.
     f1_fuel = ferc1_meta.tables[ferc1_table]
-    # Generate a SELECT statement that pulls all fields of the f1_fuel table,
-    # but only gets records with plant names and non-zero fuel amounts:
+    # Generate a SELECT statement that pulls the fields of the f1_fuel table
+    # used by PUDL, but only gets records with plant names and non-zero fuel
+    # amounts:
     f1_fuel_select = (
-        sa.sql.select([f1_fuel])
+        sa.sql.select(extract_columns(f1_fuel, "fuel_ferc1"))
         .where(f1_fuel.c.fuel != '')
         .where(f1_fuel.c.fuel_quantity > 0)
         .where(f1_fuel.c.plant_name != '')
@@ -698,7 +1117,7 @@ def plants_steam(ferc1_meta, ferc1_table, ferc1_years):
     """
     f1_steam = ferc1_meta.tables[ferc1_table]
     f1_steam_select = (
-        sa.sql.select([f1_steam])
+        sa.sql.select(extract_columns(f1_steam, "plants_steam_ferc1"))
         .where(f1_steam.c.report_year.in_(ferc1_years))
         .where(f1_steam.c.plant_name != '')
         .where(f1_steam.c.tot_capacity > 0.0)
@@ -726,7 +1145,7 @@ def plants_small(ferc1_meta, ferc1_table, ferc1_years):
 
     f1_small = ferc1_meta.tables[ferc1_table]
     f1_small_select = (
-        sa.sql.select([f1_small, ])
+        sa.sql.select(extract_columns(f1_small, "plants_small_ferc1"))
         .where(f1_small.c.report_year.in_(ferc1_years))
         .where(f1_small.c.plant_name != '')
         .where(or_((f1_small.c.capacity_rating != 0),
@@ -761,7 +1180,7 @@ def plants_hydro(ferc1_meta, ferc1_table, ferc1_years):
     f1_hydro = ferc1_meta.tables[ferc1_table]
 
     f1_hydro_select = (
-        sa.sql.select([f1_hydro])
+        sa.sql.select(extract_columns(f1_hydro, "plants_hydro_ferc1"))
         .where(f1_hydro.c.plant_name != '')
         .where(f1_hydro.c.report_year.in_(ferc1_years))
     )
@@ -789,7 +1208,8 @@ def plants_pumped_storage(ferc1_meta, ferc1_table, ferc1_years):
     # Removing the empty records.
     # This reduces the entries for 2015 from 272 records to 27.
     f1_pumped_storage_select = (
-        sa.sql.select([f1_pumped_storage])
+        sa.sql.select(
+            extract_columns(f1_pumped_storage, "plants_pumped_storage_ferc1"))
         .where(f1_pumped_storage.c.plant_name != '')
         .where(f1_pumped_storage.c.report_year.in_(ferc1_years))
     )
@@ -814,7 +1234,8 @@ def plant_in_service(ferc1_meta, ferc1_table, ferc1_years):
     """
     f1_plant_in_srvce = ferc1_meta.tables[ferc1_table]
     f1_plant_in_srvce_select = (
-        sa.sql.select([f1_plant_in_srvce])
+        sa.sql.select(
+            extract_columns(f1_plant_in_srvce, "plant_in_service_ferc1"))
         .where(f1_plant_in_srvce.c.report_year.in_(ferc1_years))
     )
 
@@ -838,7 +1259,8 @@ def purchased_power(ferc1_meta, ferc1_table, ferc1_years):
     """
     f1_purchased_pwr = ferc1_meta.tables[ferc1_table]
     f1_purchased_pwr_select = (
-        sa.sql.select([f1_purchased_pwr])
+        sa.sql.select(
+            extract_columns(f1_purchased_pwr, "purchased_power_ferc1"))
         .where(f1_purchased_pwr.c.report_year.in_(ferc1_years))
     )
 
@@ -862,7 +1284,8 @@ def accumulated_depreciation(ferc1_meta, ferc1_table, ferc1_years):
     """
     f1_accumdepr_prvsn = ferc1_meta.tables[ferc1_table]
     f1_accumdepr_prvsn_select = (
-        sa.sql.select([f1_accumdepr_prvsn])
+        sa.sql.select(
+            extract_columns(f1_accumdepr_prvsn, "accumulated_depreciation_ferc1"))
         .where(f1_accumdepr_prvsn.c.report_year.in_(ferc1_years))
     )
 
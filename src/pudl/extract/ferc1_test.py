@@ -0,0 +1,225 @@
+"""Unit tests for pudl.extract.ferc1 module."""
+import os
+import pathlib
+import re
+import string
+import tempfile
+import unittest
+import zipfile
+from unittest.mock import patch
+
+import pandas as pd
+import sqlalchemy as sa
+
+import pudl.constants as pc
+import pudl.extract.ferc1 as ferc1
+import pudl.transform.ferc1
+import pudl.workspace.datastore as datastore
+
+FERC1_TEST_ZIP = pathlib.Path(
+    __file__).parents[3] / "test/data/ferc/form1/f1_2018/f1_2018.zip"
+FERC1_TEST_TABLES = [
+    "f1_respondent_id", "f1_fuel", "f1_steam", "f1_gnrt_plant", "f1_hydro",
+    "f1_pumped_storage", "f1_plant_in_srvce", "f1_purchased_pwr",
+]
+FERC1_RECORD_ID_COLUMNS = [
+    "respondent_id", "report_year", "report_prd", "spplmnt_num", "row_number",
+]
+
+
+def _baseline_strings(filename, min_length=4):
+    """Find printable strings one character at a time, as PUDL used to."""
+    with open(filename, errors="ignore") as f:
+        result = ""
+        for c in f.read():
+            if c in string.printable:
+                result += c
+                continue
+            if len(result) >= min_length:
+                yield result
+            result = ""
+        if len(result) >= min_length:
+            yield result
+
+
+def _baseline_table_fields(filename, min_length=4):
+    """Find the table and field names in a DBC file, as PUDL used to."""
+    dbc_strings = [s.strip() for s in _baseline_strings(filename, min_length)]
+    dbc_strings = [re.sub(r'\s+', ' ', s) for s in dbc_strings if s != '']
+    dbc_strings = [s for s in dbc_strings if re.match('(^Table|^Field)', s)]
+    dbc_strings = [' '.join(s.split()[:2]) for s in dbc_strings]
+    dbc_strings = [re.sub('Field ', '', s) for s in dbc_strings]
+    dbc_table_strings = ' '.join(dbc_strings).split('Table ')
+    dbc_table_strings = [s.strip() for s in dbc_table_strings if s != '']
+    return {s.split()[0]: s.split()[1:] for s in dbc_table_strings}
+
+
+@unittest.skipUnless(FERC1_TEST_ZIP.exists(), "FERC Form 1 test data missing")
+class Ferc1TestData(unittest.TestCase):
+    """Base class for tests which use the 2018 FERC Form 1 test data."""
+
+    def setUp(self):
+        """Unzip the 2018 FERC Form 1 test data into a datastore."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.data_dir = self.tmpdir.name
+        self.year_dir = pathlib.Path(datastore.path(
+            "ferc1", year=2018, file=False, data_dir=self.data_dir))
+        self.year_dir.mkdir(parents=True)
+        with zipfile.ZipFile(FERC1_TEST_ZIP) as archive:
+            archive.extractall(self.year_dir)
+
+    def tearDown(self):
+        """Remove the temporary files."""
+        self.tmpdir.cleanup()
+
+
+class TestDbcMap(Ferc1TestData):
+    """Test extracting and caching the table and field names of a DBC file."""
+
+    def test_matches_baseline(self):
+        """The regex scanner finds the same strings and fields as before."""
+        dbc_path = ferc1.dbc_filename(2018, self.data_dir)
+        for min_length in (1, 4, 10):
+            self.assertListEqual(
+                list(_baseline_strings(dbc_path, min_length)),
+                list(ferc1.get_strings(dbc_path, min_length)))
+        table_fields = _baseline_table_fields(dbc_path)
+        dbc_map = ferc1.extract_dbc_map(2018, self.data_dir)
+        self.assertEqual(8, len(dbc_map))
+        for table, fields in dbc_map.items():
+            self.assertListEqual(table_fields[table], list(fields.values()))
+
+    def test_cache_keyed_by_dbfs(self):
+        """The cached DBC map is only used if none of its files changed."""
+        dbf_paths = sorted(self.year_dir.glob("*.DBF"))
+        hidden_dir = pathlib.Path(self.tmpdir.name, "hidden")
+        hidden_dir.mkdir()
+        for path in dbf_paths[4:]:
+            path.rename(hidden_dir / path.name)
+
+        with patch.object(ferc1, "extract_dbc_map",
+                          wraps=ferc1.extract_dbc_map) as extract:
+            partial_map = ferc1.get_dbc_map(2018, self.data_dir)
+            self.assertEqual(4, len(partial_map))
+            self.assertEqual(partial_map,
+                             ferc1.get_dbc_map(2018, self.data_dir))
+            self.assertEqual(1, extract.call_count)
+
+            # The rest of the year's DBF files show up.
+            for path in dbf_paths[4:]:
+                (hidden_dir / path.name).rename(path)
+            full_map = ferc1.get_dbc_map(2018, self.data_dir)
+            self.assertEqual(2, extract.call_count)
+            self.assertEqual(8, len(full_map))
+            self.assertTrue(set(full_map) <= set(pc.ferc1_tbl2dbf))
+
+            # Touching a file doesn't change it, so the map isn't extracted.
+            stat = dbf_paths[0].stat()
+            os.utime(dbf_paths[0], ns=(stat.st_atime_ns,
+                                       stat.st_mtime_ns + 10**9))
+            self.assertEqual(full_map, ferc1.get_dbc_map(2018, self.data_dir))
+            self.assertEqual(2, extract.call_count)
+
+            # Removing a file changes the key too.
+            dbf_paths[-1].unlink()
+            self.assertEqual(7, len(ferc1.get_dbc_map(2018, self.data_dir)))
+            self.assertEqual(3, extract.call_count)
+
+
+class TestDbf2Sqlite(Ferc1TestData):
+    """Test cloning the FERC Form 1 DBF files into SQLite."""
+
+    def _clone(self, db_name, tables, **kwargs):
+        """Clone tables into a database, returning their contents."""
+        pudl_settings = {
+            "ferc1_db": f"sqlite:///{self.tmpdir.name}/{db_name}",
+            "data_dir": self.data_dir,
+        }
+        ferc1.dbf2sqlite(tables, [2018], 2018, pudl_settings, **kwargs)
+        engine = sa.create_engine(pudl_settings["ferc1_db"])
+        return {table: pd.read_sql(f"SELECT * FROM {table}", engine)
+                for table in tables}
+
+    def test_incremental(self):
+        """Tables added incrementally match a full clone, and aren't reloaded."""
+        expected = self._clone("full.sqlite", FERC1_TEST_TABLES)
+        self.assertEqual(6743, len(expected["f1_purchased_pwr"]))
+        self._clone("incremental.sqlite", FERC1_TEST_TABLES[:4])
+        self._clone("incremental.sqlite", FERC1_TEST_TABLES, incremental=True)
+        with self.assertLogs(ferc1.logger, "INFO") as logs:
+            result = self._clone(
+                "incremental.sqlite", FERC1_TEST_TABLES, incremental=True)
+        self.assertEqual(
+            len(FERC1_TEST_TABLES),
+            sum("is up to date" in line for line in logs.output))
+        for table in FERC1_TEST_TABLES:
+            pd.testing.assert_frame_equal(expected[table], result[table])
+        with self.assertRaises(ValueError):
+            self._clone("incremental.sqlite", FERC1_TEST_TABLES,
+                        incremental=True, clobber=True)
+
+    def test_workers(self):
+        """Reading the DBF files in parallel gives the same tables."""
+        expected = self._clone("serial.sqlite", FERC1_TEST_TABLES, workers=1)
+        with patch.object(ferc1, "_iter_raw_dfs_parallel",
+                          wraps=ferc1._iter_raw_dfs_parallel) as iter_raw_dfs:
+            result = self._clone(
+                "parallel.sqlite", FERC1_TEST_TABLES, workers=2)
+        self.assertEqual(1, iter_raw_dfs.call_count)
+        for table in FERC1_TEST_TABLES:
+            self.assertFalse(expected[table].empty, table)
+            pd.testing.assert_frame_equal(expected[table], result[table])
+
+
+class TestExtractColumns(Ferc1TestData):
+    """Test which columns are extracted from the FERC Form 1 DB tables."""
+
+    def setUp(self):
+        """Clone the test data into SQLite."""
+        super().setUp()
+        self.pudl_settings = {
+            "ferc1_db": f"sqlite:///{self.tmpdir.name}/ferc1.sqlite",
+            "data_dir": self.data_dir,
+        }
+        ferc1.dbf2sqlite(FERC1_TEST_TABLES, [2018], 2018, self.pudl_settings)
+        self.engine = sa.create_engine(self.pudl_settings["ferc1_db"])
+        self.ferc1_meta = ferc1.get_ferc1_meta(self.engine)
+
+    def test_unused_columns_dropped(self):
+        """No footnote or unused columns are read into any PUDL table."""
+        for pudl_table, table in pc.table_map_ferc1_pudl.items():
+            columns = [
+                col.name for col in ferc1.extract_columns(
+                    self.ferc1_meta.tables[table], pudl_table)]
+            self.assertTrue(columns, pudl_table)
+            self.assertFalse(
+                [col for col in columns if col.endswith("_f")], pudl_table)
+            self.assertFalse(
+                set(columns) & set(ferc1.UNUSED_COLUMNS), pudl_table)
+
+    def test_plant_in_service_columns(self):
+        """Plant in service has the record ID and unpacked data columns."""
+        columns = [
+            col.name for col in ferc1.extract_columns(
+                self.ferc1_meta.tables["f1_plant_in_srvce"],
+                "plant_in_service_ferc1")]
+        self.assertListEqual(
+            FERC1_RECORD_ID_COLUMNS + [
+                "begin_yr_bal", "addition", "retirements", "adjustments",
+                "transfers", "yr_end_bal"],
+            columns)
+        raw_dfs = ferc1.extract(
+            ["plant_in_service_ferc1"], [2018], self.pudl_settings)
+        transformed_dfs = pudl.transform.ferc1.plant_in_service(raw_dfs, {})
+        self.assertFalse(transformed_dfs["plant_in_service_ferc1"].empty)
+
+    def test_report_year_index(self):
+        """Every cloned table with a report year is indexed by it."""
+        inspector = sa.inspect(self.engine)
+        for table in FERC1_TEST_TABLES:
+            columns = [col["name"] for col in inspector.get_columns(table)]
+            indexes = [index["name"] for index in inspector.get_indexes(table)]
+            if "report_year" in columns:
+                self.assertIn(f"ix_{table}_report_year", indexes)
+            else:
+                self.assertListEqual([], indexes)
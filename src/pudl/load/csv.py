@@ -116,7 +116,9 @@ def csv_dump(df, resource_name, keep_index, datapkg_dir):
     Set :func:`pandas.DataFrame.to_csv` arguments appropriately depending on
     what data source we're writing out, and then write it out. In practice
     this means adding a .csv to the end of the resource name, and then, if it's
-    part of epacems, adding a .gz after that.
+    part of epacems, adding a .gz after that. EPA CEMS data is appended to any
+    existing file, so that it can be written out in chunks. This includes the
+    daily, monthly and annual EPA CEMS totals.
 
     Args:
         df (pandas.DataFrame): The DataFrame to be dumped to CSV.
@@ -137,12 +139,17 @@ def csv_dump(df, resource_name, keep_index, datapkg_dir):
         "index": keep_index,
     }
 
-    if "hourly_emissions_epacems" in resource_name:
+    if "_emissions_epacems" in resource_name:
         args["path_or_buf"] = pathlib.Path(
             args["path_or_buf"].parent,
             args["path_or_buf"].name + ".gz")
         args["mode"] = "a"
-        args["date_format"] = '%Y-%m-%dT%H:%M:%SZ'
+        if "hourly_emissions_epacems" in resource_name:
+            args["date_format"] = '%Y-%m-%dT%H:%M:%SZ'
+        else:
+            args["date_format"] = '%Y-%m-%d'
+        # CEMS may be appended in many chunks, and needs only one header.
+        args["header"] = not args["path_or_buf"].exists()
 
     if keep_index:
         args["index_label"] = "id"
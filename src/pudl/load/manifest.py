@@ -0,0 +1,261 @@
+"""Track the inputs used to build each EPA CEMS partition in a datapackage.
+
+Re-running the EPA CEMS ETL for every requested state-year takes hours, even
+though usually only the most recent year's monthly source files have changed.
+The manifest is a JSON file stored in the datapackage directory. For each
+partition that has been output, it records the size, modification time and
+SHA-256 hash of the monthly CEMS source files, the plant table which supplies
+the UTC offsets, and a fingerprint of the PUDL code and ETL settings that
+produced it. If none of these has changed, and the partition's output file is
+still present, the partition can be reused rather than processed again.
+
+Hashing ~100 GB of zipped CEMS files takes a while too, so a file's hash is
+only recomputed if its size or modification time differs from what was
+recorded in the manifest.
+
+"""
+
+import hashlib
+import importlib
+import json
+import logging
+import pathlib
+
+import pudl
+import pudl.constants as pc
+import pudl.workspace.datastore as datastore
+
+logger = logging.getLogger(__name__)
+
+EPACEMS_MANIFEST = "epacems_manifest.json"
+"""str: Name of the EPA CEMS manifest file within a datapackage directory."""
+
+EPACEMS_CODE_MODULES = (
+    "pudl.constants",
+    "pudl.helpers",
+    "pudl.etl",
+    "pudl.extract.epacems",
+    "pudl.transform.epacems",
+    "pudl.load.csv",
+    "pudl.load.parquet",
+    "pudl.convert.epacems_to_parquet",
+)
+"""tuple: Modules whose source code determines the EPA CEMS outputs."""
+
+EPACEMS_TABLES = (
+    "hourly_emissions_epacems",
+    *pc.epacems_rollup_tables.values(),
+)
+"""tuple: Names of the partitioned EPA CEMS tables output to datapackages."""
+
+
+def _sha256(path, blocksize=2**20):
+    """Compute the SHA-256 hash of a file, reading it in blocks."""
+    sha256 = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(blocksize), b""):
+            sha256.update(block)
+    return sha256.hexdigest()
+
+
+def file_fingerprint(path, previous=None):
+    """
+    Record the size, modification time and hash of a file.
+
+    Args:
+        path (path-like): The file to fingerprint.
+        previous (dict): A fingerprint of the same file recorded earlier. If
+            its size and modification time are unchanged, its hash is reused
+            instead of reading the whole file again.
+
+    Returns:
+        dict: With the keys size (int), mtime_ns (int) and sha256 (str).
+
+    """
+    stat = pathlib.Path(path).stat()
+    fingerprint = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+    if (previous is not None
+            and previous.get("size") == fingerprint["size"]
+            and previous.get("mtime_ns") == fingerprint["mtime_ns"]):
+        fingerprint["sha256"] = previous["sha256"]
+    else:
+        fingerprint["sha256"] = _sha256(path)
+    return fingerprint
+
+
+def code_fingerprint(modules=EPACEMS_CODE_MODULES):
+    """
+    Fingerprint the version and source code of the PUDL package.
+
+    The package version alone doesn't change while the code is being developed,
+    so the source files of the modules that shape the outputs are hashed too.
+
+    Args:
+        modules (iterable): Names of the modules whose source is hashed.
+
+    Returns:
+        str: The PUDL version and a hash of the modules' source code.
+
+    """
+    sha256 = hashlib.sha256()
+    for module in modules:
+        path = pathlib.Path(importlib.import_module(module).__file__)
+        sha256.update(path.read_bytes())
+    return f"{pudl.__version__}+{sha256.hexdigest()[:16]}"
+
+
+def epacems_output_path(datapkg_dir, resource_name, output_format="csv"):
+    """
+    Path to the file that holds an EPA CEMS resource within a datapackage.
+
+    Args:
+        datapkg_dir (path-like): Path to the top level datapackage directory.
+        resource_name (str): The name of an EPA CEMS tabular data resource,
+            with the form "TABLE_YEAR_STATE".
+        output_format (str): Either 'csv' or 'parquet'.
+
+    Returns:
+        pathlib.Path: The path to the resource's data file.
+
+    """
+    if output_format == "parquet":
+        return pudl.load.parquet.epacems_resource_path(
+            datapkg_dir, resource_name)
+    return pathlib.Path(datapkg_dir, "data", f"{resource_name}.csv.gz")
+
+
+def epacems_outputs(datapkg_dir):
+    """
+    Find all of the EPA CEMS outputs which are present in a datapackage.
+
+    Both gzipped CSV and Parquet outputs are found, for the hourly table and
+    for each of the tables of daily, monthly and annual totals.
+
+    Args:
+        datapkg_dir (path-like): Path to the top level datapackage directory.
+
+    Returns:
+        dict: The names of the EPA CEMS resources (values) held by each of the
+        output files (keys, as :class:`pathlib.Path`).
+
+    """
+    data_dir = pathlib.Path(datapkg_dir, "data")
+    outputs = {}
+    for table in EPACEMS_TABLES:
+        for path in sorted(data_dir.glob(f"{table}_*.csv.gz")):
+            outputs[path] = path.name[:-len(".csv.gz")]
+        for path in sorted(data_dir.glob(f"{table}/year=*/state=*/*.parquet")):
+            outputs[path] = path.name[:-len(".parquet")]
+    return outputs
+
+
+def epacems_fingerprint(year, state, data_dir, datapkg_dir, code, settings,
+                        previous=None):
+    """
+    Fingerprint all of the inputs of an EPA CEMS state-year partition.
+
+    Args:
+        year (int): The year of the partition.
+        state (str): The 2-letter US state code of the partition.
+        data_dir (path-like): Path to the top directory of the PUDL datastore.
+        datapkg_dir (path-like): Path to the top level datapackage directory.
+        code (str): Fingerprint of the code, from :func:`code_fingerprint`.
+        settings (dict): The ETL settings which affect the outputs.
+        previous (dict): The partition's entry in the manifest, if any. Used
+            to avoid re-hashing files which have not been modified.
+
+    Returns:
+        dict: A JSON serializable fingerprint of the partition's inputs.
+
+    """
+    previous = previous or {}
+    previous_sources = previous.get("sources", {})
+    sources = {}
+    for month in range(1, 13):
+        path = pathlib.Path(datastore.path(
+            "epacems", year=year, month=month, state=state,
+            data_dir=data_dir))
+        sources[path.name] = file_fingerprint(
+            path, previous=previous_sources.get(path.name))
+    plants = file_fingerprint(
+        pathlib.Path(datapkg_dir, "data", "plants_entity_eia.csv"),
+        previous=previous.get("plants_entity_eia"))
+    return {
+        "code": code,
+        "settings": settings,
+        "sources": sources,
+        "plants_entity_eia": plants,
+    }
+
+
+def _without_mtimes(fingerprint):
+    """Drop the modification times, which don't affect the outputs."""
+    return json.loads(
+        json.dumps(fingerprint),
+        object_hook=lambda d: {k: v for k, v in d.items() if k != "mtime_ns"})
+
+
+def is_unchanged(previous, fingerprint):
+    """
+    Check whether a partition's inputs are the same as when it was output.
+
+    Files which have been touched but whose contents are unchanged are not
+    considered to have changed.
+
+    Args:
+        previous (dict): The partition's entry in the manifest, or None.
+        fingerprint (dict): The current fingerprint of the partition's inputs.
+
+    Returns:
+        bool: True if the partition can be reused.
+
+    """
+    if previous is None:
+        return False
+    return _without_mtimes(previous) == _without_mtimes(fingerprint)
+
+
+def load_manifest(datapkg_dir):
+    """
+    Read the EPA CEMS manifest of a datapackage.
+
+    Args:
+        datapkg_dir (path-like): Path to the top level datapackage directory.
+
+    Returns:
+        dict: The fingerprints of the previously output partitions, keyed by
+        resource name. Empty if there is no manifest, or it can't be read.
+
+    """
+    path = pathlib.Path(datapkg_dir, EPACEMS_MANIFEST)
+    if not path.exists():
+        return {}
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except ValueError:
+        logger.warning(f"Ignoring unreadable EPA CEMS manifest {path}")
+        return {}
+
+
+def save_manifest(manifest, datapkg_dir):
+    """
+    Write the EPA CEMS manifest of a datapackage.
+
+    The manifest is written to a temporary file which then replaces the old
+    one, so that an interrupted ETL run can't leave a corrupted manifest.
+
+    Args:
+        manifest (dict): Fingerprints of the output partitions, keyed by
+            resource name.
+        datapkg_dir (path-like): Path to the top level datapackage directory.
+
+    Returns:
+        None
+
+    """
+    path = pathlib.Path(datapkg_dir, EPACEMS_MANIFEST)
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    tmp_path.replace(path)
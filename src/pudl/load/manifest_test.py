@@ -0,0 +1,123 @@
+"""Unit tests for pudl.load.manifest module."""
+import json
+import os
+import pathlib
+import tempfile
+import unittest
+
+import pudl.load.manifest as manifest
+
+
+class TestFingerprints(unittest.TestCase):
+    """Test fingerprinting the inputs of EPA CEMS partitions."""
+
+    def setUp(self):
+        """Create a file to fingerprint."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = pathlib.Path(self.tmpdir.name, "epacems2018co01.zip")
+        self.path.write_bytes(b"hourly emissions")
+
+    def tearDown(self):
+        """Remove the temporary files."""
+        self.tmpdir.cleanup()
+
+    def _touch(self, seconds=100):
+        """Move the modification time of the file forward."""
+        stat = self.path.stat()
+        os.utime(self.path, ns=(stat.st_atime_ns,
+                                stat.st_mtime_ns + seconds * 10**9))
+
+    def test_hash_reused(self):
+        """Files are only hashed again if their size or mtime changed."""
+        previous = manifest.file_fingerprint(self.path)
+        # A stale hash is trusted as long as the file looks the same.
+        previous["sha256"] = "not a hash"
+        self.assertEqual(
+            "not a hash",
+            manifest.file_fingerprint(self.path, previous)["sha256"])
+        self._touch()
+        self.assertEqual(
+            manifest._sha256(self.path),
+            manifest.file_fingerprint(self.path, previous)["sha256"])
+
+    def test_unchanged(self):
+        """Touching a file doesn't change it, but rewriting its contents does."""
+        previous = {"code": "1.0", "settings": {},
+                    "sources": {"a": manifest.file_fingerprint(self.path)}}
+        self.assertFalse(manifest.is_unchanged(None, previous))
+        self.assertTrue(manifest.is_unchanged(previous, previous))
+
+        self._touch()
+        touched = dict(previous, sources={
+            "a": manifest.file_fingerprint(self.path, previous["sources"]["a"])
+        })
+        self.assertNotEqual(previous, touched)
+        self.assertTrue(manifest.is_unchanged(previous, touched))
+
+        self.path.write_bytes(b"corrected hourly emissions")
+        rewritten = dict(previous, sources={
+            "a": manifest.file_fingerprint(self.path, previous["sources"]["a"])
+        })
+        self.assertFalse(manifest.is_unchanged(previous, rewritten))
+        self.assertFalse(manifest.is_unchanged(
+            previous, dict(previous, code="1.1")))
+        self.assertFalse(manifest.is_unchanged(
+            previous, dict(previous, settings={"epacems_rollups": ["daily"]})))
+
+    def test_code_fingerprint(self):
+        """The code fingerprint depends on which modules are hashed."""
+        self.assertEqual(manifest.code_fingerprint(),
+                         manifest.code_fingerprint())
+        self.assertNotEqual(
+            manifest.code_fingerprint(),
+            manifest.code_fingerprint(modules=("pudl.constants",)))
+        # The partition pipeline is put together in pudl.etl.
+        self.assertIn("pudl.etl", manifest.EPACEMS_CODE_MODULES)
+
+
+class TestManifest(unittest.TestCase):
+    """Test reading and writing the EPA CEMS manifest of a datapackage."""
+
+    def setUp(self):
+        """Create an empty datapackage directory."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.datapkg_dir = pathlib.Path(self.tmpdir.name)
+
+    def tearDown(self):
+        """Remove the temporary files."""
+        self.tmpdir.cleanup()
+
+    def test_roundtrip(self):
+        """The manifest is saved and loaded, and is empty if unreadable."""
+        self.assertDictEqual({}, manifest.load_manifest(self.datapkg_dir))
+        entries = {"hourly_emissions_epacems_2018_co": {"code": "1.0"}}
+        manifest.save_manifest(entries, self.datapkg_dir)
+        self.assertDictEqual(
+            entries, manifest.load_manifest(self.datapkg_dir))
+        self.assertListEqual(
+            [manifest.EPACEMS_MANIFEST],
+            [path.name for path in self.datapkg_dir.iterdir()])
+
+        pathlib.Path(self.datapkg_dir, manifest.EPACEMS_MANIFEST).write_text(
+            json.dumps(entries)[:-3])
+        self.assertDictEqual({}, manifest.load_manifest(self.datapkg_dir))
+
+    def test_epacems_outputs(self):
+        """CSV and Parquet outputs are found for all of the CEMS tables."""
+        outputs = {
+            "hourly_emissions_epacems_2018_co": "csv",
+            "daily_emissions_epacems_2018_co": "csv",
+            "hourly_emissions_epacems_2019_id": "parquet",
+            "annual_emissions_epacems_2019_id": "parquet",
+        }
+        paths = {
+            manifest.epacems_output_path(
+                self.datapkg_dir, resource_name, output_format): resource_name
+            for resource_name, output_format in outputs.items()
+        }
+        for path in paths:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.touch()
+        pathlib.Path(self.datapkg_dir, "data", "plants_entity_eia.csv").touch()
+        self.assertDictEqual(
+            paths, manifest.epacems_outputs(self.datapkg_dir))
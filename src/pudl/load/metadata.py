@@ -151,8 +151,9 @@ def get_unpartitioned_tables(resources, datapkg_settings):
             for table in partitions.keys():
                 if table in resource:
                     tables_unpartitioned.add(table)
-                else:
-                    tables_unpartitioned.add(resource)
+                    break
+            else:
+                tables_unpartitioned.add(resource)
 
     return tables_unpartitioned
 
@@ -294,8 +295,9 @@ def pull_resource_from_megadata(resource_name):
     # bc we partition the CEMS output, the CEMS table name includes the state,
     # year or other partition.. therefor we need to assume for the sake of
     # grabing metadata that any table name that includes the table name is cems
-    if "hourly_emissions_epacems" in resource_name:
-        table_name_mega = "hourly_emissions_epacems"
+    if "_emissions_epacems" in resource_name:
+        table_name_mega = pudl.load.parquet.epacems_resource_table(
+            resource_name)
     else:
         table_name_mega = resource_name
     table_resource = [
@@ -340,8 +342,9 @@ def spatial_coverage(resource_name):
         # More generally... ISO 3166-1 3-letter country code:
         "iso_3166-1_alpha-3": "USA",
     }
-    if "hourly_emissions_epacems" in resource_name:
-        us_state = resource_name.split("_")[4].upper()
+    if "_emissions_epacems" in resource_name:
+        _, us_state = pudl.load.parquet.epacems_resource_partition(
+            resource_name)
         coverage["state"] = us_state
         # ISO3166-2:US code for the relevant state or outlying area:
         coverage["iso_3166-2"] = f"US-{us_state}"
@@ -369,8 +372,8 @@ def temporal_coverage(resource_name, datapkg_settings):
     """
     start_date = None
     end_date = None
-    if "hourly_emissions_epacems" in resource_name:
-        year = resource_name.split("_")[3]
+    if "_emissions_epacems" in resource_name:
+        year, _ = pudl.load.parquet.epacems_resource_partition(resource_name)
         start_date = f"{year}-01-01"
         end_date = f"{year}-12-31"
     else:
@@ -387,6 +390,27 @@ def temporal_coverage(resource_name, datapkg_settings):
     return {"start_date": start_date, "end_date": end_date}
 
 
+def epacems_output_format(datapkg_settings):
+    """
+    Look up the file format EPA CEMS was output in from datapackage settings.
+
+    Args:
+        datapkg_settings (dict): a dictionary containing validated datapackage
+            settings, mostly read in from a PUDL ETL settings file.
+
+    Returns:
+        str: Either "csv" or "parquet". Defaults to "csv" if the datapackage
+        doesn't specify an output format for EPA CEMS.
+
+    """
+    for dataset in datapkg_settings["datasets"]:
+        try:
+            return dataset["epacems"]["epacems_output_format"]
+        except (KeyError, TypeError):
+            continue
+    return "csv"
+
+
 def get_tabular_data_resource(resource_name, datapkg_dir,
                               datapkg_settings, partitions=False):
     """
@@ -422,14 +446,27 @@ def get_tabular_data_resource(resource_name, datapkg_dir,
     # Only some datasets have meaningful temporal coverage:
     # temporal_data = ["eia860", "eia923", "ferc1", "eia861", "epacems"]
     # every time we want to generate the cems table, we want it compressed
-    if "hourly_emissions_epacems" in resource_name:
-        abs_path = pathlib.Path(datapkg_dir, "data", f"{resource_name}.csv.gz")
+    if "_emissions_epacems" in resource_name:
+        if epacems_output_format(datapkg_settings) == "parquet":
+            abs_path = pudl.load.parquet.epacems_resource_path(
+                datapkg_dir, resource_name)
+        else:
+            abs_path = pathlib.Path(
+                datapkg_dir, "data", f"{resource_name}.csv.gz")
     else:
         abs_path = pathlib.Path(datapkg_dir, "data", f"{resource_name}.csv")
 
     # pull the skeleton of the descriptor from the megadata file
     descriptor = pull_resource_from_megadata(resource_name)
-    descriptor["path"] = str(abs_path.relative_to(abs_path.parent.parent))
+    descriptor["path"] = str(abs_path.relative_to(datapkg_dir))
+    if abs_path.suffix == ".parquet":
+        # goodtables can only validate text based tabular data, so Parquet
+        # resources are described as plain data resources. They still carry
+        # the table schema from the megadata.
+        descriptor["profile"] = "data-resource"
+        descriptor["format"] = "parquet"
+        descriptor["mediatype"] = "application/octet-stream"
+        del descriptor["dialect"], descriptor["encoding"]
     descriptor["bytes"] = abs_path.stat().st_size
     descriptor["hash"] = hash_csv(abs_path)
     descriptor["created"] = (
@@ -648,7 +685,13 @@ def generate_metadata(datapkg_settings,
     datapkg_descriptor = {
         "name": datapkg_settings["name"],
         "id": str(uuid.uuid4()),
-        "profile": "tabular-data-package",
+        # Parquet resources aren't tabular data resources, so a package that
+        # contains them can only be a generic data package.
+        "profile": (
+            "tabular-data-package"
+            if all(r["profile"] == "tabular-data-resource" for r in resources)
+            else "data-package"
+        ),
         "title": datapkg_settings["title"],
         "description": datapkg_settings["description"],
         "keywords": compile_keywords(data_sources),
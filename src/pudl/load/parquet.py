@@ -0,0 +1,288 @@
+"""Functions for loading processed PUDL data tables into Apache Parquet files.
+
+Most PUDL tables are small enough that they are output as CSV files. EPA CEMS
+is much larger, with ~1 billion records, and is usually used via a Parquet
+dataset partitioned by year and state. Writing the transformed dataframes
+directly into that dataset avoids writing out gzipped CSVs, only to read them
+back in and parse all of their timestamps as text when converting them to
+Parquet with :mod:`pudl.convert.epacems_to_parquet`.
+
+Within a datapackage, the Parquet dataset lives in a directory named after the
+partitioned table inside the ``data`` directory. Each partition is written to a
+single file whose name matches the name of the tabular data resource, in a
+Hive style ``year=YYYY/state=XX`` directory tree::
+
+    data/hourly_emissions_epacems/year=2018/state=ID/hourly_emissions_epacems_2018_id.parquet
+
+Like the Parquet files written by :mod:`pudl.convert.epacems_to_parquet` the
+``year`` and ``state`` columns are stored in the directory names, rather than
+within the files themselves.
+
+"""
+
+import logging
+import os
+import pathlib
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+import pudl
+
+logger = logging.getLogger(__name__)
+
+EPACEMS_INDEX = "_epacems_index.csv"
+"""str: Name of the row group index stored at the top of a CEMS dataset.
+
+The leading underscore keeps PyArrow from treating it as part of the dataset.
+"""
+
+
+def epacems_resource_table(resource_name):
+    """
+    Get the name of the table a partitioned EPA CEMS resource belongs to.
+
+    Args:
+        resource_name (str): The name of an EPA CEMS tabular data resource,
+            with the form "TABLE_YEAR_STATE", e.g.
+            "hourly_emissions_epacems_2018_co".
+
+    Returns:
+        str: The name of the table, e.g. "hourly_emissions_epacems".
+
+    """
+    return resource_name.rsplit("_", 2)[0]
+
+
+def epacems_resource_partition(resource_name):
+    """
+    Get the year and state of a partitioned EPA CEMS resource from its name.
+
+    Args:
+        resource_name (str): The name of an EPA CEMS tabular data resource,
+            with the form "TABLE_YEAR_STATE".
+
+    Returns:
+        tuple: The year (int) and the uppercase 2-letter state code (str).
+
+    """
+    _, year, state = resource_name.rsplit("_", 2)
+    return int(year), state.upper()
+
+
+def epacems_partition_path(root_path, year, state):
+    """
+    Construct the directory which holds one EPA CEMS Parquet partition.
+
+    Args:
+        root_path (path-like): Top level directory of the Parquet dataset.
+        year (int): The year of the partition.
+        state (str): The 2-letter US state code of the partition.
+
+    Returns:
+        pathlib.Path: The directory holding the partition's Parquet file(s).
+
+    """
+    return pathlib.Path(root_path, f"year={year}", f"state={state.upper()}")
+
+
+def epacems_resource_path(datapkg_dir, resource_name):
+    """
+    Path to the Parquet file that holds an EPA CEMS resource in a datapackage.
+
+    Args:
+        datapkg_dir (path-like): Path to the top level datapackage directory.
+        resource_name (str): The name of an EPA CEMS tabular data resource,
+            with the form "TABLE_YEAR_STATE". Each table is its own dataset.
+
+    Returns:
+        pathlib.Path: The path to the resource's Parquet file.
+
+    """
+    year, state = epacems_resource_partition(resource_name)
+    root_path = pathlib.Path(
+        datapkg_dir, "data", epacems_resource_table(resource_name))
+    return (
+        epacems_partition_path(root_path, year, state)
+        / f"{resource_name}.parquet"
+    )
+
+
+def epacems_df_to_table(df, year):
+    """
+    Convert a transformed EPA CEMS dataframe into an Arrow table.
+
+    The data types are harmonized with the ones used when converting the CEMS
+    CSV outputs to Parquet, so the resulting Parquet datasets are identical.
+    States and measurement codes which aren't among the fixed categories of
+    the Parquet schema become null, and a warning is logged.
+
+    Args:
+        df (pandas.DataFrame): A transformed EPA CEMS dataframe.
+        year (int): The year of data the dataframe contains. It is added as a
+            column, since CEMS data are partitioned by the year in local plant
+            time, which doesn't always match operating_datetime_utc.
+
+    Returns:
+        pyarrow.Table: The same data, with the EPA CEMS Arrow schema.
+
+    """
+    in_dtypes = pudl.convert.epacems_to_parquet.create_in_dtypes()
+    for col, dtype in in_dtypes.items():
+        if isinstance(dtype, pd.CategoricalDtype) and col in df.columns:
+            unknown = df[col].notna() & ~df[col].isin(dtype.categories)
+            if unknown.any():
+                logger.warning(
+                    f"Unknown {col} values will be null: "
+                    f"{sorted(df.loc[unknown, col].astype(str).unique())}")
+    df = df.astype({col: in_dtypes[col] for col in df.columns
+                    if col in in_dtypes})
+    # The transformed timestamps are naive, but are stored as UTC in Parquet.
+    # Localizing them keeps the pandas metadata consistent with the schema.
+    if df["operating_datetime_utc"].dt.tz is None:
+        df["operating_datetime_utc"] = (
+            df["operating_datetime_utc"].dt.tz_localize("UTC"))
+    schema = pudl.convert.epacems_to_parquet.create_cems_schema()
+    # The columns need to be in the same order as the schema, or else the
+    # pandas metadata stored with the Arrow table will not match its columns.
+    return pa.Table.from_pandas(
+        df.assign(year=year).reindex(columns=schema.names),
+        schema=schema,
+        preserve_index=False,
+    )
+
+
+def dump_epacems(epacems_transformed_dfs, data_source, datapkg_dir,
+                 compression="snappy"):
+    """
+    Write transformed EPA CEMS dataframes into the datapackage's Parquet files.
+
+    This is the Parquet analog of :func:`pudl.load.csv.dict_dump`, but it
+    consumes the whole stream of transformed EPA CEMS dataframes. Each resource
+    is written to its own Parquet file within the partition of the dataset
+    that corresponds to its name. See :func:`epacems_resource_path`. If the
+    data is being streamed in chunks, consecutive dataframes which belong to
+    the same resource are appended to the same file as separate row groups.
+
+    The ``year`` and ``state`` columns are not stored in the files, since they
+    are encoded in the paths of the partitions. Daily, monthly and annual
+    totals (see :func:`pudl.transform.epacems.rollup`) are written to their
+    own datasets alongside the hourly one.
+
+    Args:
+        epacems_transformed_dfs (iterable): A generator of single-item
+            dictionaries, with EPA CEMS resource names as the keys and
+            transformed DataFrames as the values.
+        data_source (str): The name of the data source we are working with.
+        datapkg_dir (path-like): Path to the top level directory for the
+            datapackage these Parquet files are part of.
+        compression (str): Compression algorithm to use for the Parquet files.
+
+    Returns:
+        list: The names of the resources which were written, in order.
+
+    """
+    resource_names = []
+    writer = None
+    try:
+        for transformed_df_dict in epacems_transformed_dfs:
+            for resource_name, df in transformed_df_dict.items():
+                logger.info(
+                    f"Loading {data_source} {resource_name} dataframe into "
+                    f"Parquet")
+                year, _ = epacems_resource_partition(resource_name)
+                if (epacems_resource_table(resource_name)
+                        == "hourly_emissions_epacems"):
+                    # Like the converted CSVs, the files don't store any
+                    # pandas metadata, so they're read back the same way.
+                    table = (
+                        epacems_df_to_table(df, year=year)
+                        .drop(["year", "state"])
+                        .replace_schema_metadata()
+                    )
+                else:
+                    table = pa.Table.from_pandas(
+                        df.drop(columns="state"), preserve_index=False)
+                if not resource_names or resource_name != resource_names[-1]:
+                    if writer is not None:
+                        writer.close()
+                    path = epacems_resource_path(datapkg_dir, resource_name)
+                    path.parent.mkdir(parents=True, exist_ok=True)
+                    writer = pq.ParquetWriter(
+                        str(path), table.schema, compression=compression)
+                    resource_names.append(resource_name)
+                writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
+    return resource_names
+
+
+def epacems_row_group_index(root_path):
+    """
+    Index the row groups of a year and state partitioned EPA CEMS dataset.
+
+    For each row group of each Parquet file, the range of plant IDs and times
+    it contains is taken from the statistics in the file's footer. If the
+    records are sorted by plant, each plant falls within only one or two row
+    groups, and lookups can go directly to them without having to open every
+    file in the dataset.
+
+    Args:
+        root_path (path-like): Top level directory of the Parquet dataset.
+
+    Returns:
+        pandas.DataFrame: One record per row group, with the columns path
+        (relative to root_path), year, state, row_group, num_rows,
+        plant_id_eia_min, plant_id_eia_max, operating_datetime_utc_min and
+        operating_datetime_utc_max.
+
+    """
+    stats_cols = ["plant_id_eia", "operating_datetime_utc"]
+    records = []
+    for path in sorted(pathlib.Path(root_path).glob("year=*/state=*/*.parquet")):
+        metadata = pq.ParquetFile(str(path)).metadata
+        partition = dict(part.split("=") for part in path.parent.parts[-2:])
+        for i in range(metadata.num_row_groups):
+            row_group = metadata.row_group(i)
+            record = {
+                "path": os.path.relpath(path, root_path),
+                "year": int(partition["year"]),
+                "state": partition["state"],
+                "row_group": i,
+                "num_rows": row_group.num_rows,
+            }
+            for j in range(row_group.num_columns):
+                column = row_group.column(j)
+                if column.path_in_schema in stats_cols:
+                    stats = column.statistics
+                    has_stats = stats is not None and stats.has_min_max
+                    record[f"{column.path_in_schema}_min"] = (
+                        stats.min if has_stats else None)
+                    record[f"{column.path_in_schema}_max"] = (
+                        stats.max if has_stats else None)
+            records.append(record)
+    return pd.DataFrame(records, columns=[
+        "path", "year", "state", "row_group", "num_rows",
+        "plant_id_eia_min", "plant_id_eia_max",
+        "operating_datetime_utc_min", "operating_datetime_utc_max",
+    ])
+
+
+def write_epacems_index(root_path):
+    """
+    Write the row group index of an EPA CEMS dataset into its top directory.
+
+    See :func:`epacems_row_group_index`.
+
+    Args:
+        root_path (path-like): Top level directory of the Parquet dataset.
+
+    Returns:
+        pathlib.Path: The path to the index.
+
+    """
+    index_path = pathlib.Path(root_path, EPACEMS_INDEX)
+    epacems_row_group_index(root_path).to_csv(index_path, index=False)
+    return index_path
@@ -0,0 +1,167 @@
+"""Unit tests for pudl.load.parquet module."""
+import pathlib
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+
+import pudl.convert.epacems_to_parquet as epacems_to_parquet
+import pudl.load.csv
+import pudl.load.parquet
+import pudl.transform.epacems
+
+
+def _transformed_cems(state, start, periods=4):
+    """Make some hourly CEMS records, like those output by the transform."""
+    return pd.DataFrame({
+        "state": pd.Categorical([state] * periods),
+        "plant_id_eia": np.array([3, 470] * (periods // 2), dtype="int32"),
+        "unitid": pd.Categorical(["1", "CT2"] * (periods // 2)),
+        "operating_datetime_utc": pd.date_range(
+            start, periods=periods, freq="H"),
+        "operating_time_hours": np.array(
+            [1.0, 0.5] * (periods // 2), dtype="float32"),
+        "gross_load_mw": np.linspace(0, 100, periods),
+        "steam_load_1000_lbs": np.nan,
+        "so2_mass_lbs": np.nan,
+        "so2_mass_measurement_code": pd.Categorical(
+            [None, "Measured"] * (periods // 2)),
+        "nox_rate_lbs_mmbtu": 0.1,
+        "nox_rate_measurement_code": pd.Categorical(
+            ["Calculated"] * periods),
+        "nox_mass_lbs": np.linspace(1, 10, periods),
+        "nox_mass_measurement_code": pd.Categorical(["Measured"] * periods),
+        "co2_mass_tons": np.linspace(5, 6, periods),
+        "co2_mass_measurement_code": pd.Categorical(["Measured"] * periods),
+        "heat_content_mmbtu": np.linspace(100, 200, periods),
+        "facility_id": pd.array([1, None] * (periods // 2), dtype="Int32"),
+        "unit_id_epa": pd.array([10, 20] * (periods // 2), dtype="Int32"),
+    })
+
+
+class TestDumpEpacems(unittest.TestCase):
+    """Test writing a stream of transformed CEMS data into Parquet files."""
+
+    def setUp(self):
+        """Make a stream with two chunks of Colorado and one of Idaho."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.datapkg_dir = pathlib.Path(self.tmpdir.name, "datapkg")
+        self.dfs = [
+            {"hourly_emissions_epacems_2018_co": _transformed_cems(
+                "CO", "2018-01-01 07:00")},
+            {"hourly_emissions_epacems_2018_co": _transformed_cems(
+                "CO", "2018-01-01 11:00")},
+            {"hourly_emissions_epacems_2018_id": _transformed_cems(
+                "ID", "2018-01-01 07:00", periods=2)},
+        ]
+
+    def tearDown(self):
+        """Remove the temporary files."""
+        self.tmpdir.cleanup()
+
+    def test_partitions(self):
+        """Chunks are appended to their resource's file as row groups."""
+        resource_names = pudl.load.parquet.dump_epacems(
+            iter(self.dfs), "EPA CEMS", self.datapkg_dir)
+        self.assertListEqual(
+            ["hourly_emissions_epacems_2018_co",
+             "hourly_emissions_epacems_2018_id"],
+            resource_names)
+        root_path = pathlib.Path(
+            self.datapkg_dir, "data", "hourly_emissions_epacems")
+        self.assertListEqual(
+            [pudl.load.parquet.epacems_resource_path(self.datapkg_dir, name)
+             for name in resource_names],
+            sorted(root_path.glob("year=*/state=*/*.parquet")))
+
+        for name, row_groups in zip(resource_names, [[4, 4], [2]]):
+            parquet_file = pq.ParquetFile(str(
+                pudl.load.parquet.epacems_resource_path(
+                    self.datapkg_dir, name)))
+            self.assertListEqual(
+                row_groups,
+                [parquet_file.metadata.row_group(i).num_rows
+                 for i in range(parquet_file.metadata.num_row_groups)])
+            self.assertNotIn("year", parquet_file.schema_arrow.names)
+            self.assertNotIn("state", parquet_file.schema_arrow.names)
+
+        df = pq.read_table(str(
+            pudl.load.parquet.epacems_resource_path(
+                self.datapkg_dir, resource_names[0]))).to_pandas()
+        pd.testing.assert_series_equal(
+            pd.Series(pd.date_range("2018-01-01 07:00", periods=8, freq="H",
+                                    tz="UTC"), name="operating_datetime_utc"),
+            df.operating_datetime_utc.dt.tz_convert("UTC"),
+            check_dtype=False)
+        self.assertListEqual(
+            [None, "Measured"] * 4,
+            df.so2_mass_measurement_code.astype(object)
+            .where(df.so2_mass_measurement_code.notna(), None).tolist())
+
+    def test_same_schema_as_converted_csv(self):
+        """The dataset is the same as converting the CSV outputs to Parquet."""
+        pudl.load.parquet.dump_epacems(
+            iter(self.dfs), "EPA CEMS", self.datapkg_dir)
+        csv_dir = pathlib.Path(self.tmpdir.name, "csv")
+        pathlib.Path(csv_dir, "data").mkdir(parents=True)
+        for state in ["co", "id"]:
+            name = f"hourly_emissions_epacems_2018_{state}"
+            pudl.load.csv.csv_dump(
+                pd.concat([d[name] for d in self.dfs if name in d]),
+                name, keep_index=False, datapkg_dir=csv_dir)
+        converted_dir = pathlib.Path(self.tmpdir.name, "converted")
+        for state in ["CO", "ID"]:
+            epacems_to_parquet._convert_partition(
+                2018, state, data_dir=pathlib.Path(csv_dir, "data"),
+                out_dir=converted_dir, partition_cols=("year", "state"))
+
+        for state in ["co", "id"]:
+            name = f"hourly_emissions_epacems_2018_{state}"
+            path = pudl.load.parquet.epacems_resource_path(
+                self.datapkg_dir, name)
+            converted_path = pathlib.Path(
+                converted_dir, *path.parts[-3:])
+            self.assertTrue(pq.read_schema(str(path)).equals(
+                pq.read_schema(str(converted_path)), check_metadata=True))
+        pd.testing.assert_frame_equal(
+            pq.read_table(str(converted_dir)).to_pandas(),
+            pq.read_table(str(pathlib.Path(
+                self.datapkg_dir, "data", "hourly_emissions_epacems")))
+            .to_pandas())
+
+    def test_rollups(self):
+        """Totals are written to their own datasets with consistent schemas."""
+        plant_utc_offset = pd.DataFrame({
+            "plant_id_eia": pd.array([3, 470], dtype="Int64"),
+            "utc_offset": pd.to_timedelta([-7, -7], unit="h"),
+        })
+        resource_names = pudl.load.parquet.dump_epacems(
+            pudl.transform.epacems.rollup(
+                iter(self.dfs), ["daily", "annual"], plant_utc_offset),
+            "EPA CEMS", self.datapkg_dir)
+        self.assertListEqual(
+            ["hourly_emissions_epacems_2018_co",
+             "daily_emissions_epacems_2018_co",
+             "annual_emissions_epacems_2018_co",
+             "hourly_emissions_epacems_2018_id",
+             "daily_emissions_epacems_2018_id",
+             "annual_emissions_epacems_2018_id"],
+            resource_names)
+        for table in ["daily_emissions_epacems", "annual_emissions_epacems"]:
+            schemas = [
+                pq.read_schema(str(pudl.load.parquet.epacems_resource_path(
+                    self.datapkg_dir, f"{table}_2018_{state}")))
+                .remove_metadata()
+                for state in ["co", "id"]
+            ]
+            self.assertTrue(schemas[0].equals(schemas[1]), table)
+            self.assertNotIn("state", schemas[0].names)
+            df = pq.ParquetDataset(str(pathlib.Path(
+                self.datapkg_dir, "data", table))).read().to_pandas()
+            self.assertEqual(4, len(df))
+            self.assertAlmostEqual(
+                sum(df_dict[name].nox_mass_lbs.sum()
+                    for df_dict in self.dfs for name in df_dict),
+                df.nox_mass_lbs.sum())
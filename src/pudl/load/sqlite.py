@@ -0,0 +1,221 @@
+"""Functions for bulk loading data into the FERC Form 1 and PUDL SQLite DBs.
+
+Both of the SQLite databases are usually built from scratch in one go, so
+there's no need to protect them from being left half-written by a crash. They
+can simply be rebuilt. Inserting records through SQLAlchemy's generic path, which both
+:mod:`pandas` and :mod:`tableschema` use, passes each of them through several
+layers of abstraction, writes everything to SQLite's rollback journal as well
+as the database, waits for it to be synced to disk, and updates any indexes as
+each record is inserted.
+
+Instead, :func:`bulk_load` turns off SQLite's rollback journal and disk syncs,
+and drops the indexes in the database. Within it, :func:`insert_df` and
+:func:`insert_rows` insert records using the DBAPI's ``executemany``, all
+within a single transaction. When the load is done the indexes are recreated,
+and ``ANALYZE`` gathers statistics about them for the query planner.
+
+The FERC Form 1 database can also be updated incrementally with new years of
+data. Then :func:`bulk_load` keeps the rollback journal and the indexes, so
+that a failed update leaves the database as it was, and only the new records
+have to be indexed.
+
+"""
+
+import contextlib
+import itertools
+import logging
+
+import pandas as pd
+from sqlalchemy.dialects import sqlite
+
+logger = logging.getLogger(__name__)
+
+_DIALECT = sqlite.dialect()
+
+
+@contextlib.contextmanager
+def bulk_load(engine, incremental=False):
+    """
+    Bulk load records into an SQLite database.
+
+    Args:
+        engine (sqlalchemy.engine.Engine): An engine connected to the SQLite
+            database being loaded. The tables must already have been created.
+        incremental (bool): Whether records are being added to a database
+            which already contains data. If so, the rollback journal, disk
+            syncs and indexes are left alone, and the whole load is rolled
+            back if it fails.
+
+    Yields:
+        sqlite3.Connection: A DBAPI connection to the database, to be used with
+        :func:`insert_df` and :func:`insert_rows`. Nothing else should write to
+        the database until the load is done.
+
+    """
+    raw_conn = engine.raw_connection()
+    try:
+        cursor = raw_conn.cursor()
+        if incremental:
+            yield raw_conn
+            raw_conn.commit()
+            cursor.execute("ANALYZE")
+            raw_conn.commit()
+            return
+        # These settings only apply to this connection.
+        journal_mode = cursor.execute("PRAGMA journal_mode").fetchone()[0]
+        synchronous = cursor.execute("PRAGMA synchronous").fetchone()[0]
+        cursor.execute("PRAGMA journal_mode=OFF")
+        cursor.execute("PRAGMA synchronous=OFF")
+        indexes = cursor.execute(
+            "SELECT name, sql FROM sqlite_master "
+            "WHERE type = 'index' AND sql IS NOT NULL"
+        ).fetchall()
+        for name, _ in indexes:
+            cursor.execute(
+                f"DROP INDEX {_DIALECT.identifier_preparer.quote(name)}")
+        yield raw_conn
+        if indexes:
+            logger.info(f"SQLite: recreating {len(indexes)} indexes.")
+        for _, sql in indexes:
+            cursor.execute(sql)
+        raw_conn.commit()
+        cursor.execute("ANALYZE")
+        raw_conn.commit()
+        cursor.execute(f"PRAGMA journal_mode={journal_mode}")
+        cursor.execute(f"PRAGMA synchronous={synchronous}")
+    except BaseException:
+        raw_conn.rollback()
+        raise
+    finally:
+        raw_conn.close()
+
+
+def _insert_statement(table, columns):
+    """Construct the SQL to insert a record into some of a table's columns."""
+    quote = _DIALECT.identifier_preparer.quote
+    return (
+        f"INSERT INTO {quote(table.name)} "
+        f"({', '.join(quote(col) for col in columns)}) "
+        f"VALUES ({', '.join('?' * len(columns))})"
+    )
+
+
+def _bind_processors(table, columns):
+    """Get the functions SQLAlchemy uses to convert values for each column."""
+    return [
+        table.c[col].type.dialect_impl(_DIALECT).bind_processor(_DIALECT)
+        for col in columns
+    ]
+
+
+def insert_rows(conn, table, rows, columns=None, chunksize=100_000):
+    """
+    Insert records into a table within :func:`bulk_load`.
+
+    The values are converted the same way SQLAlchemy would convert them for
+    the types of the table's columns, e.g. dates are formatted as strings.
+
+    Args:
+        conn (sqlite3.Connection): The connection yielded by
+            :func:`bulk_load`.
+        table (sqlalchemy.Table): The table to insert the records into.
+        rows (iterable): The records to insert, as sequences of values.
+        columns (list): The names of the columns the values in each record
+            correspond to. If None, all the columns of the table, in order.
+        chunksize (int): The number of records to insert at a time.
+
+    Returns:
+        int: The number of records inserted.
+
+    """
+    if columns is None:
+        columns = [col.name for col in table.columns]
+    sql = _insert_statement(table, columns)
+    processors = _bind_processors(table, columns)
+    if any(processors):
+        rows = (
+            [value if proc is None else proc(value)
+             for proc, value in zip(processors, row)]
+            for row in rows
+        )
+    cursor = conn.cursor()
+    n_recs = 0
+    rows = iter(rows)
+    while True:
+        chunk = list(itertools.islice(rows, chunksize))
+        if not chunk:
+            break
+        cursor.executemany(sql, chunk)
+        n_recs += len(chunk)
+    return n_recs
+
+
+def delete_rows(conn, table, column=None, values=()):
+    """
+    Delete records from a table within :func:`bulk_load`.
+
+    Args:
+        conn (sqlite3.Connection): The connection yielded by
+            :func:`bulk_load`.
+        table (sqlalchemy.Table): The table to delete the records from.
+        column (str): The name of the column used to select the records. If
+            None, all of the records in the table are deleted.
+        values (iterable): The records whose value in the column is one of
+            these are deleted.
+
+    Returns:
+        int: The number of records deleted.
+
+    """
+    quote = _DIALECT.identifier_preparer.quote
+    sql = f"DELETE FROM {quote(table.name)}"
+    params = ()
+    if column is not None:
+        proc = _bind_processors(table, [column])[0]
+        params = [value if proc is None else proc(value) for value in values]
+        if not params:
+            return 0
+        sql += (f" WHERE {quote(column)} IN "
+                f"({', '.join('?' * len(params))})")
+    return conn.cursor().execute(sql, params).rowcount
+
+
+def insert_df(conn, table, df, chunksize=100_000):
+    """
+    Insert the records in a dataframe into a table within :func:`bulk_load`.
+
+    Like :meth:`pandas.DataFrame.to_sql`, missing values are stored as NULL,
+    and the dataframe's index is not stored.
+
+    Args:
+        conn (sqlite3.Connection): The connection yielded by
+            :func:`bulk_load`.
+        table (sqlalchemy.Table): The table to insert the records into. It
+            must have all of the dataframe's columns.
+        df (pandas.DataFrame): The records to insert.
+        chunksize (int): The number of records to insert at a time.
+
+    Returns:
+        int: The number of records inserted.
+
+    """
+    columns = list(df.columns)
+    processors = _bind_processors(table, columns)
+    values = []
+    for (col, series), proc in zip(df.items(), processors):
+        if pd.api.types.is_datetime64_any_dtype(series):
+            col_values = series.dt.to_pydatetime().astype(object)
+        else:
+            col_values = series.to_numpy(dtype=object, copy=True)
+        col_values[series.isna().to_numpy()] = None
+        if proc is not None:
+            col_values = [proc(value) for value in col_values]
+        else:
+            col_values = col_values.tolist()
+        values.append(col_values)
+    sql = _insert_statement(table, columns)
+    cursor = conn.cursor()
+    for start in range(0, len(df), chunksize):
+        cursor.executemany(
+            sql, zip(*(col[start:start + chunksize] for col in values)))
+    return len(df)
@@ -0,0 +1,77 @@
+"""Unit tests for pudl.load.sqlite module."""
+import datetime
+import unittest
+
+import numpy as np
+import pandas as pd
+import sqlalchemy as sa
+
+import pudl.load.sqlite
+
+
+class TestBulkLoad(unittest.TestCase):
+    """Test bulk loading records into an SQLite database."""
+
+    def setUp(self):
+        """Create an empty table with an index in an in-memory database."""
+        self.engine = sa.create_engine("sqlite://")
+        self.meta = sa.MetaData()
+        self.table = sa.Table(
+            "plants", self.meta,
+            sa.Column("plant_id", sa.Integer, primary_key=True),
+            sa.Column("plant_name", sa.String),
+            sa.Column("capacity_mw", sa.Float),
+            sa.Column("report_date", sa.Date),
+            sa.Index("ix_plant_name", "plant_name"),
+        )
+        self.meta.create_all(self.engine)
+
+    def test_insert_df_and_rows(self):
+        """Records are stored as SQLAlchemy would, and indexes are rebuilt."""
+        df = pd.DataFrame({
+            "plant_id": [1, 2],
+            "plant_name": ["Alpha", None],
+            "capacity_mw": [10.5, np.nan],
+            "report_date": [datetime.date(2018, 1, 1), None],
+        })
+        with pudl.load.sqlite.bulk_load(self.engine) as conn:
+            self.assertEqual(
+                2, pudl.load.sqlite.insert_df(conn, self.table, df))
+            self.assertEqual(1, pudl.load.sqlite.insert_rows(
+                conn, self.table, [(3, "Gamma")],
+                columns=["plant_id", "plant_name"]))
+
+        with self.engine.connect() as conn:
+            self.assertListEqual(
+                [(1, "Alpha", 10.5, datetime.date(2018, 1, 1)),
+                 (2, None, None, None),
+                 (3, "Gamma", None, None)],
+                [tuple(row) for row in conn.execute(
+                    self.table.select().order_by(self.table.c.plant_id))])
+        self.assertIn(
+            "ix_plant_name",
+            [ix["name"] for ix in sa.inspect(self.engine).get_indexes("plants")])
+
+    def test_incremental_delete_and_rollback(self):
+        """Incremental loads can delete records, and are rolled back on error."""
+        with pudl.load.sqlite.bulk_load(self.engine) as conn:
+            pudl.load.sqlite.insert_rows(
+                conn, self.table, [(1, "Alpha"), (2, "Beta"), (3, "Gamma")],
+                columns=["plant_id", "plant_name"])
+
+        with pudl.load.sqlite.bulk_load(self.engine, incremental=True) as conn:
+            self.assertEqual(2, pudl.load.sqlite.delete_rows(
+                conn, self.table, "plant_name", ["Alpha", "Gamma", "Delta"]))
+        with self.assertRaises(RuntimeError):
+            with pudl.load.sqlite.bulk_load(
+                    self.engine, incremental=True) as conn:
+                self.assertEqual(
+                    1, pudl.load.sqlite.delete_rows(conn, self.table))
+                raise RuntimeError("Interrupted load.")
+
+        with self.engine.connect() as conn:
+            self.assertListEqual(
+                [(2, "Beta")],
+                [tuple(row) for row in conn.execute(
+                    sa.select([self.table.c.plant_id,
+                               self.table.c.plant_name]))])
@@ -0,0 +1,270 @@
+"""Functions for pulling EPA CEMS hourly data out of its Parquet dataset.
+
+EPA CEMS has ~1 billion records, so it is stored as a Parquet dataset that is
+partitioned by year and state (see :mod:`pudl.convert.epacems_to_parquet` and
+:mod:`pudl.load.parquet`) rather than in the PUDL DB. These functions select
+only the records and columns that are needed. The selection is pushed down
+into the Parquet reader, so whole partitions that can't contain any matching
+records are skipped based on their directory names, as are row groups whose
+min/max statistics rule them out. Only the remaining row groups are read.
+
+If the dataset has a row group index (see
+:func:`pudl.load.parquet.epacems_row_group_index`), lookups of particular
+plants or times go straight to the row groups that the index says contain
+them, without opening the footers of all the other files. This is most
+effective if the dataset was written with the records sorted by plant.
+
+"""
+
+import os
+import pathlib
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+
+import pudl
+
+
+def epacems_dataset(epacems_path):
+    """
+    Open the EPA CEMS Parquet dataset without reading any of its data.
+
+    Args:
+        epacems_path (path-like): Top level directory of the Parquet dataset,
+            which contains the ``year=YYYY/state=XX`` partitions, e.g. the
+            ``epacems`` directory in the PUDL parquet output directory.
+
+    Returns:
+        pyarrow.dataset.Dataset: The EPA CEMS dataset, including the year and
+        state partition columns.
+
+    """
+    partitioning = ds.partitioning(
+        pa.schema([("year", pa.int32()), ("state", pa.string())]),
+        flavor="hive")
+    return ds.dataset(
+        str(epacems_path), format="parquet", partitioning=partitioning)
+
+
+def _to_utc(date):
+    """Interpret a date-like object as a UTC timestamp."""
+    date = pd.Timestamp(date)
+    if date.tz is None:
+        return date.tz_localize("UTC")
+    return date.tz_convert("UTC")
+
+
+def epacems_filter(years=None, states=None, plant_ids=None, unit_ids=None,
+                   start_date=None, end_date=None):
+    """
+    Build an expression selecting EPA CEMS records.
+
+    Each of the arguments restricts the records which are selected. If an
+    argument is None, it doesn't. The partitions are labeled with the year in
+    local plant time, which is up to a day earlier than UTC, so any time range
+    is also translated into a range of years that can be used to skip entire
+    partitions.
+
+    Args:
+        years (iterable): Years of data to select.
+        states (iterable): 2-letter US state codes of the states to select.
+        plant_ids (iterable): EIA plant IDs to select.
+        unit_ids (iterable): EPA unit IDs to select, i.e. values of unitid.
+        start_date (date-like): Earliest operating_datetime_utc to select.
+            Naive dates are interpreted as UTC. Inclusive.
+        end_date (date-like): Latest operating_datetime_utc to select. Naive
+            dates are interpreted as UTC. Inclusive.
+
+    Returns:
+        pyarrow.dataset.Expression: The filter expression, or None if all
+        records are selected.
+
+    """
+    conditions = []
+    if years is not None:
+        conditions.append(ds.field("year").isin([int(y) for y in years]))
+    if states is not None:
+        conditions.append(
+            ds.field("state").isin([st.upper() for st in states]))
+    if plant_ids is not None:
+        conditions.append(
+            ds.field("plant_id_eia").isin([int(p) for p in plant_ids]))
+    if unit_ids is not None:
+        conditions.append(
+            ds.field("unitid").isin([str(u) for u in unit_ids]))
+    if start_date is not None:
+        start_date = _to_utc(start_date)
+        conditions.append(ds.field("operating_datetime_utc") >= start_date)
+        conditions.append(
+            ds.field("year") >= (start_date - pd.Timedelta(days=1)).year)
+    if end_date is not None:
+        end_date = _to_utc(end_date)
+        conditions.append(ds.field("operating_datetime_utc") <= end_date)
+        conditions.append(ds.field("year") <= end_date.year)
+
+    if not conditions:
+        return None
+    expression = conditions[0]
+    for condition in conditions[1:]:
+        expression = expression & condition
+    return expression
+
+
+def _index_row_groups(index, years=None, states=None, plant_ids=None,
+                      start_date=None, end_date=None):
+    """
+    Select the row groups in an EPA CEMS index which may contain records.
+
+    Args:
+        index (pandas.DataFrame): An EPA CEMS row group index.
+        years (iterable): Years of data to select.
+        states (iterable): 2-letter US state codes of the states to select.
+        plant_ids (iterable): EIA plant IDs to select.
+        start_date (date-like): Earliest operating_datetime_utc to select.
+        end_date (date-like): Latest operating_datetime_utc to select.
+
+    Returns:
+        dict: The indices of the selected row groups (list) in each file,
+        keyed by the file's path relative to the top of the dataset. Files
+        without any selected row groups are included, with an empty list.
+
+    """
+    keep = np.ones(len(index), dtype=bool)
+    if years is not None:
+        keep &= index.year.isin([int(y) for y in years]).to_numpy()
+    if states is not None:
+        keep &= index.state.isin([st.upper() for st in states]).to_numpy()
+    if plant_ids is not None:
+        # Find each row group's plant ID range in the sorted list of IDs:
+        plant_ids = np.unique(np.asarray(plant_ids, dtype="int64"))
+        first = np.searchsorted(
+            plant_ids, index.plant_id_eia_min.to_numpy(), side="left")
+        last = np.searchsorted(
+            plant_ids, index.plant_id_eia_max.to_numpy(), side="right")
+        keep &= (last > first) | index.plant_id_eia_min.isna().to_numpy()
+    if start_date is not None:
+        keep &= ~(index.operating_datetime_utc_max < _to_utc(start_date))
+    if end_date is not None:
+        keep &= ~(index.operating_datetime_utc_min > _to_utc(end_date))
+    row_groups = {path: [] for path in index.path.unique()}
+    for path, row_group in index.loc[keep, ["path", "row_group"]].itertuples(
+            index=False):
+        row_groups[path].append(row_group)
+    return row_groups
+
+
+def _scan_dataset(epacems_path, expression, years=None, states=None,
+                  plant_ids=None, start_date=None, end_date=None):
+    """
+    Find the parts of the EPA CEMS dataset that need to be read.
+
+    Without a row group index, this is the whole dataset. Otherwise it is a
+    dataset containing only the row groups which the index shows may contain
+    the requested plants and times. Files missing from the index are included
+    whole, so an outdated index can't cause records to be left out.
+
+    Args:
+        epacems_path (path-like): Top level directory of the Parquet dataset.
+        expression (pyarrow.dataset.Expression): The filter that the records
+            will be selected with.
+        years (iterable): Years of data to select.
+        states (iterable): 2-letter US state codes of the states to select.
+        plant_ids (iterable): EIA plant IDs to select.
+        start_date (date-like): Earliest operating_datetime_utc to select.
+        end_date (date-like): Latest operating_datetime_utc to select.
+
+    Returns:
+        pyarrow.dataset.Dataset: The parts of the dataset to scan.
+
+    """
+    dataset = epacems_dataset(epacems_path)
+    index_path = pathlib.Path(epacems_path, pudl.load.parquet.EPACEMS_INDEX)
+    if ((plant_ids is None and start_date is None and end_date is None)
+            or not index_path.exists()):
+        return dataset
+    index = pd.read_csv(
+        index_path,
+        parse_dates=["operating_datetime_utc_min",
+                     "operating_datetime_utc_max"])
+    row_groups = _index_row_groups(
+        index, years=years, states=states, plant_ids=plant_ids,
+        start_date=start_date, end_date=end_date)
+    fragments = []
+    get_fragments_args = {} if expression is None else {"filter": expression}
+    for fragment in dataset.get_fragments(**get_fragments_args):
+        path = os.path.relpath(fragment.path, str(epacems_path))
+        if path not in row_groups:
+            fragments.append(fragment)
+        elif row_groups[path]:
+            fragments.append(fragment.format.make_fragment(
+                fragment.path, dataset.filesystem,
+                fragment.partition_expression, row_groups=row_groups[path]))
+    return ds.FileSystemDataset(
+        fragments, dataset.schema, dataset.format, dataset.filesystem)
+
+
+def epacems_batches(epacems_path, columns=None, years=None, states=None,
+                    plant_ids=None, unit_ids=None, start_date=None,
+                    end_date=None):
+    """
+    Lazily read selected EPA CEMS records, one record batch at a time.
+
+    This allows more data to be processed than fits in memory. See
+    :func:`epacems_filter` for how the records are selected.
+
+    Args:
+        epacems_path (path-like): Top level directory of the Parquet dataset.
+        columns (list): Names of the columns to read. Defaults to all of them,
+            including the year and state.
+        years (iterable): Years of data to select.
+        states (iterable): 2-letter US state codes of the states to select.
+        plant_ids (iterable): EIA plant IDs to select.
+        unit_ids (iterable): EPA unit IDs to select, i.e. values of unitid.
+        start_date (date-like): Earliest operating_datetime_utc to select.
+        end_date (date-like): Latest operating_datetime_utc to select.
+
+    Returns:
+        iterator: Of :class:`pyarrow.RecordBatch` objects containing the
+        selected records. No data is read until it is iterated over.
+
+    """
+    expression = epacems_filter(
+        years=years, states=states, plant_ids=plant_ids,
+        unit_ids=unit_ids, start_date=start_date, end_date=end_date)
+    dataset = _scan_dataset(
+        epacems_path, expression, years=years, states=states,
+        plant_ids=plant_ids, start_date=start_date, end_date=end_date)
+    return dataset.to_batches(columns=columns, filter=expression)
+
+
+def epacems(epacems_path, columns=None, years=None, states=None,
+            plant_ids=None, unit_ids=None, start_date=None, end_date=None):
+    """
+    Read selected EPA CEMS records into a dataframe.
+
+    See :func:`epacems_filter` for how the records are selected.
+
+    Args:
+        epacems_path (path-like): Top level directory of the Parquet dataset.
+        columns (list): Names of the columns to read. Defaults to all of them,
+            including the year and state.
+        years (iterable): Years of data to select.
+        states (iterable): 2-letter US state codes of the states to select.
+        plant_ids (iterable): EIA plant IDs to select.
+        unit_ids (iterable): EPA unit IDs to select, i.e. values of unitid.
+        start_date (date-like): Earliest operating_datetime_utc to select.
+        end_date (date-like): Latest operating_datetime_utc to select.
+
+    Returns:
+        pandas.DataFrame: The selected EPA CEMS records.
+
+    """
+    expression = epacems_filter(
+        years=years, states=states, plant_ids=plant_ids,
+        unit_ids=unit_ids, start_date=start_date, end_date=end_date)
+    dataset = _scan_dataset(
+        epacems_path, expression, years=years, states=states,
+        plant_ids=plant_ids, start_date=start_date, end_date=end_date)
+    return dataset.to_table(columns=columns, filter=expression).to_pandas()
@@ -0,0 +1,138 @@
+"""Unit tests for pudl.output.epacems module."""
+import pathlib
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+import pudl.load.parquet
+import pudl.output.epacems as epacems
+
+
+def _write_partition(root_path, year, state, df, row_group_size=2):
+    """Write CEMS records into a partition, in row groups of a given size."""
+    path = pudl.load.parquet.epacems_partition_path(root_path, year, state)
+    path.mkdir(parents=True)
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    with pq.ParquetWriter(
+            str(path / f"hourly_emissions_epacems_{year}_{state.lower()}.parquet"),
+            table.schema) as writer:
+        for start in range(0, len(df), row_group_size):
+            writer.write_table(table.slice(start, row_group_size))
+
+
+def _cems(plant_ids, times):
+    """Make CEMS records for some plants at some UTC times."""
+    return pd.DataFrame({
+        "plant_id_eia": np.array(plant_ids, dtype="int32"),
+        "unitid": [f"U{plant_id}" for plant_id in plant_ids],
+        "operating_datetime_utc": pd.to_datetime(times, utc=True),
+        "gross_load_mw": np.arange(len(plant_ids), dtype="float32"),
+    })
+
+
+class TestEpacemsOutput(unittest.TestCase):
+    """Test reading selected records from the EPA CEMS Parquet dataset."""
+
+    def setUp(self):
+        """Write a small year and state partitioned CEMS dataset."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.root_path = pathlib.Path(self.tmpdir.name, "epacems")
+        # The last hours of 2018 in local time are in 2019 in UTC.
+        _write_partition(self.root_path, 2018, "CO", _cems(
+            [3, 3, 470, 470],
+            ["2018-06-01 00:00", "2019-01-01 06:00",
+             "2018-06-01 00:00", "2019-01-01 06:00"]))
+        _write_partition(self.root_path, 2019, "CO", _cems(
+            [3, 3, 470, 470],
+            ["2019-01-01 07:00", "2019-06-01 00:00",
+             "2019-01-01 07:00", "2019-06-01 00:00"]))
+        _write_partition(self.root_path, 2019, "ID", _cems(
+            [1000, 1000], ["2019-01-01 08:00", "2019-06-01 00:00"]))
+
+    def tearDown(self):
+        """Remove the temporary files."""
+        self.tmpdir.cleanup()
+
+    def _read(self, **kwargs):
+        """Read the plant IDs and times of the selected records."""
+        df = epacems.epacems(
+            self.root_path,
+            columns=["plant_id_eia", "operating_datetime_utc"], **kwargs)
+        return sorted(
+            (plant_id, time.strftime("%Y-%m-%d %H:%M"))
+            for plant_id, time in df.itertuples(index=False))
+
+    def test_filter(self):
+        """Records are selected by partition, plant, unit and time."""
+        self.assertIsNone(epacems.epacems_filter())
+        self.assertEqual(10, len(self._read()))
+        self.assertListEqual(
+            [(1000, "2019-01-01 08:00"), (1000, "2019-06-01 00:00")],
+            self._read(states=["id"]))
+        self.assertListEqual(
+            [(3, "2018-06-01 00:00"), (3, "2019-01-01 06:00")],
+            self._read(years=[2018], plant_ids=[3]))
+        self.assertListEqual(
+            [(470, "2019-01-01 07:00"), (470, "2019-06-01 00:00")],
+            self._read(years=[2019], unit_ids=["U470"]))
+
+    def test_filter_years_from_dates(self):
+        """Partitions are only skipped if they can't hold the dates."""
+        # Records from the start of 2019 UTC are found in the 2018 partition.
+        self.assertListEqual(
+            [(3, "2019-01-01 06:00"), (3, "2019-01-01 07:00")],
+            self._read(plant_ids=[3], start_date="2019-01-01",
+                       end_date="2019-01-02"))
+        self.assertListEqual(
+            [(3, "2019-01-01 06:00"), (470, "2019-01-01 06:00")],
+            self._read(start_date="2019-01-01 06:00",
+                       end_date=pd.Timestamp("2018-12-31 23:00",
+                                             tz="US/Mountain")))
+        # The expression also rules out whole partitions by year.
+        self.assertIn("year", str(epacems.epacems_filter(
+            start_date="2019-01-01")))
+
+    def test_index_row_groups(self):
+        """Row groups are selected using the statistics in the index."""
+        index = pudl.load.parquet.epacems_row_group_index(self.root_path)
+        self.assertEqual(5, len(index))
+        path_co_2019 = "year=2019/state=CO/hourly_emissions_epacems_2019_co.parquet"
+        path_id_2019 = "year=2019/state=ID/hourly_emissions_epacems_2019_id.parquet"
+        row_groups = epacems._index_row_groups(
+            index, years=[2019], plant_ids=[470, 1000])
+        self.assertListEqual([], row_groups[
+            "year=2018/state=CO/hourly_emissions_epacems_2018_co.parquet"])
+        self.assertListEqual([1], row_groups[path_co_2019])
+        self.assertListEqual([0], row_groups[path_id_2019])
+        row_groups = epacems._index_row_groups(
+            index, start_date="2019-03-01", end_date="2019-07-01")
+        self.assertListEqual([0, 1], row_groups[path_co_2019])
+        # Row groups without statistics can't be ruled out.
+        index.loc[:, ["plant_id_eia_min", "plant_id_eia_max"]] = np.nan
+        row_groups = epacems._index_row_groups(index, plant_ids=[999])
+        self.assertListEqual([0], row_groups[path_id_2019])
+
+    def test_read_with_index(self):
+        """The index is used to read row groups, and new files aren't missed."""
+        expected = self._read(plant_ids=[470, 1000])
+        pudl.load.parquet.write_epacems_index(self.root_path)
+        dataset = epacems._scan_dataset(
+            self.root_path, epacems.epacems_filter(plant_ids=[470, 1000]),
+            plant_ids=[470, 1000])
+        self.assertEqual(
+            [2, 2, 2],
+            [fragment.to_table().num_rows
+             for fragment in dataset.get_fragments()])
+        self.assertListEqual(expected, self._read(plant_ids=[470, 1000]))
+
+        # A partition written after the index isn't in it, and is read whole.
+        _write_partition(self.root_path, 2020, "CO", _cems(
+            [470, 470], ["2020-06-01 00:00", "2020-07-01 00:00"]))
+        self.assertListEqual(
+            sorted(expected + [(470, "2020-06-01 00:00"),
+                               (470, "2020-07-01 00:00")]),
+            self._read(plant_ids=[470, 1000]))
@@ -17,8 +17,10 @@ provided by the EIA 860, and expands on it using several methods which can be
 found in :func:`pudl.transform.eia._boiler_generator_assn`.
 """
 
+import contextlib
 import importlib.resources
 import logging
+import tracemalloc
 
 import networkx as nx
 import numpy as np
@@ -30,10 +32,10 @@ import pudl.constants as pc
 logger = logging.getLogger(__name__)
 
 
-def _occurrence_consistency(entity_id, compiled_df, col,
-                            cols_to_consit, strictness=.7):
+def _occurrence_consistency(compiled_df, id_df, id_cols, cols,
+                            strictness=.7, debug=False):
     """
-    Find the occurence of plants & the consistency of records.
+    Find the consistently reported values of several columns for each id.
 
     We need to determine how consistent a reported value is in the records
     across all of the years or tables that the value is being reported, so we
@@ -41,117 +43,116 @@ def _occurrence_consistency(entity_id, compiled_df, col,
     the number of occurances of each reported record for each entity. With that
     information we can determine if the reported records are strict enough.
 
+    Rather than counting them for one column at a time, every non-null value
+    of all of the columns is encoded as an (id, column, value) code, and these
+    are stacked into one long array, so that the occurences of every record in
+    every column can be counted all at once.
+
     Args:
-        entity_id (list): a list of the id(s) for the entity. Ex: for a plant
-            entity, the entity_id is ['plant_id_eia']. For a generator entity,
-            the entity_id is ['plant_id_eia', 'generator_id'].
         compiled_df (pandas.DataFrame): a dataframe with every instance of the
-            column we are trying to harvest.
-        col (str): the column name of the column we are trying to harvest.
-        cols_to_consit (list): a list of the columns to determine consistency.
-            This either the [entity_id] or the [entity_id, 'report_date'],
-            depending on whether the entity is static or annual.
+            entity, and of the columns we are trying to harvest.
+        id_df (pandas.DataFrame): a dataframe with each of the unique ids that
+            we are harvesting values for.
+        id_cols (list): the columns to determine consistency within. This is
+            either the entity_id, e.g. ['plant_id_eia'], or the entity_id and
+            'report_date', depending on whether the columns are static or
+            annual.
+        cols (list): the names of the columns we are trying to harvest.
         strictness (float): How consistent do you want the column records to
             be? The default setting is .7 (so 70% of the records need to be
             consistent in order to accept harvesting the record).
+        debug (bool): If True, also return the compiled records of each
+            column, with the number of occurences of the entity and of the
+            record, and whether the record is consistent.
 
     Returns:
-        pandas.DataFrame: this dataframe will be a transformed version of
-        compiled_df with NaNs removed and with new columns with information
-        about the consistency of the reported values.
+        tuple: A tuple containing:
+            harvested_df (pandas.DataFrame): the consistent value of each
+            column for each id in id_df (in the same order), which is null if
+            there is no consistent value.
+            consistency (pandas.DataFrame): the ratio of consistent records,
+            the number of inconsistent records (wrongos) and the total number
+            of ids with records, for each column.
+            col_dfs (dict): if debug is True, the compiled records of each
+            column, with information about the consistency of their values.
 
     """
-    # select only the colums you want and drop the NaNs
-    # we want to drop the NaNs because
-    col_df = compiled_df[entity_id + ['report_date', col, 'table']].copy()
-    if pc.column_dtypes["eia"][col] == pd.StringDtype():
-        nan_str_mask = (col_df[col] == "nan").fillna(False)
-        col_df.loc[nan_str_mask, col] = pd.NA
-    col_df = col_df.dropna()
-
-    if len(col_df) == 0:
-        col_df[f'{col}_consistent'] = pd.NA
-        col_df['entity_occurences'] = pd.NA
-        col_df = col_df.drop(columns=['table'])
-        return col_df
-    # determine how many times each entity occurs in col_df
-    occur = (
-        col_df.
-        groupby(by=cols_to_consit).
-        agg({'table': "count"}).
-        reset_index().
-        rename(columns={'table': 'entity_occurences'})
-    )
-
-    # add the occurances into the main dataframe
-    col_df = col_df.merge(occur, on=cols_to_consit)
-
-    # determine how many instances of each of the records in col exist
-    consist_df = (
-        col_df.
-        groupby(by=cols_to_consit + [col]).
-        agg({'table': 'count'}).
-        reset_index().
-        rename(columns={'table': 'record_occurences'})
-    )
-    # now in col_df we have # of times an entity occurred accross the tables
-    # and we are going to merge in the # of times each value occured for each
-    # entity record. When we merge the consistency in with the occurances, we
-    # can determine if the records are more than 70% consistent across the
-    # occurances of the entities.
-    col_df = col_df.merge(consist_df, how='outer').drop(columns=['table'])
-    # change all of the fully consistent records to True
-    col_df[f'{col}_consistent'] = (col_df['record_occurences'] /
-                                   col_df['entity_occurences'] > strictness)
-
-    return col_df
-
-
-def _lat_long(dirty_df, clean_df, entity_id_df, entity_id,
-              col, cols_to_consit, round_to=2):
-    """Harvests more complete lat/long in special cases.
-
-    For all of the entities were there is not a consistent enough reported
-    record for latitude and longitude, this function reduces the precision of
-    the reported lat/long by rounding down the reported records in order to get
-    more complete set of consistent records.
-
-    Args:
-        dirty_df (pandas.DataFrame): a dataframe with entity records that have
-            inconsistently reported lat/long.
-        clean_df (pandas.DataFrame): a dataframe with entity records that have
-            consistently reported lat/long.
-        entity_id_df (pandas.DataFrame): a dataframe with a complete set of
-            possible entity ids
-        entity_id (list): a list of the id(s) for the entity. Ex: for a plant
-            entity, the entity_id is ['plant_id_eia']. For a generator entity,
-            the entity_id is ['plant_id_eia', 'generator_id'].
-        col (string): the column name of the column we are trying to harvest.
-        cols_to_consit (list): a list of the columns to determine consistency.
-            This either the [entity_id] or the [entity_id, 'report_date'],
-            depending on whether the entity is static or annual.
-        round_to (integer): This is the number of decimals places we want to
-            preserve while rounding down.
-    Returns:
-        pandas.DataFrame: a dataframe with all of the entity ids. some will
-        have harvested records from the clean_df. some will have harvested
-        records that were found after rounding. some will have NaNs if no
-        consistently reported records were found.
+    # we drop the records with nulls in the column, or in the report_date
+    valid = compiled_df['report_date'].notna().to_numpy()
+    ids = pd.MultiIndex.from_frame(id_df[id_cols]).get_indexer(
+        pd.MultiIndex.from_frame(compiled_df[id_cols]))
+    n_ids, n_cols = len(id_df), len(cols)
+
+    codes = []
+    uniques = []
+    for col in cols:
+        col_codes, col_uniques = pd.factorize(compiled_df[col].array)
+        if pc.column_dtypes["eia"][col] == pd.StringDtype():
+            nan_str_mask = (compiled_df[col] == "nan").fillna(False)
+            col_codes[nan_str_mask.to_numpy(dtype=bool)] = -1
+        codes.append(col_codes)
+        uniques.append(col_uniques)
+    stride = max([len(col_uniques) for col_uniques in uniques], default=0) + 1
+
+    # stack the (id, column, value) codes of every record into one array
+    records = [np.array([], dtype=np.int64)]
+    for i, col_codes in enumerate(codes):
+        mask = valid & (col_codes >= 0)
+        records.append((ids[mask] * n_cols + i) * stride + col_codes[mask])
+    records = np.concatenate(records)
+    # determine how many instances of each of the records exist, and how many
+    # times each entity occurs in each column
+    record_counts = pd.Series(records).value_counts(sort=False)
+    id_and_col, value = np.divmod(record_counts.index.to_numpy(), stride)
+    record_occurences = record_counts.to_numpy()
+    entity_occurences = np.bincount(
+        id_and_col, weights=record_occurences,
+        minlength=n_ids * n_cols).astype(np.int64)
+    consistent = (
+        record_occurences / entity_occurences[id_and_col]) > strictness
+
+    # pull the consistent value (if any) for each id and column
+    harvested_codes = np.full(n_ids * n_cols, -1)
+    harvested_codes[id_and_col[consistent]] = value[consistent]
+    harvested_codes = harvested_codes.reshape(n_ids, n_cols)
+    harvested = {}
+    for i, col in enumerate(cols):
+        if (harvested_codes[:, i] < 0).all():
+            harvested[col] = pd.Series(np.nan, index=range(n_ids),
+                                       dtype=object)
+        else:
+            harvested[col] = pd.api.extensions.take(
+                uniques[i], harvested_codes[:, i], allow_fill=True)
+    harvested_df = pd.DataFrame(harvested, index=range(n_ids), columns=cols)
+
+    consistency = pd.DataFrame({
+        'column': cols,
+        'consistent_ratio': np.nan,
+        'wrongos': np.nan,
+        'total': (entity_occurences.reshape(n_ids, n_cols) > 0).sum(axis=0),
+    })
+    n_consistent = (harvested_codes >= 0).sum(axis=0)
+    has_records = consistency.total > 0
+    consistency.loc[has_records, 'consistent_ratio'] = (
+        n_consistent[has_records] / consistency.total[has_records])
+    consistency['wrongos'] = (
+        (1 - consistency.consistent_ratio) * consistency.total)
 
-    """
-    # grab the dirty plant records, round and get a new consistency
-    ll_df = dirty_df.round(decimals={col: round_to})
-    ll_df['table'] = 'special_case'
-    ll_df = _occurrence_consistency(entity_id, ll_df, col, cols_to_consit)
-    # grab the clean plants
-    ll_clean_df = clean_df.dropna()
-    # find the new clean plant records by selecting the True consistent records
-    ll_df = ll_df[ll_df[f'{col}_consistent']].drop_duplicates(subset=entity_id)
-    # add the newly cleaned records
-    ll_clean_df = ll_clean_df.append(ll_df,)
-    # merge onto the plants df w/ all plant ids
-    ll_clean_df = entity_id_df.merge(ll_clean_df, how='outer')
-    return ll_clean_df
+    col_dfs = {}
+    if debug:
+        entity_id = [id_col for id_col in id_cols if id_col != 'report_date']
+        for i, (col, col_codes) in enumerate(zip(cols, codes)):
+            mask = valid & (col_codes >= 0)
+            col_ids = ids[mask] * n_cols + i
+            col_df = compiled_df.loc[
+                mask, entity_id + ['report_date', col]].copy()
+            col_df['entity_occurences'] = entity_occurences[col_ids]
+            col_df['record_occurences'] = record_counts.loc[
+                col_ids * stride + col_codes[mask]].to_numpy()
+            col_df[f'{col}_consistent'] = (
+                harvested_codes[ids[mask], i] == col_codes[mask])
+            col_dfs[col] = col_df
+    return harvested_df, consistency, col_dfs
 
 
 def _add_timezone(plants_entity):
@@ -221,6 +222,54 @@ def _add_additional_epacems_plants(plants_entity):
     return plants_entity.append(cems_unmatched).reset_index()
 
 
+@contextlib.contextmanager
+def _log_peak_memory(stage):
+    """
+    Log the peak memory allocated during a stage of the transform.
+
+    This is only done when DEBUG level logging is enabled, since tracing
+    memory allocations slows everything down. If memory allocations are
+    already being traced, e.g. by an enclosing stage, nothing is logged.
+
+    Args:
+        stage (str): The name of the stage being run within the context.
+
+    """
+    if not logger.isEnabledFor(logging.DEBUG) or tracemalloc.is_tracing():
+        yield
+        return
+    tracemalloc.start()
+    try:
+        yield
+        current, peak = tracemalloc.get_traced_memory()
+        logger.debug(f"{stage}: peak memory use {peak / 1_000_000:.1f} MB, "
+                     f"{current / 1_000_000:.1f} MB still allocated.")
+    finally:
+        tracemalloc.stop()
+
+
+def _drop_columns(df, cols):
+    """
+    Drop columns from a dataframe without copying the remaining columns.
+
+    :meth:`pandas.DataFrame.drop` copies all of the columns which are kept.
+    Deleting the columns from a shallow copy of the dataframe leaves the
+    original unaltered, while the result shares its data.
+
+    Args:
+        df (pandas.DataFrame): the dataframe to drop columns from.
+        cols (list): the names of the columns to drop.
+
+    Returns:
+        pandas.DataFrame: the dataframe without the dropped columns.
+
+    """
+    df = df.copy(deep=False)
+    for col in cols:
+        del df[col]
+    return df
+
+
 def _compile_all_entity_records(entity, eia_transformed_dfs):
     """
     Compile all of the entity records from each table they appear in.
@@ -245,16 +294,14 @@ def _compile_all_entity_records(entity, eia_transformed_dfs):
             # if the df contains the desired columns the grab those columns
             if set(base_cols).issubset(transformed_df.columns):
                 logger.debug(f"        {table_name}...")
-                # create a copy of the df to muck with
-                df = transformed_df.copy()
-                # we know these columns must be in the dfs
-                cols = []
                 # check whether the columns are in the specific table
-                for column in static_cols + annual_cols:
-                    if column in df.columns:
-                        cols.append(column)
-                df = df[(base_cols + cols)]
-                df = df.dropna(subset=entity_id)
+                cols = [column for column in static_cols + annual_cols
+                        if column in transformed_df.columns]
+                # only the records with ids, and the columns we need, are
+                # copied out of the table
+                has_id = transformed_df[entity_id].notna().all(
+                    axis=1).to_numpy()
+                df = transformed_df.loc[has_id, base_cols + cols]
                 # add a column with the table name so we know its origin
                 df['table'] = table_name
                 dfs.append(df)
@@ -264,22 +311,24 @@ def _compile_all_entity_records(entity, eia_transformed_dfs):
                                                                          'utilities_eia860',
                                                                          'generators_eia860'):
                     cols.remove('utility_id_eia')
-                transformed_df = transformed_df.drop(columns=cols)
-                eia_transformed_dfs[table_name] = transformed_df
+                eia_transformed_dfs[table_name] = _drop_columns(
+                    transformed_df, cols)
 
     # add those records to the compliation
     compiled_df = pd.concat(dfs, axis=0, ignore_index=True, sort=True)
-    # strip the month and day from the date so we can have annual records
-    compiled_df['report_date'] = compiled_df['report_date'].dt.year
-    # convert the year back into a date_time object
-    year = compiled_df['report_date']
-    compiled_df['report_date'] = pd.to_datetime({'year': year,
-                                                 'month': 1,
-                                                 'day': 1})
+    del dfs
+    # strip the month and day from the date so we can have annual records,
+    # truncating the datetimes to the start of their year
+    compiled_df['report_date'] = (
+        compiled_df['report_date'].to_numpy(dtype='datetime64[ns]')
+        .astype('datetime64[Y]').astype('datetime64[ns]'))
 
     logger.debug('    Casting harvested IDs to correct data types')
-    # most columns become objects (ack!), so assign types
-    compiled_df = compiled_df.astype(pc.entities[entity][3])
+    # most columns become objects (ack!), so assign types, one column at a
+    # time, and only where they are wrong
+    for col, dtype in pc.entities[entity][3].items():
+        if compiled_df[col].dtype != dtype:
+            compiled_df[col] = compiled_df[col].astype(dtype)
     return compiled_df
 
 
@@ -302,9 +351,7 @@ def _harvesting(entity,  # noqa: C901
     argument for _occurrence_consistency). That means at least 70% of the
     records must be the same for us to use that value. So if values for an
     entity haven't been reported 70% consistently, then it will show up as a
-    null value. We built in the ability to add special cases for columns where
-    we want to apply a different method to, but the only ones we added was for
-    latitude and longitude because they are by far the dirtiest.
+    null value.
 
     We have determined which columns should be considered "static" or "annual".
     These can be found in constants in the `entities` dictionary. Static means
@@ -359,90 +406,44 @@ def _harvesting(entity,  # noqa: C901
     entity_id_df = annual_id_df.drop(
         ['report_date'], axis=1).drop_duplicates(subset=entity_id)
 
-    entity_df = entity_id_df.copy()
-    annual_df = annual_id_df.copy()
-    special_case_cols = {'latitude': [_lat_long, 1],
-                         'longitude': [_lat_long, 1]}
-    consistency = pd.DataFrame(columns=['column', 'consistent_ratio',
-                                        'wrongos', 'total'])
-    col_dfs = {}
-    # determine how many times each of the columns occur
-    for col in static_cols + annual_cols:
-        if col in annual_cols:
-            cols_to_consit = entity_id + ['report_date']
-        if col in static_cols:
-            cols_to_consit = entity_id
-
-        col_df = _occurrence_consistency(
-            entity_id, compiled_df, col, cols_to_consit, strictness=.7)
-
-        # pull the correct values out of the df and merge w/ the plant ids
-        col_correct_df = (
-            col_df[col_df[f'{col}_consistent']].
-            drop_duplicates(subset=(cols_to_consit + [f'{col}_consistent']))
-        )
-
-        # we need this to be an empty df w/ columns bc we are going to use it
-        if col_correct_df.empty:
-            col_correct_df = pd.DataFrame(columns=col_df.columns)
-
-        if col in static_cols:
-            clean_df = entity_id_df.merge(
-                col_correct_df, on=entity_id, how='left')
-            clean_df = clean_df[entity_id + [col]]
-            entity_df = entity_df.merge(clean_df, on=entity_id)
-
-        if col in annual_cols:
-            clean_df = annual_id_df.merge(
-                col_correct_df, on=(entity_id + ['report_date']), how='left')
-            clean_df = clean_df[entity_id + ['report_date', col]]
-            annual_df = annual_df.merge(
-                clean_df, on=(entity_id + ['report_date']))
-
-        # get the still dirty records by using the cleaned ids w/null values
-        # we need the plants that have no 'correct' value so
-        # we can't just use the col_df records when the consistency is not True
-        dirty_df = col_df.merge(
-            clean_df[clean_df[col].isnull()][entity_id])
-
-        if col in special_case_cols.keys():
-            clean_df = special_case_cols[col][0](
-                dirty_df, clean_df, entity_id_df, entity_id, col,
-                cols_to_consit, special_case_cols[col][1])
-
-        if debug:
-            col_dfs[col] = col_df
-        # this next section is used to print and test whether the harvested
-        # records are consistent enough
-        total = len(col_df.drop_duplicates(subset=cols_to_consit))
-        # if the total is 0, the ratio will error, so assign null values.
+    # find the consistent values of the static & annual columns all at once
+    entity_df, static_consistency, static_col_dfs = _occurrence_consistency(
+        compiled_df, entity_id_df, entity_id, static_cols,
+        strictness=.7, debug=debug)
+    annual_df, annual_consistency, annual_col_dfs = _occurrence_consistency(
+        compiled_df, annual_id_df, entity_id + ['report_date'], annual_cols,
+        strictness=.7, debug=debug)
+    if static_cols:
+        entity_df = pd.concat(
+            [entity_id_df.reset_index(drop=True), entity_df], axis=1)
+    else:
+        entity_df = entity_id_df.copy()
+    if annual_cols:
+        annual_df = pd.concat(
+            [annual_id_df.reset_index(drop=True), annual_df], axis=1)
+    else:
+        annual_df = annual_id_df.copy()
+    col_dfs = {**static_col_dfs, **annual_col_dfs}
+
+    # this next section is used to print and test whether the harvested
+    # records are consistent enough
+    consistency = pd.concat([static_consistency, annual_consistency],
+                            ignore_index=True)
+    for col, ratio, wrongos, total in consistency.itertuples(index=False):
         if total == 0:
-            ratio = np.NaN
-            wrongos = np.NaN
             logger.debug(f"       Zero records found for {col}")
-        if total > 0:
-            ratio = (
-                len(col_df[(col_df[f'{col}_consistent'])].
-                    drop_duplicates(subset=cols_to_consit)) / total
-            )
-            wrongos = (1 - ratio) * total
-            logger.debug(
-                f"       Ratio: {ratio:.3}  "
-                f"Wrongos: {wrongos:.5}  "
-                f"Total: {total}   {col}"
-            )
-            if ratio < 0.9:
-                if debug:
-                    logger.error(f'{col} has low consistency: {ratio:.3}.')
-                else:
-                    raise AssertionError(
-                        f'Harvesting of {col} is too inconsistent at {ratio:.3}.')
-        # add to a small df to be used in order to print out the ratio of
-        # consistent records
-        consistency = consistency.append({'column': col,
-                                          'consistent_ratio': ratio,
-                                          'wrongos': wrongos,
-                                          'total': total}, ignore_index=True)
+            continue
+        logger.debug(
+            f"       Ratio: {ratio:.3}  "
+            f"Wrongos: {wrongos:.5}  "
+            f"Total: {total}   {col}"
+        )
+        if ratio < 0.9:
+            if debug:
+                logger.error(f'{col} has low consistency: {ratio:.3}.')
+            else:
+                raise AssertionError(
+                    f'Harvesting of {col} is too inconsistent at {ratio:.3}.')
     mcs = consistency['consistent_ratio'].mean()
     logger.info(
         f"Average consistency of static {entity} values is {mcs:.2%}")
@@ -847,8 +848,9 @@ def transform(eia_transformed_dfs,
         logger.info(f"Harvesting IDs & consistently static attributes "
                     f"for EIA {entity}")
 
-        _harvesting(entity, eia_transformed_dfs, entities_dfs,
-                    debug=debug)
+        with _log_peak_memory(f"Harvesting EIA {entity}"):
+            _harvesting(entity, eia_transformed_dfs, entities_dfs,
+                        debug=debug)
 
     _boiler_generator_assn(eia_transformed_dfs,
                            eia923_years=eia923_years,
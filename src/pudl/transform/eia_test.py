@@ -0,0 +1,91 @@
+"""Unit tests for pudl.transform.eia module."""
+import unittest
+
+import numpy as np
+import pandas as pd
+
+import pudl.transform.eia as eia
+
+
+class TestOccurrenceConsistency(unittest.TestCase):
+    """Test finding the consistently reported values of entity attributes."""
+
+    def setUp(self):
+        """Compile records of two plants, reported in several tables."""
+        self.compiled_df = pd.DataFrame({
+            "plant_id_eia": [1, 1, 1, 1, 2, 2, 2],
+            "report_date": pd.to_datetime(
+                ["2018-01-01", "2018-01-01", "2019-01-01", None,
+                 "2018-01-01", "2019-01-01", "2019-01-01"]),
+            "plant_name_eia": pd.array(
+                ["Alpha", "Alpha", "Alpha", "Beta", "Gamma", "Delta", "nan"],
+                dtype=pd.StringDtype()),
+            "latitude": [40.0, 40.0, 41.0, 41.0, np.nan, 30.0, 30.0],
+        })
+        self.id_df = pd.DataFrame({"plant_id_eia": [2, 1]})
+
+    def test_harvested_values(self):
+        """Only values reported consistently enough are harvested."""
+        harvested, consistency, col_dfs = eia._occurrence_consistency(
+            self.compiled_df, self.id_df, ["plant_id_eia"],
+            ["plant_name_eia", "latitude"])
+        # Records without a report_date, and "nan" strings, are ignored.
+        pd.testing.assert_frame_equal(
+            pd.DataFrame({
+                "plant_name_eia": pd.array([None, "Alpha"],
+                                           dtype=pd.StringDtype()),
+                "latitude": [30.0, np.nan],
+            }),
+            harvested)
+        self.assertListEqual([0.5, 0.5],
+                             consistency.consistent_ratio.tolist())
+        self.assertListEqual([1, 1], consistency.wrongos.tolist())
+        self.assertDictEqual({}, col_dfs)
+
+    def test_debug_records(self):
+        """In debug mode the compiled records of each column are returned."""
+        _, _, col_dfs = eia._occurrence_consistency(
+            self.compiled_df, self.id_df, ["plant_id_eia"],
+            ["plant_name_eia", "latitude"], debug=True)
+        latitude = col_dfs["latitude"]
+        self.assertListEqual([3, 3, 3, 2, 2],
+                             latitude.entity_occurences.tolist())
+        self.assertListEqual([2, 2, 1, 2, 2],
+                             latitude.record_occurences.tolist())
+        self.assertListEqual([False, False, False, True, True],
+                             latitude.latitude_consistent.tolist())
+
+
+class TestCompileAllEntityRecords(unittest.TestCase):
+    """Test compiling the records of an entity from all of the EIA tables."""
+
+    def test_compile_utilities(self):
+        """Records are annual, and harvested columns are dropped."""
+        utilities_eia860 = pd.DataFrame({
+            "utility_id_eia": [1.0, 2.0, np.nan],
+            "report_date": pd.to_datetime(
+                ["2018-06-01", "2019-12-31", "2019-01-01"]),
+            "utility_name_eia": ["Alpha", "Beta", "Gamma"],
+            "capacity_mw": [1.0, 2.0, 3.0],
+        })
+        eia_transformed_dfs = {
+            "utilities_eia860": utilities_eia860,
+            "utilities_annual_eia": utilities_eia860.copy(),
+        }
+        compiled_df = eia._compile_all_entity_records(
+            "utilities", eia_transformed_dfs)
+        pd.testing.assert_frame_equal(
+            pd.DataFrame({
+                "report_date": pd.to_datetime(["2018-01-01", "2019-01-01"]),
+                "table": "utilities_eia860",
+                "utility_id_eia": [1, 2],
+                "utility_name_eia": ["Alpha", "Beta"],
+            }),
+            compiled_df)
+        self.assertListEqual(
+            ["utility_id_eia", "report_date", "capacity_mw"],
+            eia_transformed_dfs["utilities_eia860"].columns.tolist())
+        # The original table is left alone.
+        self.assertIn("utility_name_eia", utilities_eia860.columns)
+        self.assertEqual(
+            4, len(eia_transformed_dfs["utilities_annual_eia"].columns))
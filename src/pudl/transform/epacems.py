@@ -8,6 +8,7 @@ import numpy as np
 import pandas as pd
 
 import pudl
+import pudl.constants as pc
 
 logger = logging.getLogger(__name__)
 ###############################################################################
@@ -17,10 +18,47 @@ logger = logging.getLogger(__name__)
 ###############################################################################
 
 
+def _utc_offset_lookup(plant_utc_offset):
+    """
+    Build an array of UTC offsets in nanoseconds, indexed by EIA plant ID.
+
+    EIA plant IDs are small non-negative integers, so a dense array lets us
+    look up the offset for every CEMS record with a single indexing operation
+    rather than merging the offsets onto the whole dataframe.
+
+    Args:
+        plant_utc_offset (pandas.DataFrame): A dataframe of plants' UTC
+            offsets, with columns plant_id_eia and utc_offset.
+
+    Returns:
+        tuple: A numpy array of int64 UTC offsets in nanoseconds, and a boolean
+        numpy array of the same length indicating which plant IDs have a known
+        offset.
+
+    """
+    plant_ids = plant_utc_offset["plant_id_eia"].to_numpy(dtype="int64")
+    offsets = (
+        pd.to_timedelta(plant_utc_offset["utc_offset"])
+        .to_numpy(dtype="timedelta64[ns]")
+        .view("int64")
+    )
+    size = plant_ids.max() + 1 if len(plant_ids) else 0
+    offset_ns = np.zeros(size, dtype="int64")
+    known = np.zeros(size, dtype=bool)
+    offset_ns[plant_ids] = offsets
+    known[plant_ids] = True
+    return offset_ns, known
+
+
 def fix_up_dates(df, plant_utc_offset):
     """
     Fix the dates for the CEMS data.
 
+    The timestamps are assembled as int64 nanoseconds. There are only a few
+    hundred distinct dates in each state-year of CEMS data, so each of them is
+    parsed only once, and the UTC offset for each plant is looked up by its ID
+    in an array rather than merged onto every record.
+
     Args:
         df (pandas.DataFrame): A CEMS hourly dataframe for one year-month-state
         plant_utc_offset (pandas.DataFrame): A dataframe of plants' timezones
@@ -29,41 +67,56 @@ def fix_up_dates(df, plant_utc_offset):
         pandas.DataFrame: The same data, with an op_datetime_utc column added
         and the op_date and op_hour columns removed
 
+    Raises:
+        ValueError: if any of the CEMS plants doesn't have a UTC offset.
+
     """
-    df = (
-        df.assign(
-            # Convert op_date and op_hour from string and integer to datetime:
-            # Note that doing this conversion, rather than reading the CSV with
-            # `parse_dates=True`, is >10x faster.
-            op_datetime_naive=lambda x:
-            # Read the date as a datetime, so all the dates are midnight
-            # Mark as UTC (it's not true yet, but it will be once we add
-            # utc_offsets, and it's easier to do here)
-            pd.to_datetime(x.op_date, format=r"%m-%d-%Y",
-                           exact=True, cache=True, utc=True) +
-            # Add the hour
-            pd.to_timedelta(x.op_hour, unit="h")
-        )
-        .merge(plant_utc_offset, how="left", on="plant_id_eia")
+    # Parse each distinct date once. Note that doing this conversion, rather
+    # than reading the CSV with `parse_dates=True`, is >10x faster. The dates
+    # are usually read in as a categorical, which has already factorized them.
+    if pd.api.types.is_categorical_dtype(df["op_date"]):
+        date_codes = df["op_date"].cat.codes.to_numpy(dtype="int64")
+        dates = df["op_date"].cat.categories.to_numpy(dtype=object)
+    else:
+        date_codes, dates = pd.factorize(df["op_date"].to_numpy(dtype=object))
+    date_ns = (
+        pd.to_datetime(dates, format=r"%m-%d-%Y", exact=True)
+        .to_numpy(dtype="datetime64[ns]")
+        .view("int64")
     )
+    hours = df["op_hour"].to_numpy(dtype="float64", na_value=np.nan)
+    plant_ids = df["plant_id_eia"].to_numpy(dtype="float64", na_value=np.nan)
 
     # Some of the timezones in the plants_entity_eia table may be missing,
     # but none of the CEMS plants should be.
-    if not df["utc_offset"].notna().all():
-        missing_plants = df.loc[df["utc_offset"].isna(),
-                                "plant_id_eia"].unique()
+    offset_ns, known = _utc_offset_lookup(plant_utc_offset)
+    has_id = ~np.isnan(plant_ids)
+    has_offset = np.zeros(len(df), dtype=bool)
+    in_range = has_id & (plant_ids < len(known))
+    has_offset[in_range] = known[plant_ids[in_range].astype("int64")]
+    if not has_offset.all():
+        missing_plants = df.loc[~has_offset, "plant_id_eia"].unique()
         raise ValueError(
             f"utc_offset should never be missing for CEMS plants, but was "
             f"missing for these: {str(list(missing_plants))}"
         )
-    # Add the offset from UTC. CEMS data don't have DST, so the offset is
-    # always the same for a given plant.
-    df["operating_datetime_utc"] = df["op_datetime_naive"] - df["utc_offset"]
-    del df["op_date"], df["op_hour"], df["op_datetime_naive"], df["utc_offset"]
+
+    # Add the hour and the offset from UTC. CEMS data don't have DST, so the
+    # offset is always the same for a given plant.
+    valid = (date_codes >= 0) & ~np.isnan(hours)
+    utc_ns = np.full(len(df), np.iinfo("int64").min, dtype="int64")  # NaT
+    utc_ns[valid] = (
+        date_ns[date_codes[valid]]
+        + hours[valid].astype("int64") * 3_600_000_000_000
+        - offset_ns[plant_ids[valid].astype("int64")]
+    )
+    del df["op_date"], df["op_hour"]
+    df["operating_datetime_utc"] = pd.arrays.DatetimeArray(
+        utc_ns.view("datetime64[ns]"), dtype=pd.DatetimeTZDtype(tz="UTC"))
     return df
 
 
-def _load_plant_utc_offset(datapkg_dir):
+def load_plant_utc_offset(datapkg_dir):
     """Load the UTC offset each EIA plant.
 
     CEMS times don't change for DST, so we get get the UTC offset by using the
@@ -140,7 +193,7 @@ def add_facility_id_unit_id_epa(df):
     if ("facility_id" not in df.columns) or ("unit_id_epa" not in df.columns):
         # Can't just assign np.NaN and get an integer NaN, so make a new array
         # with the right shape:
-        na_col = pd.array(np.full(df.shape[0], np.NaN), dtype="Int64")
+        na_col = pd.array(np.full(df.shape[0], np.NaN), dtype="Int32")
         if "facility_id" not in df.columns:
             df["facility_id"] = na_col
         if "unit_id_epa" not in df.columns:
@@ -199,34 +252,185 @@ def correct_gross_load_mw(df):
     return df
 
 
-def transform(epacems_raw_dfs, datapkg_dir):
+def _rollup_chunk(df, freqs, offset_ns):
+    """
+    Total up the emissions of each unit in a chunk of hourly CEMS data.
+
+    Args:
+        df (pandas.DataFrame): Transformed hourly CEMS data.
+        freqs (iterable): The periods to total, i.e. keys of
+            :data:`pudl.constants.epacems_rollup_tables`.
+        offset_ns (numpy.ndarray): UTC offsets in nanoseconds, indexed by EIA
+            plant ID, as returned by :func:`_utc_offset_lookup`.
+
+    Returns:
+        dict: The totals for each period (DataFrame), keyed by frequency.
+
+    """
+    # CEMS is reported in local standard time, and partitioned by the local
+    # year, so the periods are in local time too. That way no period can
+    # span two partitions.
+    utc_ns = df["operating_datetime_utc"].array.asi8
+    local = np.where(
+        utc_ns == np.iinfo("int64").min, utc_ns,
+        utc_ns + offset_ns[df["plant_id_eia"].to_numpy(dtype="int64")]
+    ).view("datetime64[ns]")
+    units = {
+        "daily": "datetime64[D]",
+        "monthly": "datetime64[M]",
+        "annual": "datetime64[Y]",
+    }
+    sum_cols = {
+        "operating_time_hours": "operating_time_hours",
+        "gross_load_mw": "gross_load_mwh",
+        "heat_content_mmbtu": "heat_content_mmbtu",
+        "so2_mass_lbs": "so2_mass_lbs",
+        "nox_mass_lbs": "nox_mass_lbs",
+        "co2_mass_tons": "co2_mass_tons",
+    }
+    # The operating time is float32, which doesn't have enough precision to
+    # total it up over a whole year.
+    sums = df[list(sum_cols)].astype("float64").rename(columns=sum_cols)
+    rollups = {}
+    for freq in freqs:
+        report_date = local.astype(units[freq]).astype("datetime64[ns]")
+        rollups[freq] = (
+            sums.groupby([df["state"], df["plant_id_eia"], df["unitid"],
+                          pd.Series(report_date, name="report_date",
+                                    index=df.index)],
+                         observed=True, sort=False)
+            .sum(min_count=1)
+        )
+    return rollups
+
+
+def rollup(epacems_transformed_dfs, freqs, plant_utc_offset):
+    """
+    Add daily, monthly or annual totals to a stream of hourly CEMS data.
+
+    The hourly dataframes are passed through unchanged. Each one is totaled up
+    as it goes by, and once all the dataframes for a state-year partition have
+    been seen, the combined totals for the partition are yielded, so the
+    hourly data never has to be read in again.
+
+    Args:
+        epacems_transformed_dfs (iterable): A generator of single-item
+            dictionaries, as yielded by :func:`transform`.
+        freqs (iterable): The periods to total, i.e. keys of
+            :data:`pudl.constants.epacems_rollup_tables`.
+        plant_utc_offset (pandas.DataFrame): The UTC offset of each EIA plant,
+            as returned by :func:`load_plant_utc_offset`.
+
+    Yields:
+        dict: Each of the input dictionaries. After the last one for each
+        partition, a single-item dictionary for each of the requested totals,
+        with the resource name (e.g. "monthly_emissions_epacems_2018_co") as
+        the key and the totals as the value.
+
+    """
+    def totals(resource_name, partials):
+        year_state = resource_name.replace("hourly_emissions_epacems", "")
+        for freq in freqs:
+            yield {
+                pc.epacems_rollup_tables[freq] + year_state: (
+                    pd.concat(partials[freq])
+                    .groupby(level=[0, 1, 2, 3], observed=True)
+                    .sum(min_count=1)
+                    .reset_index()
+                    # Each chunk has its own unit ID categories.
+                    .astype({"unitid": pd.StringDtype()})
+                )
+            }
+
+    offset_ns, _ = _utc_offset_lookup(plant_utc_offset)
+    resource_name = None
+    partials = {freq: [] for freq in freqs}
+    for transformed_df_dict in epacems_transformed_dfs:
+        for name, df in transformed_df_dict.items():
+            if resource_name is not None and name != resource_name:
+                yield from totals(resource_name, partials)
+                partials = {freq: [] for freq in freqs}
+            resource_name = name
+            for freq, df_rollup in _rollup_chunk(
+                    df, freqs, offset_ns).items():
+                partials[freq].append(df_rollup)
+        yield transformed_df_dict
+    if resource_name is not None:
+        yield from totals(resource_name, partials)
+
+
+def _log_memory_usage(df, resource_name, stage):
+    """
+    Log the memory used by a CEMS dataframe after a stage of the transform.
+
+    This is only done when DEBUG level logging is enabled, since measuring the
+    memory used by the dataframe takes some time.
+
+    Args:
+        df (pandas.DataFrame): A CEMS dataframe.
+        resource_name (str): The name of the resource the data belongs to.
+        stage (str): The name of the stage which was just completed.
+
+    Returns:
+        pandas.DataFrame: The same dataframe, unaltered.
+
+    """
+    if logger.isEnabledFor(logging.DEBUG):
+        mem_mb = df.memory_usage(deep=True).sum() / 1_000_000
+        logger.debug(
+            f"{resource_name}: {len(df)} records use {mem_mb:.1f} MB after "
+            f"{stage} ({1_000_000 * mem_mb / max(len(df), 1):.0f} bytes/record)"
+        )
+    return df
+
+
+def transform(epacems_raw_dfs, datapkg_dir, plant_utc_offset=None):
     """
     Transform EPA CEMS hourly data for use in datapackage export.
 
-    Todo:
-        Incomplete docstring.
+    Args:
+        epacems_raw_dfs (iterable): A generator of single-item dictionaries,
+            as yielded by :func:`pudl.extract.epacems.extract`.
+        datapkg_dir (path-like): Path to the directory of the datapackage
+            which is currently being assembled.
+        plant_utc_offset (pandas.DataFrame): The UTC offset of each EIA plant,
+            as returned by :func:`load_plant_utc_offset`. If None, it is
+            read in from the datapackage. Passing it in allows it to be loaded
+            only once when many partitions are being processed.
+
+    Yields:
+        dict: A single-item dictionary with the partitioned EPA CEMS resource
+        name as the key and the transformed dataframe as the value.
 
     """
     # epacems_raw_dfs is a generator. Pull out one dataframe, run it through
     # a transformation pipeline, and yield it back as another generator.
-    plant_utc_offset = _load_plant_utc_offset(datapkg_dir)
+    if plant_utc_offset is None:
+        plant_utc_offset = load_plant_utc_offset(datapkg_dir)
     for raw_df_dict in epacems_raw_dfs:
         # There's currently only one dataframe in this dict at a time, but
         # that could be changed if you want.
-        # Also, the type conversion is being done here so that it happens
-        # inside the generator -- rather than following the same pattern as
-        # in the EIA type conversions.
+        # The data is read in with the compact types given by
+        # pc.epacems_csv_dtypes, and keeps them throughout. The type conversion
+        # at the end only sets the types of the columns added here. It is done
+        # inside the generator, rather than following the same pattern as in
+        # the EIA type conversions.
         for yr_st, raw_df in raw_df_dict.items():
+            _log_memory_usage(raw_df, yr_st, "extract")
+            # Fill in place, rather than copying the whole dataframe.
+            for col in ("gross_load_mw", "heat_content_mmbtu"):
+                raw_df[col] = raw_df[col].fillna(0.0)
             df = (
-                raw_df.fillna({
-                    "gross_load_mw": 0.0,
-                    "heat_content_mmbtu": 0.0
-                })
+                raw_df
                 .pipe(harmonize_eia_epa_orispl)
                 .pipe(fix_up_dates, plant_utc_offset=plant_utc_offset)
+                .pipe(_log_memory_usage, yr_st, "fix_up_dates")
                 .pipe(add_facility_id_unit_id_epa)
+                .pipe(_log_memory_usage, yr_st, "add_facility_id_unit_id_epa")
                 .pipe(correct_gross_load_mw)
+                .pipe(_log_memory_usage, yr_st, "correct_gross_load_mw")
                 .pipe(pudl.helpers.convert_cols_dtypes,
                       "epacems", "hourly_emissions_epacems")
+                .pipe(_log_memory_usage, yr_st, "convert_cols_dtypes")
             )
             yield {yr_st: df}
@@ -0,0 +1,108 @@
+"""Unit tests for pudl.transform.epacems module."""
+import unittest
+
+import numpy as np
+import pandas as pd
+
+import pudl.transform.epacems as epacems
+
+
+def _raw_cems():
+    """Make a few raw CEMS records for plants in two timezones."""
+    return pd.DataFrame({
+        "plant_id_eia": pd.array([3, 3, 470, 470], dtype="Int64"),
+        "unitid": pd.array(["1", "1", "CT2", "CT2"], dtype=pd.StringDtype()),
+        "op_date": pd.array(
+            ["12-31-2018", "01-01-2019", "12-31-2018", "01-01-2019"],
+            dtype=pd.StringDtype()),
+        "op_hour": pd.array([23, 0, 23, 5], dtype="Int64"),
+    })
+
+
+class TestFixUpDates(unittest.TestCase):
+    """Test the construction of UTC timestamps for EPA CEMS data."""
+
+    def setUp(self):
+        """Set up the UTC offsets of the plants in the test data."""
+        self.plant_utc_offset = pd.DataFrame({
+            "plant_id_eia": pd.array([3, 470, 1000], dtype="Int64"),
+            "utc_offset": pd.to_timedelta([-6, -7, -5], unit="h"),
+        })
+
+    def test_utc_timestamps(self):
+        """Local standard time is converted to UTC using each plant's offset."""
+        df = epacems.fix_up_dates(_raw_cems(), self.plant_utc_offset)
+        self.assertListEqual(
+            ["plant_id_eia", "unitid", "operating_datetime_utc"],
+            list(df.columns))
+        pd.testing.assert_series_equal(
+            pd.Series(pd.to_datetime([
+                "2019-01-01 05:00", "2019-01-01 06:00",
+                "2019-01-01 06:00", "2019-01-01 12:00",
+            ], utc=True), name="operating_datetime_utc"),
+            df["operating_datetime_utc"])
+
+    def test_categorical_dates(self):
+        """Dates read in as a categorical give the same timestamps."""
+        raw = _raw_cems()
+        expected = epacems.fix_up_dates(raw.copy(), self.plant_utc_offset)
+        raw["op_date"] = raw["op_date"].astype("category")
+        raw["op_hour"] = raw["op_hour"].astype("Int8")
+        raw["plant_id_eia"] = raw["plant_id_eia"].astype("Int32")
+        df = epacems.fix_up_dates(raw, self.plant_utc_offset)
+        pd.testing.assert_series_equal(
+            expected["operating_datetime_utc"], df["operating_datetime_utc"])
+
+    def test_missing_utc_offset(self):
+        """Plants without a UTC offset are reported."""
+        with self.assertRaisesRegex(ValueError, "470"):
+            epacems.fix_up_dates(
+                _raw_cems(), self.plant_utc_offset.iloc[[0, 2]])
+
+
+class TestRollup(unittest.TestCase):
+    """Test totaling up EPA CEMS data over days, months and years."""
+
+    def test_local_periods_across_chunks(self):
+        """Totals are by local date, and combine all chunks of a partition."""
+        plant_utc_offset = pd.DataFrame({
+            "plant_id_eia": pd.array([3], dtype="Int64"),
+            "utc_offset": pd.to_timedelta([-6], unit="h"),
+        })
+        df = epacems.fix_up_dates(_raw_cems().iloc[:2], plant_utc_offset)
+        df = df.assign(
+            state="AL",
+            operating_time_hours=[1.0, 0.5],
+            gross_load_mw=[100.0, 50.0],
+            heat_content_mmbtu=[1.0, 1.0],
+            so2_mass_lbs=[np.nan, np.nan],
+            nox_mass_lbs=[2.0, np.nan],
+            co2_mass_tons=[3.0, 4.0],
+        )
+        chunks = [
+            {"hourly_emissions_epacems_2018_al": df.iloc[:1]},
+            {"hourly_emissions_epacems_2018_al": df.iloc[1:]},
+            {"hourly_emissions_epacems_2018_al": df.iloc[1:]},
+            {"hourly_emissions_epacems_2019_al": df.iloc[1:]},
+        ]
+        out = list(epacems.rollup(
+            chunks, ["daily", "annual"], plant_utc_offset))
+        # The hourly data is passed through, followed by each partition's
+        # totals once all of its chunks have gone by.
+        self.assertListEqual(
+            ["hourly_emissions_epacems_2018_al"] * 3
+            + ["daily_emissions_epacems_2018_al",
+               "annual_emissions_epacems_2018_al",
+               "hourly_emissions_epacems_2019_al",
+               "daily_emissions_epacems_2019_al",
+               "annual_emissions_epacems_2019_al"],
+            [name for d in out for name in d])
+        annual = out[4]["annual_emissions_epacems_2018_al"]
+        self.assertListEqual(
+            list(pd.to_datetime(["2018-01-01", "2019-01-01"])),
+            list(annual.report_date))
+        self.assertListEqual([100.0, 100.0], list(annual.gross_load_mwh))
+        # Periods with no reported values have no total, rather than zero.
+        self.assertEqual(2.0, annual.nox_mass_lbs[0])
+        self.assertTrue(pd.isna(annual.nox_mass_lbs[1]))
+        self.assertTrue(annual.so2_mass_lbs.isna().all())
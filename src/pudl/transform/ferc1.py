@@ -19,13 +19,14 @@ from difflib import SequenceMatcher
 import networkx as nx
 import numpy as np
 import pandas as pd
+import scipy.sparse
 from sklearn.base import BaseEstimator, ClassifierMixin
 from sklearn.compose import ColumnTransformer
 from sklearn.feature_extraction.text import TfidfVectorizer
 # These modules are required for the FERC Form 1 Plant ID & Time Series
-from sklearn.metrics.pairwise import cosine_similarity
 from sklearn.pipeline import Pipeline
-from sklearn.preprocessing import MinMaxScaler, Normalizer, OneHotEncoder
+from sklearn.preprocessing import (MinMaxScaler, Normalizer, OneHotEncoder,
+                                   normalize)
 
 import pudl
 import pudl.constants as pc
@@ -37,12 +38,50 @@ logger = logging.getLogger(__name__)
 ##############################################################################
 
 
+def get_row_map(table_name):
+    """
+    Read the mapping of row numbers to row names for a FERC Form 1 table.
+
+    The row maps in the PUDL package_data directory have a row for each
+    row_name and a column for each year, containing the row number which that
+    row_name was given in that year, or -1 if it wasn't present.
+
+    Args:
+        table_name (str): Original name of the FERC Form 1 DB table.
+
+    Returns:
+        pandas.DataFrame: A lookup table with the columns report_year,
+        row_number and row_name. If several row names were given the same row
+        number in a year, the one listed last in the row map is used.
+
+    """
+    with importlib.resources.open_text(
+            "pudl.package_data.meta.ferc1_row_maps", f"{table_name}.csv") as f:
+        row_map = pd.read_csv(f, index_col=0, comment="#")
+    return (
+        row_map.rename_axis(index="row_name")
+        .reset_index()
+        .melt(id_vars="row_name", var_name="report_year",
+              value_name="row_number")
+        .astype({"report_year": int})
+        .dropna(subset=["row_number"])
+        .query("row_number != -1")
+        .drop_duplicates(subset=["report_year", "row_number"], keep="last")
+        .loc[:, ["report_year", "row_number", "row_name"]]
+        .reset_index(drop=True)
+    )
+
+
 def unpack_table(ferc1_df, table_name, data_cols, data_rows):
     """
     Normalize a row-and-column based FERC Form 1 table.
 
     Pulls the named database table from the FERC Form 1 DB and uses the
-    corresponding ferc1_row_map to unpack the row_number coded data.
+    corresponding ferc1_row_map to unpack the row_number coded data. The row
+    names are looked up for every record at once, by merging the records with
+    the row map on report_year and row_number. Any row numbers which aren't
+    in the row map keep their row number as their row name. Records from
+    years which aren't in the row map are dropped.
 
     Args:
         ferc1_df (pandas.DataFrame): Raw FERC Form 1 DataFrame from the DB.
@@ -58,32 +97,7 @@ def unpack_table(ferc1_df, table_name, data_cols, data_rows):
         pandas.DataFrame
 
     """
-    # Read in the corresponding row map:
-    row_map = (
-        pd.read_csv(
-            importlib.resources.open_text(
-                "pudl.package_data.meta.ferc1_row_maps",
-                f"{table_name}.csv"),
-            index_col=0, comment="#")
-        .copy().transpose()
-        .rename_axis(index="year_index", columns=None)
-    )
-    row_map.index = row_map.index.astype(int)
-
-    # For each year, rename row numbers to variable names based on row_map.
-    rename_dict = {}
-    out_df = pd.DataFrame()
-    for year in row_map.index:
-        rename_dict = {v: k for k, v in dict(row_map.loc[year, :]).items()}
-        _ = rename_dict.pop(-1, None)
-        df = ferc1_df.loc[ferc1_df.report_year == year].copy()
-        df.loc[:, "row_name"] = (
-            df.loc[:, "row_number"]
-            .replace(rename_dict, value=None)
-        )
-        # The concatenate according to row_name
-        out_df = pd.concat([out_df, df], axis="index")
-
+    row_map = get_row_map(table_name)
     # Is this list of index columns universal? Or should they be an argument?
     idx_cols = [
         "respondent_id",
@@ -92,16 +106,28 @@ def unpack_table(ferc1_df, table_name, data_cols, data_rows):
         "spplmnt_num",
         "row_name"
     ]
+    out_df = ferc1_df.loc[
+        ferc1_df.report_year.isin(row_map.report_year),
+        idx_cols[:-1] + ["row_number"] + data_cols
+    ]
+    row_names = out_df.merge(
+        row_map.astype({"report_year": out_df.report_year.dtype}),
+        how="left", on=["report_year", "row_number"], validate="many_to_one"
+    ).row_name.to_numpy()
+    out_df = out_df.assign(
+        row_name=np.where(pd.isnull(row_names), out_df.row_number, row_names)
+    )
+
+    dupes = out_df.duplicated(idx_cols)
     logger.info(
-        f"{len(out_df[out_df.duplicated(idx_cols)])/len(out_df):.4%} "
+        f"{dupes.sum()/len(out_df):.4%} "
         f"of unpacked records were duplicates, and discarded."
     )
     # Index the dataframe based on the list of index_cols
     # Unstack the dataframe based on variable names
     out_df = (
-        out_df.loc[:, idx_cols + data_cols]
         # These lost records should be minimal. If not, something's wrong.
-        .drop_duplicates(subset=idx_cols)
+        out_df.loc[~dupes, idx_cols + data_cols]
         .set_index(idx_cols)
         .unstack("row_name")
         .loc[:, (slice(None), data_rows)]
@@ -251,12 +277,16 @@ def _multiplicative_error_correction(tofix, mask, minval, maxval, mults):
     Data values which are not found in one of the acceptable multiplicative
     ranges are set to NA.
 
+    The fixes are applied to all of the selected values at once, one
+    multiplier after another, using :mod:`numpy` masks.
+
     Args:
         tofix (pandas.Series): A 1-dimensional data series containing the
             values to be fixed.
         mask (pandas.Series): A 1-dimensional masking array of True/False
-            values, which will be used to select a subset of the tofix
-            series onto which we will apply the multiplicative fixes.
+            values, the same length as tofix and in the same order, which
+            will be used to select a subset of the tofix series onto which we
+            will apply the multiplicative fixes.
         min (float): the minimum realistic value for the data series.
         max (float): the maximum realistic value for the data series.
         mults (list of floats): values by which "real" data may have been
@@ -266,29 +296,26 @@ def _multiplicative_error_correction(tofix, mask, minval, maxval, mults):
             multiplied to bring them back into the reasonable range.
 
     Returns:
-        fixed (pandas.Series): a data series of the same length as the
+        fixed (pandas.Series): a float data series with the same index as the
             input, but with the transformed values.
     """
+    fixed = tofix.to_numpy(dtype=float, na_value=np.nan, copy=True)
+    mask = np.asarray(mask, dtype=bool)
     # Grab the subset of the input series we are going to work on:
-    records_to_fix = tofix[mask]
-    # Drop those records from our output series
-    fixed = tofix.drop(records_to_fix.index)
+    records_to_fix = fixed[mask]
     # Iterate over the multipliers, applying fixes to outlying populations
     for mult in mults:
-        records_to_fix = records_to_fix.apply(lambda x: x * mult
-                                              if x > minval / mult
-                                              and x < maxval / mult
-                                              else x)
+        in_range = ((records_to_fix > minval / mult)
+                    & (records_to_fix < maxval / mult))
+        records_to_fix[in_range] *= mult
     # Set any record that wasn't inside one of our identified populations to
     # NA -- we are saying that these are true outliers, which can't be part
     # of the population of values we are examining.
-    records_to_fix = records_to_fix.apply(lambda x: np.nan
-                                          if x < minval
-                                          or x > maxval
-                                          else x)
-    # Add our fixed records back to the complete data series and return it
-    fixed = fixed.append(records_to_fix)
-    return fixed
+    records_to_fix[(records_to_fix < minval) | (records_to_fix > maxval)] = \
+        np.nan
+    # Put our fixed records back into the complete data series and return it
+    fixed[mask] = records_to_fix
+    return pd.Series(fixed, index=tofix.index, name=tofix.name)
 
 
 ##############################################################################
@@ -459,20 +486,17 @@ def _plants_steam_assign_plant_ids(ferc1_steam_df, ferc1_fuel_df):
     G = nx.from_pandas_edgelist(edges_df,  # noqa: N806
                                 source='source',
                                 target='target')
-    # Find the connected components of the graph
-    ferc1_plants = (G.subgraph(c) for c in nx.connected_components(G))
-
-    # Now we'll iterate through the connected components and assign each of
-    # them a FERC Plant ID, and pull the results back out into a dataframe:
-    plants_w_ids = pd.DataFrame()
-    for plant_id_ferc1, plant in enumerate(ferc1_plants):
-        nx.set_edge_attributes(plant,
-                               plant_id_ferc1 + 1,
-                               name='plant_id_ferc1')
-        new_plant_df = nx.to_pandas_edgelist(plant)
-        plants_w_ids = plants_w_ids.append(new_plant_df)
+    # Find the connected components of the graph, and assign each of them a
+    # FERC Plant ID, pulling the results back out into a dataframe:
+    ferc1_plants = list(nx.connected_components(G))
+    plants_w_ids = pd.DataFrame({
+        'record_id': [rid for plant in ferc1_plants for rid in plant],
+        'plant_id_ferc1': np.repeat(
+            np.arange(1, len(ferc1_plants) + 1),
+            [len(plant) for plant in ferc1_plants]),
+    })
     logger.info(
-        f"Successfully Identified {plant_id_ferc1+1-len(orphan_record_ids)} "
+        f"Successfully Identified {len(ferc1_plants)-len(orphan_record_ids)} "
         f"multi-year plant entities.")
 
     # Set the construction year back to numeric because it is.
@@ -483,29 +507,11 @@ def _plants_steam_assign_plant_ids(ferc1_steam_df, ferc1_fuel_df):
     ferc1_steam_df = ferc1_steam_df.drop(ffc, axis=1)
 
     # Now we need a list of all the record IDs, with their associated
-    # FERC 1 plant IDs. However, the source-target listing isn't
-    # guaranteed to list every one of the nodes in either list, so we
-    # need to compile them together to ensure that we get every single
-    sources = (
-        plants_w_ids.
-        drop('target', axis=1).
-        drop_duplicates().
-        rename({'source': 'record_id'}, axis=1)
-    )
-    targets = (
-        plants_w_ids.
-        drop('source', axis=1).
-        drop_duplicates().
-        rename({'target': 'record_id'}, axis=1)
-    )
-    plants_w_ids = (
-        pd.concat([sources, targets]).
-        drop_duplicates().
-        sort_values(['plant_id_ferc1', 'record_id'])
-    )
+    # FERC 1 plant IDs, to make sure that we got every single one of them:
+    plants_w_ids = plants_w_ids.sort_values(['plant_id_ferc1', 'record_id'])
     steam_rids = ferc1_steam_df.record_id.values
     pwids_rids = plants_w_ids.record_id.values
-    missing_ids = [rid for rid in steam_rids if rid not in pwids_rids]
+    missing_ids = list(steam_rids[~np.isin(steam_rids, pwids_rids)])
     if missing_ids:
         raise AssertionError(
             f"Uh oh, we lost {abs(len(steam_rids)-len(pwids_rids))} FERC "
@@ -1261,10 +1267,10 @@ class FERCPlantClassifier(BaseEstimator, ClassifierMixin):
         Use weighted FERC plant features to group records into time series.
 
         The fit method takes the vectorized, normalized, weighted FERC plant
-        features (X) as input, calculates the pairwise cosine similarity matrix
-        between all records, and groups the records in their best time series.
-        The similarity matrix and best time series are stored as data members
-        in the object for later use in scoring & predicting.
+        features (X) as input, calculates the cosine similarity between the
+        records, and groups the records in their best time series. The best
+        time series are stored as data members in the object for later use in
+        scoring & predicting.
 
         This isn't quite the way a fit method would normally work.
 
@@ -1278,11 +1284,7 @@ class FERCPlantClassifier(BaseEstimator, ClassifierMixin):
         TODO:
             Zane revisit args and returns
         """
-        self._cossim_df = pd.DataFrame(cosine_similarity(X))
-        self._best_of = self._best_by_year()
-        # Make the best match indices integers rather than floats w/ NA values.
-        self._best_of[self._years] = self._best_of[self._years].fillna(
-            -1).astype(int)
+        self._best_of = self._best_by_year(X)
 
         return self
 
@@ -1299,81 +1301,43 @@ class FERCPlantClassifier(BaseEstimator, ClassifierMixin):
         values (ordered as the input was ordered), with each column
         corresponding to one of the years worth of data. Values in the returned
         dataframe are the FERC record_ids of the record most similar to the
-        input record within that year. Some of them may be null, if there was
-        no sufficiently good match.
+        input record within that year. Some of them may be empty strings, if
+        there was no sufficiently good match.
 
-        Row index is the seed record IDs. Column index is years.
+        Only records whose groupings are consistent with those of the records
+        they are grouped with (see :meth:`_consistent_groups`) are included.
+        The groupings of all the records are checked at once.
 
-        TODO:
-        * This method is hideously inefficient. It should be vectorized.
-        * There's a line that throws a FutureWarning that needs to be fixed.
+        Row index is the seed record IDs. Column index is years.
 
         """
         try:
-            getattr(self, "_cossim_df")
+            getattr(self, "_best_of")
         except AttributeError:
             raise RuntimeError(
                 "You must train classifer before predicting data!")
 
-        out_df = pd.DataFrame(
-            data=[],
-            index=pd.Index([], name="seed_id"),
+        if isinstance(X, pd.DataFrame):
+            X = X.iloc[:, 0]  # noqa: N806
+        record_ids = self._best_of.record_id
+        first_ids = record_ids[~record_ids.duplicated()]
+        seed_idx = pd.Index(first_ids).get_indexer(pd.Index(X))
+        if (seed_idx < 0).any():
+            raise KeyError(
+                f"Unknown FERC record IDs: {list(pd.Index(X)[seed_idx < 0])}")
+        # Positions within the best_of dataframe, rather than within the
+        # de-duplicated record IDs.
+        seed_idx = first_ids.index.to_numpy()[seed_idx]
+        seed_idx = seed_idx[self._consistent_groups()[seed_idx]]
+
+        # Look up the IDs of the best matches. The -1 which indicates that no
+        # good match was found picks out the empty string on the end.
+        best_ids = np.append(record_ids.to_numpy(dtype=object), "")
+        best = self._best_of[self._years].to_numpy()
+        return pd.DataFrame(
+            data=best_ids[best[seed_idx]],
+            index=pd.Index(best_ids[seed_idx], name="seed_id"),
             columns=self._years)
-        tmp_best = (
-            self._best_of.loc[:, ["record_id"] + list(self._years)]
-            .append(pd.DataFrame(data=[""], index=[-1], columns=["record_id"]))
-        )
-        # For each record_id we've been given:
-        for x in X:
-            # Find the index associated with the record ID we are predicting
-            # a grouping for:
-            idx = tmp_best[tmp_best.record_id == x].index.values[0]
-
-            # Mask the best_of dataframe, keeping only those entries where
-            # the index of the chosen record_id appears -- this results in a
-            # huge dataframe almost full of NaN values.
-            w_m = (
-                tmp_best[self._years][tmp_best[self._years] == idx]
-                # Grab the index values of the rows in the masked dataframe which
-                # are NOT all NaN -- these are the indices of the *other* records
-                # which found the record x to be one of their best matches.
-                .dropna(how="all").index.values
-            )
-
-            # Now look up the indices of the records which were found to be
-            # best matches to the record x.
-            b_m = tmp_best.loc[idx, self._years].astype(int)
-
-            # Here we require that there is no conflict between the two sets
-            # of indices -- that every time a record shows up in a grouping,
-            # that grouping is either the same, or a subset of the other
-            # groupings that it appears in. When no sufficiently good match
-            # is found the "index" in the _best_of array is set to -1, so
-            # requiring that the b_m value be >=0 screens out those no-match
-            # cases. This is okay -- we're just trying to require that the
-            # groupings be internally self-consistent, not that they are
-            # completely identical. Being flexible on this dramatically
-            # increases the number of records that get assigned a plant ID.
-            if np.array_equiv(w_m, b_m[b_m >= 0].values):
-                # This line is causing a warning. In cases where there are
-                # some years no sufficiently good match exists, and so b_m
-                # doesn't contain an index. Instead, it has a -1 sentinel
-                # value, which isn't a label for which a record exists, which
-                # upsets .loc. Need to find some way around this... but for
-                # now it does what we want. We could use .iloc instead, but
-                # then the -1 sentinel value maps to the last entry in the
-                # dataframe, which also isn't what we want.  Blargh.
-                new_grp = tmp_best.loc[b_m, "record_id"]
-
-                # Stack the new list of record_ids on our output DataFrame:
-                out_df = out_df.append(
-                    pd.DataFrame(
-                        data=new_grp.values.reshape(1, len(self._years)),
-                        index=pd.Index(
-                            [tmp_best.loc[idx, "record_id"]],
-                            name="seed_id"),
-                        columns=self._years))
-        return out_df
 
     def score(self, X, y=None):  # noqa: N803
         """Scores a collection of FERC plant categorizations.
@@ -1392,46 +1356,121 @@ class FERCPlantClassifier(BaseEstimator, ClassifierMixin):
             numpy.ndarray: The average of all the similarity metrics as the
             score.
         """
+        true_groups = [
+            [s for s in str.split(true_group, sep=',') if s != '']
+            for true_group in y
+        ]
+        # Predict the groups of all the records at once:
+        predicted_groups = self.predict(pd.Series(
+            [rec_id for true_group in true_groups for rec_id in true_group],
+            dtype=object).drop_duplicates())
         scores = []
-        for true_group in y:
-            true_group = str.split(true_group, sep=',')
-            true_group = [s for s in true_group if s != '']
-            predicted_groups = self.predict(pd.DataFrame(true_group))
+        for true_group in true_groups:
             for rec_id in true_group:
                 sm = SequenceMatcher(None, true_group,
-                                     predicted_groups.loc[rec_id])
+                                     predicted_groups.loc[rec_id].tolist())
                 scores = scores + [sm.ratio()]
 
         return np.mean(scores)
 
-    def _best_by_year(self):
-        """Finds the best match for each plant record in each other year."""
-        # only keep similarity matrix entries above our minimum threshold:
+    def _consistent_groups(self):
+        """
+        Find the records whose best matches are consistent with each other.
+
+        We require that there is no conflict between the records which found
+        a record to be their best match in some year, and the records which
+        it found to be its best matches -- that every time a record shows up
+        in a grouping, that grouping is either the same, or a subset of the
+        other groupings that it appears in. Both sets of records have to be
+        the same, listed in the same order (the records which found it by
+        position, its best matches by year), except that either one may be
+        empty if the other only contains a single record. This is okay --
+        we're just trying to require that the groupings be internally
+        self-consistent, not that they are completely identical. Being
+        flexible on this dramatically increases the number of records that
+        get assigned a plant ID.
+
+        Returns:
+            numpy.ndarray: A boolean array indicating whether each record in
+            the best_of dataframe has a consistent grouping.
+
+        """
+        best = self._best_of[self._years].to_numpy()
+        matched = best >= 0
+        n_matches = matched.sum(axis=1)
+        # How many records found each record to be their best match:
+        n_matched_by = np.bincount(best[matched], minlength=len(best))
+        # Each record can only be another record's best match in its own
+        # year, so a record's best matches all found it to be their best
+        # match if they did in that year:
+        year_col = pd.Index(self._years).get_indexer(self._best_of.report_year)
+        rows, cols = np.nonzero(matched)
+        n_mutual = np.bincount(
+            rows[best[best[rows, cols], year_col[rows]] == rows],
+            minlength=len(best))
+        # The best matches must be in order of position. No record is the
+        # best match in more than one year, so each must be greater than all
+        # the ones before it:
+        prev_max = np.hstack([
+            np.full((len(best), 1), -1),
+            np.maximum.accumulate(best, axis=1)[:, :-1]])
+        in_order = (~matched | (best > prev_max)).all(axis=1)
+        return (
+            ((n_matches == n_matched_by) & (n_mutual == n_matches) & in_order)
+            | ((n_matches == 0) & (n_matched_by == 1))
+            | ((n_matches == 1) & (n_matched_by == 0))
+        )
+
+    def _best_by_year(self, X):  # noqa: N803
+        """
+        Finds the best match for each plant record in each other year.
+
+        Rather than calculating the cosine similarity between every pair of
+        records at once, which takes memory proportional to the square of the
+        number of records, the similarities between the records in each pair
+        of years are calculated separately, and only the best match for each
+        record is kept.
+
+        Args:
+            X (): a sparse matrix of size n_samples x n_features, with a row
+                for each record in plants_df, in the same order.
+
+        Returns:
+            pandas.DataFrame: plants_df, with a column for each year,
+            containing the position of the record in that year which is most
+            similar to each record, or -1 if none of them has a cosine
+            similarity of at least min_sim.
+
+        """
+        # Cosine similarity is the dot product of the normalized vectors.
+        X = normalize(X)  # noqa: N806
+        if scipy.sparse.issparse(X):
+            X = X.tocsr()  # noqa: N806
         out_df = self.plants_df.copy()
-        sim_df = self._cossim_df[self._cossim_df >= self.min_sim]
-
-        # Add a column for each of the years, in which we will store indices
-        # of the records which best match the record in question:
-        for yr in self._years:
-            newcol = yr
-            out_df[newcol] = -1
-
-        # seed_yr is the year we are matching *from* -- we do the entire
-        # matching process from each year, since it may not be symmetric:
-        for seed_yr in self._years:
-            seed_idx = self.plants_df.index[
-                self.plants_df.report_year == seed_yr]
-            # match_yr is all the other years, in which we are finding the best
-            # match
-            for match_yr in self._years:
-                best_of_yr = match_yr
-                match_idx = self.plants_df.index[
-                    self.plants_df.report_year == match_yr]
+        report_years = self.plants_df.report_year.to_numpy()
+        year_idx = {yr: np.flatnonzero(report_years == yr)
+                    for yr in self._years}
+
+        # match_yr is the year in which we are finding the best match for
+        # records from each seed_yr -- we do the entire matching process
+        # from each year, since it may not be symmetric:
+        for match_yr in self._years:
+            match_idx = year_idx[match_yr]
+            match_t = X[match_idx].T
+            best_idx = np.full(len(out_df), -1)
+            for seed_yr in self._years:
+                seed_idx = year_idx[seed_yr]
+                sim = X[seed_idx] @ match_t
+                if scipy.sparse.issparse(sim):
+                    sim = sim.toarray()
                 # For each record specified by seed_idx, obtain the index of
-                # the record within match_idx that that is the most similar.
-                best_idx = sim_df.iloc[seed_idx, match_idx].idxmax(axis=1)
-                out_df.iloc[seed_idx,
-                            out_df.columns.get_loc(best_of_yr)] = best_idx
+                # the record within match_idx that that is the most similar,
+                # if it is similar enough.
+                best = np.asarray(sim).argmax(axis=1)
+                best_sim = sim[np.arange(len(seed_idx)), best]
+                best_idx[seed_idx] = np.where(
+                    best_sim >= self.min_sim, match_idx[best], -1)
+            out_df[match_yr] = best_idx
 
         return out_df
 
@@ -0,0 +1,91 @@
+"""Unit tests for pudl.transform.ferc1 module."""
+import unittest
+
+import pandas as pd
+import scipy.sparse
+
+import pudl.transform.ferc1 as ferc1
+
+
+class TestUnpackTable(unittest.TestCase):
+    """Test unpacking row-numbered FERC Form 1 tables."""
+
+    def test_row_names_by_year(self):
+        """Row numbers are named by year, and duplicate records dropped."""
+        ferc1_df = pd.DataFrame({
+            "respondent_id": [1, 1, 1, 2, 2],
+            "report_year": [2002, 2002, 2002, 2018, 1900],
+            "report_prd": 12,
+            "spplmnt_num": 0,
+            "row_number": [55, 2, 2, 60, 60],
+            "yr_end_bal": [10.0, 1.0, 2.0, 20.0, 30.0],
+        })
+        out_df = ferc1.unpack_table(
+            ferc1_df, "f1_plant_in_srvce",
+            data_cols=["yr_end_bal"],
+            data_rows=["distribution_acct360_land",
+                       "intangible_acct301_organization"])
+        expected = pd.DataFrame(
+            [[10.0, 1.0], [20.0, None]],
+            index=pd.MultiIndex.from_tuples(
+                [(1, 2002, 12, 0), (2, 2018, 12, 0)],
+                names=["respondent_id", "report_year",
+                       "report_prd", "spplmnt_num"]),
+            columns=pd.MultiIndex.from_product(
+                [["yr_end_bal"], ["distribution_acct360_land",
+                                  "intangible_acct301_organization"]],
+                names=[None, "row_name"]))
+        pd.testing.assert_frame_equal(expected, out_df)
+
+
+class TestMultiplicativeErrorCorrection(unittest.TestCase):
+    """Test the correction of FERC Form 1 values reported in the wrong units."""
+
+    def test_coal_heat_content(self):
+        """Values are scaled into range, outliers dropped, the rest kept."""
+        tofix = pd.Series(
+            [20.0, 0.01, 2e-5, 1e3, None, 5.0, 22.0],
+            index=[7, 3, 5, 1, 0, 2, 4], name="fuel_mmbtu_per_unit")
+        mask = pd.Series([True, True, True, True, True, False, True],
+                         index=tofix.index)
+        fixed = ferc1._multiplicative_error_correction(
+            tofix, mask, minval=10.0, maxval=29.0, mults=(2e3, 1e6))
+        pd.testing.assert_series_equal(
+            pd.Series([20.0, 20.0, 20.0, None, None, 5.0, 22.0],
+                      index=tofix.index, name="fuel_mmbtu_per_unit"),
+            fixed)
+
+
+class TestFERCPlantClassifier(unittest.TestCase):
+    """Test the matching of FERC Form 1 plant records across years."""
+
+    def setUp(self):
+        """Fit a classifier to a few records from two years."""
+        self.plants_df = pd.DataFrame({
+            "record_id": ["a", "b", "c", "d"],
+            "report_year": [2000, 2000, 2001, 2001],
+        })
+        X = scipy.sparse.csr_matrix(  # noqa: N806
+            [[1.0, 0.0], [0.0, 1.0], [0.9, 0.1], [0.0, 0.0]])
+        self.clf = ferc1.FERCPlantClassifier(
+            min_sim=0.75, plants_df=self.plants_df).fit(X)
+
+    def test_best_by_year(self):
+        """Each record's best match in each year is found, if it's close."""
+        expected = self.plants_df.copy()
+        expected[2000] = [0, 1, 0, -1]
+        expected[2001] = [2, -1, 2, -1]
+        pd.testing.assert_frame_equal(expected, self.clf._best_of)
+
+    def test_predict_and_score(self):
+        """Records are grouped with their best matches, and scored."""
+        pd.testing.assert_frame_equal(
+            pd.DataFrame(
+                [["b", ""], ["a", "c"], ["a", "c"]],
+                index=pd.Index(["b", "c", "a"], name="seed_id"),
+                columns=[2000, 2001], dtype=object),
+            self.clf.predict(pd.Series(["b", "c", "a"])),
+            check_column_type=False)
+        self.assertAlmostEqual(
+            (1 + 1 + 2 / 3) / 3,
+            self.clf.score(None, ["a,c,", "b"]))